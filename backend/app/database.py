@@ -1,5 +1,6 @@
 import os
 from supabase import create_client
+from sqlalchemy import create_engine
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,3 +22,20 @@ supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 supabase_admin = None
 if SUPABASE_SERVICE_ROLE_KEY:
 	supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+
+# Optionaler direkter Postgres-Zugang (Connection Pool) statt PostgREST über HTTP
+DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+db_engine = None
+if DATABASE_URL:
+	db_engine = create_engine(
+		DATABASE_URL,
+		pool_size=DB_POOL_MIN_SIZE,
+		max_overflow=max(0, DB_POOL_MAX_SIZE - DB_POOL_MIN_SIZE),
+		pool_pre_ping=True,
+		pool_recycle=1800,
+		connect_args={"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"},
+	)
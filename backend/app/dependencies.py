@@ -0,0 +1,47 @@
+from fastapi import Depends, Header, HTTPException, Request, Response, status
+
+from app.repositories import repository
+from app.services.auth import (
+    AuthenticatedUser,
+    AuthenticationError,
+    authenticate_token,
+    extract_bearer_token,
+)
+from app.services.conditional import is_not_modified, validator_headers
+
+
+def get_current_user(authorization: str | None = Header(default=None)) -> AuthenticatedUser:
+    """Resolve the bearer token in the Authorization header to the current user."""
+    try:
+        token = extract_bearer_token(authorization)
+        return authenticate_token(token)
+    except AuthenticationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exc),
+        )
+
+
+def conditional_user_read(
+    request: Request,
+    response: Response,
+    user: AuthenticatedUser = Depends(get_current_user),
+) -> None:
+    """Conditional GET for endpoints that only read the current user's data.
+
+    Runs before the endpoint: answers 304 Not Modified when the client's
+    If-None-Match still matches the user's data version, otherwise stamps an
+    ETag on the endpoint's response. Endpoints that hydrate movies call
+    drop_validators when some of them could not be resolved.
+    """
+    try:
+        version_row = repository.get_user_version(user.id)
+    except Exception as exc:
+        # Without a version there is no safe validator; serve the full response
+        print(f"Warning: Failed to read user version: {exc}")
+        return
+
+    headers = validator_headers(user.id, version_row)
+    if is_not_modified(request.headers, headers):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,8 +8,38 @@ from app.database import supabase
 from app.routes.auth import router as auth_router
 from app.routes.movies import router as movies_router
 from app.routes.profile import router as profile_router
+from app.services.auth import SUPABASE_JWT_SECRET, jwks_cache
+from app.services.autocomplete import movie_autocomplete
+from app.services.catalog import movie_catalog
+from app.services.deck import swipe_deck
+from app.services.importer import movie_importer
+from app.services.recommendations import movie_recommender
+from app.services.search import movie_search
+from app.services.tmdb import async_tmdb_client, popular_feed_warmer, tmdb_client
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not SUPABASE_JWT_SECRET:
+        jwks_cache.start()
+    popular_feed_warmer.start()
+    movie_search.start()
+    movie_autocomplete.start()
+    movie_recommender.start()
+    yield
+    await movie_recommender.stop()
+    await movie_autocomplete.stop()
+    await movie_search.stop()
+    await popular_feed_warmer.stop()
+    jwks_cache.stop()
+    await movie_importer.aclose()
+    await swipe_deck.aclose()
+    await movie_catalog.aclose()
+    await async_tmdb_client.aclose()
+    tmdb_client.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 
@@ -0,0 +1,19 @@
+from app.database import db_engine
+from app.repositories.base import Repository
+
+
+def _create_repository() -> Repository:
+    if db_engine is not None:
+        from app.repositories.postgres import PostgresRepository
+
+        return PostgresRepository(db_engine)
+
+    from app.repositories.rest import SupabaseRepository
+
+    return SupabaseRepository()
+
+
+# Direct pooled Postgres when DATABASE_URL is set, Supabase REST otherwise
+repository = _create_repository()
+
+__all__ = ["Repository", "repository"]
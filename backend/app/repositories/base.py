@@ -0,0 +1,230 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional
+
+from app.services.pagination import PageKey
+
+# Immutable, indexed key per user table that scan_user_rows pages on
+USER_ROW_KEYS = {"ratings": "tmdb_id", "watchlist": "tmdb_id", "custom_lists": "id"}
+# Import job statuses that block another import by the same user
+ACTIVE_IMPORT_STATUSES = ("queued", "running")
+
+
+class Repository(ABC):
+    """Data access for ratings, watchlist, custom lists and profiles.
+
+    Rows are returned as plain dicts shaped like PostgREST responses
+    (ids and timestamps as strings), so routes work with either backend.
+
+    The ``list_*`` methods return rows newest first, ordered by
+    ``(updated_at, id)`` descending. ``limit`` caps the row count and ``after``
+    continues from a previous page's last ``(updated_at, id)`` (keyset paging).
+    """
+
+    # Whether writes bypass row level security (service role or direct connection)
+    can_bypass_rls: bool = False
+
+    @abstractmethod
+    def get_rating(self, user_id: str, tmdb_id: int) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_ratings(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def scan_ratings(self, after: Optional[tuple[str, int]] = None, limit: int = 50000) -> list[dict]:
+        """Scan every user's ratings (user_id, tmdb_id, rating only) in (user_id, tmdb_id) order.
+
+        ``after`` continues from a previous page's last (user_id, tmdb_id).
+        Used by offline jobs; needs a connection that bypasses RLS.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def scan_user_rows(
+        self, table: str, user_id: str, after=None, limit: int = 1000
+    ) -> list[dict]:
+        """A page of the user's rows in ``table`` (a USER_ROW_KEYS key), in key order.
+
+        Unlike the ``list_*`` methods this pages on a column updates never
+        change, so a row updated mid-scan is neither skipped nor repeated.
+        ``after`` continues from a previous page's last key value.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_rating(self, user_id: str, tmdb_id: int, rating: float, review: Optional[str]) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_ratings(self, user_id: str, items: list[dict]) -> list[dict]:
+        """Upsert many ratings in one statement.
+
+        Items hold tmdb_id, rating and review; tmdb_ids must be unique.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_watchlist_entry(self, user_id: str, tmdb_id: int) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_watchlist(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_watchlist_entry(self, user_id: str, tmdb_id: int, status: str) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_watchlist_entries(self, user_id: str, items: list[dict]) -> list[dict]:
+        """Upsert many watchlist entries in one statement.
+
+        Items hold tmdb_id and status; tmdb_ids must be unique.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_watchlist_entry(self, user_id: str, tmdb_id: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_seen_tmdb_ids(self, user_id: str) -> list[int]:
+        """tmdb_ids the user has rated or put on their watchlist (each once, any order)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_rating_values(self, user_id: str) -> dict[int, float]:
+        """Every rating of the user as tmdb_id -> rating (not limited to one page)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_profile_summary(self, user_id: str) -> dict:
+        """Aggregate a user's library in the database.
+
+        Returns a dict with ``recent`` and ``top_rated`` (up to 10 rating rows
+        each), ``ratings_count``, ``average_rating``, ``rating_histogram``
+        (21 half-star buckets), ``watchlist_count`` and ``status_counts``
+        (watchlist status -> count). Counts come from the user_stats table.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user_version(self, user_id: str) -> Optional[dict]:
+        """Fetch the user's user_versions row (``version``, ``updated_at``).
+
+        The version is bumped by triggers on every write to the user's
+        ratings, watchlist, custom lists and profile; None if never written.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def revoke_token(self, token_hash: str, expires_at: datetime) -> None:
+        """Record a revoked access token (by hash) until it expires.
+
+        Shared by every API worker; expired entries are purged on the way.
+        Needs a connection that bypasses RLS.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_token_revoked(self, token_hash: str) -> bool:
+        """Whether an unexpired access token with this hash was revoked."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_import_job(
+        self, job: dict, stale_before: datetime, expired_before: datetime
+    ) -> bool:
+        """Insert an import job (``job_id``, ``user_id``, ``status`` and the rest of its state).
+
+        Returns False, inserting nothing, while the user has another queued
+        or running job. Such a job not saved since ``stale_before`` is marked
+        failed first, and jobs finished before ``expired_before`` are purged.
+        Needs a connection that bypasses RLS.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_import_job(self, job: dict) -> None:
+        """Store an import job's current state, refreshing its updated_at."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_import_job(self, job_id: str) -> Optional[dict]:
+        """Fetch an import job's saved state (with ``user_id``), or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_active_import_job(self, user_id: str) -> Optional[dict]:
+        """Fetch the saved state of the user's queued or running import job, or None."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def rebuild_user_stats(self, user_id: Optional[str] = None) -> int:
+        """Recompute user_stats from the raw tables (one user, or everyone).
+
+        Returns the number of user_stats rows written.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def check_user_stats(self, user_id: Optional[str] = None) -> list[dict]:
+        """Compare user_stats with the raw tables.
+
+        Returns one dict (user_id, field, stored, expected) per mismatch.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_catalog_movies(self, tmdb_ids: list[int]) -> list[dict]:
+        """Fetch movie_catalog rows for the given ids in one query."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_catalog_movies(self, after_tmdb_id: int = 0, limit: int = 5000) -> list[dict]:
+        """Scan movie_catalog in tmdb_id order, ``limit`` rows after ``after_tmdb_id``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_catalog_movies(self, movies: list[dict]) -> None:
+        """Upsert movie_catalog rows keyed by tmdb_id, stamping fetched_at.
+
+        Items hold tmdb_id, title, overview, poster_path, backdrop_path,
+        release_date, vote_average, popularity and genres; tmdb_ids must be unique.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_custom_lists(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_custom_list(
+        self,
+        user_id: str,
+        name: str,
+        description: Optional[str],
+        is_public: bool,
+        sort_mode: str,
+    ) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_profile(self, user_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_profile(self, user_id: str) -> dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_profile(self, user_id: str, fields: dict) -> Optional[dict]:
+        raise NotImplementedError
@@ -0,0 +1,495 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.repositories.base import USER_ROW_KEYS, Repository
+from app.services.pagination import PageKey
+
+
+def _keyset_statements(table: str) -> dict[bool, object]:
+    """First-page and continuation SELECTs, newest first by (updated_at, id).
+
+    Both are served by the (user_id, updated_at DESC, id DESC) index on ``table``.
+    """
+    select = f"SELECT * FROM {table} WHERE user_id = :user_id"
+    order = " ORDER BY updated_at DESC, id DESC LIMIT :limit"
+    after = (
+        " AND (updated_at, id) < "
+        "(CAST(:after_updated_at AS timestamp), CAST(:after_id AS uuid))"
+    )
+    return {False: text(select + order), True: text(select + after + order)}
+
+
+def _scan_statements(table: str, key: str, key_type: str) -> dict[bool, object]:
+    """First-page and continuation SELECTs for scan_user_rows, in ``key`` order."""
+    select = f"SELECT * FROM {table} WHERE user_id = :user_id"
+    order = f" ORDER BY {key} LIMIT :limit"
+    after = f" AND {key} > CAST(:after AS {key_type})"
+    return {False: text(select + order), True: text(select + after + order)}
+
+
+# Statements are built once at import; SQLAlchemy caches their compiled form,
+# so per-query overhead is a pooled socket round-trip and nothing else.
+SELECT_RATING = text(
+    "SELECT * FROM ratings WHERE user_id = :user_id AND tmdb_id = :tmdb_id LIMIT 1"
+)
+SELECT_RATINGS = _keyset_statements("ratings")
+# Full scans walk the UNIQUE (user_id, tmdb_id) index
+SCAN_RATINGS = {
+    False: text("SELECT user_id, tmdb_id, rating FROM ratings ORDER BY user_id, tmdb_id LIMIT :limit"),
+    True: text(
+        "SELECT user_id, tmdb_id, rating FROM ratings "
+        "WHERE (user_id, tmdb_id) > (CAST(:after_user_id AS uuid), :after_tmdb_id) "
+        "ORDER BY user_id, tmdb_id LIMIT :limit"
+    ),
+}
+UPSERT_RATING = text(
+    """
+    INSERT INTO ratings (user_id, tmdb_id, rating, review)
+    VALUES (:user_id, :tmdb_id, :rating, :review)
+    ON CONFLICT (user_id, tmdb_id) DO UPDATE
+    SET rating = EXCLUDED.rating, review = EXCLUDED.review, updated_at = now()
+    RETURNING *
+    """
+)
+UPSERT_RATINGS_BULK = text(
+    """
+    INSERT INTO ratings (user_id, tmdb_id, rating, review)
+    SELECT CAST(:user_id AS uuid), item.tmdb_id, item.rating, item.review
+    FROM unnest(
+        CAST(:tmdb_ids AS integer[]),
+        CAST(:ratings AS numeric[]),
+        CAST(:reviews AS text[])
+    ) AS item(tmdb_id, rating, review)
+    ON CONFLICT (user_id, tmdb_id) DO UPDATE
+    SET rating = EXCLUDED.rating, review = EXCLUDED.review, updated_at = now()
+    RETURNING *
+    """
+)
+
+SELECT_WATCHLIST_ENTRY = text(
+    "SELECT * FROM watchlist WHERE user_id = :user_id AND tmdb_id = :tmdb_id LIMIT 1"
+)
+SELECT_WATCHLIST = _keyset_statements("watchlist")
+UPSERT_WATCHLIST_ENTRY = text(
+    """
+    INSERT INTO watchlist (user_id, tmdb_id, status)
+    VALUES (:user_id, :tmdb_id, :status)
+    ON CONFLICT (user_id, tmdb_id) DO UPDATE
+    SET status = EXCLUDED.status, updated_at = now()
+    RETURNING *
+    """
+)
+UPSERT_WATCHLIST_BULK = text(
+    """
+    INSERT INTO watchlist (user_id, tmdb_id, status)
+    SELECT CAST(:user_id AS uuid), item.tmdb_id, item.status
+    FROM unnest(
+        CAST(:tmdb_ids AS integer[]),
+        CAST(:statuses AS text[])
+    ) AS item(tmdb_id, status)
+    ON CONFLICT (user_id, tmdb_id) DO UPDATE
+    SET status = EXCLUDED.status, updated_at = now()
+    RETURNING *
+    """
+)
+DELETE_WATCHLIST_ENTRY = text(
+    "DELETE FROM watchlist WHERE user_id = :user_id AND tmdb_id = :tmdb_id RETURNING id"
+)
+
+SELECT_SEEN_TMDB_IDS = text(
+    "SELECT tmdb_id FROM ratings WHERE user_id = :user_id "
+    "UNION SELECT tmdb_id FROM watchlist WHERE user_id = :user_id"
+)
+SELECT_RATING_VALUES = text("SELECT tmdb_id, rating FROM ratings WHERE user_id = :user_id")
+SELECT_PROFILE_SUMMARY = text("SELECT get_profile_summary(CAST(:user_id AS uuid)) AS summary")
+SELECT_USER_VERSION = text(
+    "SELECT version, updated_at FROM user_versions WHERE user_id = :user_id"
+)
+INSERT_REVOKED_TOKEN = text(
+    """
+    WITH purged AS (DELETE FROM revoked_tokens WHERE expires_at < now())
+    INSERT INTO revoked_tokens (token_hash, expires_at)
+    VALUES (:token_hash, :expires_at)
+    ON CONFLICT (token_hash) DO NOTHING
+    """
+)
+SELECT_TOKEN_REVOKED = text(
+    "SELECT 1 FROM revoked_tokens WHERE token_hash = :token_hash AND expires_at >= now()"
+)
+PURGE_IMPORT_JOBS = text("DELETE FROM import_jobs WHERE finished_at < :expired_before")
+FAIL_STALE_IMPORT_JOBS = text(
+    """
+    UPDATE import_jobs
+    SET status = 'failed', updated_at = now(), finished_at = now(),
+        state = state || jsonb_build_object(
+          'status', 'failed',
+          'detail', 'Import was interrupted',
+          'finished_at', now() AT TIME ZONE 'utc'
+        )
+    WHERE user_id = :user_id AND status IN ('queued', 'running') AND updated_at < :stale_before
+    """
+)
+INSERT_IMPORT_JOB = text(
+    """
+    INSERT INTO import_jobs (id, user_id, status, state)
+    VALUES (:id, :user_id, :status, CAST(:state AS jsonb))
+    ON CONFLICT (user_id) WHERE status IN ('queued', 'running') DO NOTHING
+    RETURNING id
+    """
+)
+UPDATE_IMPORT_JOB = text(
+    """
+    UPDATE import_jobs
+    SET status = :status, state = CAST(:state AS jsonb), updated_at = now(),
+        finished_at = CASE WHEN :status IN ('queued', 'running') THEN NULL ELSE now() END
+    WHERE id = :id
+    """
+)
+SELECT_IMPORT_JOB = text("SELECT user_id, state FROM import_jobs WHERE id = :id")
+SELECT_ACTIVE_IMPORT_JOB = text(
+    "SELECT user_id, state FROM import_jobs "
+    "WHERE user_id = :user_id AND status IN ('queued', 'running')"
+)
+REBUILD_USER_STATS = text("SELECT rebuild_user_stats(CAST(:user_id AS uuid))")
+CHECK_USER_STATS = text("SELECT * FROM check_user_stats(CAST(:user_id AS uuid))")
+
+SELECT_CATALOG_MOVIES = text(
+    "SELECT * FROM movie_catalog WHERE tmdb_id = ANY(CAST(:tmdb_ids AS integer[]))"
+)
+SELECT_CATALOG_PAGE = text(
+    "SELECT * FROM movie_catalog WHERE tmdb_id > :after_tmdb_id ORDER BY tmdb_id LIMIT :limit"
+)
+UPSERT_CATALOG_BULK = text(
+    """
+    INSERT INTO movie_catalog (
+        tmdb_id, title, overview, poster_path, backdrop_path,
+        release_date, vote_average, popularity, genres, fetched_at
+    )
+    SELECT item.tmdb_id, item.title, item.overview, item.poster_path, item.backdrop_path,
+           CAST(item.release_date AS date), item.vote_average, item.popularity,
+           CAST(item.genres AS jsonb), now()
+    FROM unnest(
+        CAST(:tmdb_ids AS integer[]),
+        CAST(:titles AS text[]),
+        CAST(:overviews AS text[]),
+        CAST(:poster_paths AS text[]),
+        CAST(:backdrop_paths AS text[]),
+        CAST(:release_dates AS text[]),
+        CAST(:vote_averages AS real[]),
+        CAST(:popularities AS real[]),
+        CAST(:genres AS text[])
+    ) AS item(
+        tmdb_id, title, overview, poster_path, backdrop_path,
+        release_date, vote_average, popularity, genres
+    )
+    ON CONFLICT (tmdb_id) DO UPDATE
+    SET title = EXCLUDED.title,
+        overview = EXCLUDED.overview,
+        poster_path = EXCLUDED.poster_path,
+        backdrop_path = EXCLUDED.backdrop_path,
+        release_date = EXCLUDED.release_date,
+        vote_average = EXCLUDED.vote_average,
+        popularity = EXCLUDED.popularity,
+        genres = EXCLUDED.genres,
+        fetched_at = EXCLUDED.fetched_at
+    """
+)
+
+SELECT_CUSTOM_LISTS = _keyset_statements("custom_lists")
+# ratings and watchlist walk their UNIQUE (user_id, tmdb_id) index
+SCAN_USER_ROWS = {
+    "ratings": _scan_statements("ratings", USER_ROW_KEYS["ratings"], "integer"),
+    "watchlist": _scan_statements("watchlist", USER_ROW_KEYS["watchlist"], "integer"),
+    "custom_lists": _scan_statements("custom_lists", USER_ROW_KEYS["custom_lists"], "uuid"),
+}
+INSERT_CUSTOM_LIST = text(
+    """
+    INSERT INTO custom_lists (user_id, name, description, is_public, sort_mode, updated_at)
+    VALUES (:user_id, :name, :description, :is_public, :sort_mode, now())
+    RETURNING *
+    """
+)
+
+SELECT_PROFILE = text("SELECT * FROM profiles WHERE user_id = :user_id")
+UPSERT_PROFILE = text(
+    """
+    INSERT INTO profiles (user_id) VALUES (:user_id)
+    ON CONFLICT (user_id) DO UPDATE SET user_id = EXCLUDED.user_id
+    RETURNING *
+    """
+)
+PROFILE_UPDATABLE_FIELDS = ("display_name", "birth_date", "avatar_url")
+
+
+def _to_json_value(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _row_to_dict(row) -> dict:
+    return {key: _to_json_value(value) for key, value in row._mapping.items()}
+
+
+class PostgresRepository(Repository):
+    """Repository backed by a pooled direct Postgres connection.
+
+    Talks to the database directly (as the table owner), so it is not subject
+    to row level security; every query is scoped by user_id explicitly.
+    """
+
+    can_bypass_rls = True
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def _fetch_one(self, statement, **params) -> Optional[dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(statement, params).first()
+        return _row_to_dict(row) if row is not None else None
+
+    def _fetch_all(self, statement, **params) -> list[dict]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(statement, params).all()
+        return [_row_to_dict(row) for row in rows]
+
+    def _fetch_page(
+        self, statements: dict, user_id: str, limit: Optional[int], after: Optional[PageKey]
+    ) -> list[dict]:
+        params = {"user_id": user_id, "limit": limit}  # LIMIT NULL means no limit
+        if after is not None:
+            params["after_updated_at"], params["after_id"] = after
+        return self._fetch_all(statements[after is not None], **params)
+
+    def get_rating(self, user_id: str, tmdb_id: int) -> Optional[dict]:
+        return self._fetch_one(SELECT_RATING, user_id=user_id, tmdb_id=tmdb_id)
+
+    def list_ratings(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        return self._fetch_page(SELECT_RATINGS, user_id, limit, after)
+
+    def scan_ratings(self, after: Optional[tuple[str, int]] = None, limit: int = 50000) -> list[dict]:
+        if after is None:
+            return self._fetch_all(SCAN_RATINGS[False], limit=limit)
+        return self._fetch_all(
+            SCAN_RATINGS[True], after_user_id=after[0], after_tmdb_id=after[1], limit=limit
+        )
+
+    def scan_user_rows(
+        self, table: str, user_id: str, after=None, limit: int = 1000
+    ) -> list[dict]:
+        statements = SCAN_USER_ROWS[table]
+        params = {"user_id": user_id, "limit": limit}
+        if after is not None:
+            params["after"] = after
+        return self._fetch_all(statements[after is not None], **params)
+
+    def save_rating(self, user_id: str, tmdb_id: int, rating: float, review: Optional[str]) -> dict:
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                UPSERT_RATING,
+                {"user_id": user_id, "tmdb_id": tmdb_id, "rating": rating, "review": review},
+            ).one()
+        return _row_to_dict(row)
+
+    def save_ratings(self, user_id: str, items: list[dict]) -> list[dict]:
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                UPSERT_RATINGS_BULK,
+                {
+                    "user_id": user_id,
+                    "tmdb_ids": [item["tmdb_id"] for item in items],
+                    "ratings": [item["rating"] for item in items],
+                    "reviews": [item.get("review") for item in items],
+                },
+            ).all()
+        return [_row_to_dict(row) for row in rows]
+
+    def get_watchlist_entry(self, user_id: str, tmdb_id: int) -> Optional[dict]:
+        return self._fetch_one(SELECT_WATCHLIST_ENTRY, user_id=user_id, tmdb_id=tmdb_id)
+
+    def list_watchlist(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        return self._fetch_page(SELECT_WATCHLIST, user_id, limit, after)
+
+    def save_watchlist_entry(self, user_id: str, tmdb_id: int, status: str) -> dict:
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                UPSERT_WATCHLIST_ENTRY,
+                {"user_id": user_id, "tmdb_id": tmdb_id, "status": status},
+            ).one()
+        return _row_to_dict(row)
+
+    def save_watchlist_entries(self, user_id: str, items: list[dict]) -> list[dict]:
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                UPSERT_WATCHLIST_BULK,
+                {
+                    "user_id": user_id,
+                    "tmdb_ids": [item["tmdb_id"] for item in items],
+                    "statuses": [item["status"] for item in items],
+                },
+            ).all()
+        return [_row_to_dict(row) for row in rows]
+
+    def delete_watchlist_entry(self, user_id: str, tmdb_id: int) -> bool:
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                DELETE_WATCHLIST_ENTRY, {"user_id": user_id, "tmdb_id": tmdb_id}
+            ).all()
+        return bool(rows)
+
+    def list_seen_tmdb_ids(self, user_id: str) -> list[int]:
+        with self.engine.connect() as conn:
+            return list(conn.execute(SELECT_SEEN_TMDB_IDS, {"user_id": user_id}).scalars())
+
+    def list_rating_values(self, user_id: str) -> dict[int, float]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(SELECT_RATING_VALUES, {"user_id": user_id})
+            return {tmdb_id: float(rating) for tmdb_id, rating in rows}
+
+    def get_profile_summary(self, user_id: str) -> dict:
+        with self.engine.connect() as conn:
+            summary = conn.execute(SELECT_PROFILE_SUMMARY, {"user_id": user_id}).scalar()
+        return summary or {}
+
+    def get_user_version(self, user_id: str) -> Optional[dict]:
+        return self._fetch_one(SELECT_USER_VERSION, user_id=user_id)
+
+    def revoke_token(self, token_hash: str, expires_at: datetime) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(INSERT_REVOKED_TOKEN, {"token_hash": token_hash, "expires_at": expires_at})
+
+    def is_token_revoked(self, token_hash: str) -> bool:
+        return self._fetch_one(SELECT_TOKEN_REVOKED, token_hash=token_hash) is not None
+
+    def create_import_job(
+        self, job: dict, stale_before: datetime, expired_before: datetime
+    ) -> bool:
+        with self.engine.begin() as conn:
+            conn.execute(PURGE_IMPORT_JOBS, {"expired_before": expired_before})
+            conn.execute(
+                FAIL_STALE_IMPORT_JOBS, {"user_id": job["user_id"], "stale_before": stale_before}
+            )
+            inserted = conn.execute(
+                INSERT_IMPORT_JOB,
+                {
+                    "id": job["job_id"],
+                    "user_id": job["user_id"],
+                    "status": job["status"],
+                    "state": json.dumps(job),
+                },
+            ).first()
+        return inserted is not None
+
+    def save_import_job(self, job: dict) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                UPDATE_IMPORT_JOB,
+                {"id": job["job_id"], "status": job["status"], "state": json.dumps(job)},
+            )
+
+    def get_import_job(self, job_id: str) -> Optional[dict]:
+        row = self._fetch_one(SELECT_IMPORT_JOB, id=job_id)
+        return {**row["state"], "user_id": row["user_id"]} if row is not None else None
+
+    def get_active_import_job(self, user_id: str) -> Optional[dict]:
+        row = self._fetch_one(SELECT_ACTIVE_IMPORT_JOB, user_id=user_id)
+        return {**row["state"], "user_id": row["user_id"]} if row is not None else None
+
+    def rebuild_user_stats(self, user_id: Optional[str] = None) -> int:
+        with self.engine.begin() as conn:
+            rebuilt = conn.execute(REBUILD_USER_STATS, {"user_id": user_id}).scalar()
+        return rebuilt or 0
+
+    def check_user_stats(self, user_id: Optional[str] = None) -> list[dict]:
+        return self._fetch_all(CHECK_USER_STATS, user_id=user_id)
+
+    def get_catalog_movies(self, tmdb_ids: list[int]) -> list[dict]:
+        if not tmdb_ids:
+            return []
+        return self._fetch_all(SELECT_CATALOG_MOVIES, tmdb_ids=list(tmdb_ids))
+
+    def list_catalog_movies(self, after_tmdb_id: int = 0, limit: int = 5000) -> list[dict]:
+        return self._fetch_all(SELECT_CATALOG_PAGE, after_tmdb_id=after_tmdb_id, limit=limit)
+
+    def save_catalog_movies(self, movies: list[dict]) -> None:
+        if not movies:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(
+                UPSERT_CATALOG_BULK,
+                {
+                    "tmdb_ids": [movie["tmdb_id"] for movie in movies],
+                    "titles": [movie.get("title") for movie in movies],
+                    "overviews": [movie.get("overview") for movie in movies],
+                    "poster_paths": [movie.get("poster_path") for movie in movies],
+                    "backdrop_paths": [movie.get("backdrop_path") for movie in movies],
+                    "release_dates": [movie.get("release_date") for movie in movies],
+                    "vote_averages": [movie.get("vote_average") for movie in movies],
+                    "popularities": [movie.get("popularity") for movie in movies],
+                    "genres": [json.dumps(movie.get("genres") or []) for movie in movies],
+                },
+            )
+
+    def list_custom_lists(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        return self._fetch_page(SELECT_CUSTOM_LISTS, user_id, limit, after)
+
+    def create_custom_list(
+        self,
+        user_id: str,
+        name: str,
+        description: Optional[str],
+        is_public: bool,
+        sort_mode: str,
+    ) -> dict:
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                INSERT_CUSTOM_LIST,
+                {
+                    "user_id": user_id,
+                    "name": name,
+                    "description": description,
+                    "is_public": is_public,
+                    "sort_mode": sort_mode,
+                },
+            ).one()
+        return _row_to_dict(row)
+
+    def get_profile(self, user_id: str) -> Optional[dict]:
+        return self._fetch_one(SELECT_PROFILE, user_id=user_id)
+
+    def create_profile(self, user_id: str) -> dict:
+        with self.engine.begin() as conn:
+            row = conn.execute(UPSERT_PROFILE, {"user_id": user_id}).one()
+        return _row_to_dict(row)
+
+    def update_profile(self, user_id: str, fields: dict) -> Optional[dict]:
+        columns = [name for name in PROFILE_UPDATABLE_FIELDS if name in fields]
+        if not columns:
+            return self.get_profile(user_id)
+
+        assignments = ", ".join(f"{name} = :{name}" for name in columns)
+        statement = text(
+            f"UPDATE profiles SET {assignments} "
+            "WHERE user_id = :user_id RETURNING *"
+        )
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                statement, {"user_id": user_id, **{name: fields[name] for name in columns}}
+            ).first()
+        return _row_to_dict(row) if row is not None else None
@@ -0,0 +1,404 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from postgrest.exceptions import APIError
+
+from app.database import supabase, supabase_admin
+from app.repositories.base import ACTIVE_IMPORT_STATUSES, USER_ROW_KEYS, Repository
+from app.services.pagination import PageKey
+
+
+def _keyset_page(query, limit: Optional[int], after: Optional[PageKey]):
+    """Apply (updated_at, id) descending keyset paging to a PostgREST query."""
+    if after is not None:
+        updated_at, row_id = after
+        query = query.or_(
+            f"updated_at.lt.{updated_at},and(updated_at.eq.{updated_at},id.lt.{row_id})"
+        )
+    query = query.order("updated_at", desc=True).order("id", desc=True)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+class SupabaseRepository(Repository):
+    """Repository backed by the Supabase PostgREST client (one HTTP request per query)."""
+
+    def __init__(self):
+        # Admin client bypasses RLS for server-side access when configured
+        self.client = supabase_admin or supabase
+        self.can_bypass_rls = supabase_admin is not None
+
+    def get_rating(self, user_id: str, tmdb_id: int) -> Optional[dict]:
+        result = (
+            self.client.table("ratings")
+            .select("*")
+            .eq("user_id", user_id)
+            .eq("tmdb_id", tmdb_id)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def list_ratings(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        query = self.client.table("ratings").select("*").eq("user_id", user_id)
+        result = _keyset_page(query, limit, after).execute()
+        return result.data or []
+
+    def scan_ratings(self, after: Optional[tuple[str, int]] = None, limit: int = 50000) -> list[dict]:
+        query = self.client.table("ratings").select("user_id,tmdb_id,rating")
+        if after is not None:
+            user_id, tmdb_id = after
+            query = query.or_(f"user_id.gt.{user_id},and(user_id.eq.{user_id},tmdb_id.gt.{tmdb_id})")
+        result = query.order("user_id").order("tmdb_id").limit(limit).execute()
+        return result.data or []
+
+    def scan_user_rows(
+        self, table: str, user_id: str, after=None, limit: int = 1000
+    ) -> list[dict]:
+        key = USER_ROW_KEYS[table]
+        query = self.client.table(table).select("*").eq("user_id", user_id)
+        if after is not None:
+            query = query.gt(key, after)
+        result = query.order(key).limit(limit).execute()
+        return result.data or []
+
+    def save_rating(self, user_id: str, tmdb_id: int, rating: float, review: Optional[str]) -> dict:
+        # Single round-trip: INSERT ... ON CONFLICT (user_id, tmdb_id) DO UPDATE
+        result = (
+            self.client.table("ratings")
+            .upsert(
+                {
+                    "user_id": user_id,
+                    "tmdb_id": tmdb_id,
+                    "rating": rating,
+                    "review": review,
+                    "updated_at": datetime.utcnow().isoformat(),
+                },
+                on_conflict="user_id,tmdb_id",
+            )
+            .execute()
+        )
+        return result.data[0]
+
+    def save_ratings(self, user_id: str, items: list[dict]) -> list[dict]:
+        updated_at = datetime.utcnow().isoformat()
+        result = (
+            self.client.table("ratings")
+            .upsert(
+                [
+                    {
+                        "user_id": user_id,
+                        "tmdb_id": item["tmdb_id"],
+                        "rating": item["rating"],
+                        "review": item.get("review"),
+                        "updated_at": updated_at,
+                    }
+                    for item in items
+                ],
+                on_conflict="user_id,tmdb_id",
+            )
+            .execute()
+        )
+        return result.data or []
+
+    def get_watchlist_entry(self, user_id: str, tmdb_id: int) -> Optional[dict]:
+        result = (
+            self.client.table("watchlist")
+            .select("*")
+            .eq("user_id", user_id)
+            .eq("tmdb_id", tmdb_id)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def list_watchlist(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        query = self.client.table("watchlist").select("*").eq("user_id", user_id)
+        result = _keyset_page(query, limit, after).execute()
+        return result.data or []
+
+    def save_watchlist_entry(self, user_id: str, tmdb_id: int, status: str) -> dict:
+        result = (
+            self.client.table("watchlist")
+            .upsert(
+                {
+                    "user_id": user_id,
+                    "tmdb_id": tmdb_id,
+                    "status": status,
+                    "updated_at": datetime.utcnow().isoformat(),
+                },
+                on_conflict="user_id,tmdb_id",
+            )
+            .execute()
+        )
+        return result.data[0]
+
+    def save_watchlist_entries(self, user_id: str, items: list[dict]) -> list[dict]:
+        updated_at = datetime.utcnow().isoformat()
+        result = (
+            self.client.table("watchlist")
+            .upsert(
+                [
+                    {
+                        "user_id": user_id,
+                        "tmdb_id": item["tmdb_id"],
+                        "status": item["status"],
+                        "updated_at": updated_at,
+                    }
+                    for item in items
+                ],
+                on_conflict="user_id,tmdb_id",
+            )
+            .execute()
+        )
+        return result.data or []
+
+    def delete_watchlist_entry(self, user_id: str, tmdb_id: int) -> bool:
+        result = (
+            self.client.table("watchlist")
+            .delete()
+            .eq("user_id", user_id)
+            .eq("tmdb_id", tmdb_id)
+            .execute()
+        )
+        return bool(result.data)
+
+    def list_seen_tmdb_ids(self, user_id: str) -> list[int]:
+        seen: set[int] = set()
+        for table in ("ratings", "watchlist"):
+            # Keyset over tmdb_id, since PostgREST caps the rows per response
+            after = 0
+            while True:
+                result = (
+                    self.client.table(table)
+                    .select("tmdb_id")
+                    .eq("user_id", user_id)
+                    .gt("tmdb_id", after)
+                    .order("tmdb_id")
+                    .limit(1000)
+                    .execute()
+                )
+                batch = [row["tmdb_id"] for row in result.data or []]
+                seen.update(batch)
+                if len(batch) < 1000:
+                    break
+                after = batch[-1]
+        return list(seen)
+
+    def list_rating_values(self, user_id: str) -> dict[int, float]:
+        values: dict[int, float] = {}
+        # Keyset over tmdb_id, since PostgREST caps the rows per response
+        after = 0
+        while True:
+            result = (
+                self.client.table("ratings")
+                .select("tmdb_id, rating")
+                .eq("user_id", user_id)
+                .gt("tmdb_id", after)
+                .order("tmdb_id")
+                .limit(1000)
+                .execute()
+            )
+            batch = result.data or []
+            values.update((row["tmdb_id"], float(row["rating"])) for row in batch)
+            if len(batch) < 1000:
+                return values
+            after = batch[-1]["tmdb_id"]
+
+    def get_profile_summary(self, user_id: str) -> dict:
+        result = self.client.rpc("get_profile_summary", {"p_user_id": user_id}).execute()
+        return result.data or {}
+
+    def get_user_version(self, user_id: str) -> Optional[dict]:
+        result = (
+            self.client.table("user_versions")
+            .select("version,updated_at")
+            .eq("user_id", user_id)
+            .limit(1)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    def revoke_token(self, token_hash: str, expires_at: datetime) -> None:
+        self.client.table("revoked_tokens").delete().lt(
+            "expires_at", datetime.now(timezone.utc).isoformat()
+        ).execute()
+        self.client.table("revoked_tokens").upsert(
+            {"token_hash": token_hash, "expires_at": expires_at.isoformat()},
+            on_conflict="token_hash",
+            ignore_duplicates=True,
+        ).execute()
+
+    def is_token_revoked(self, token_hash: str) -> bool:
+        result = (
+            self.client.table("revoked_tokens")
+            .select("token_hash")
+            .eq("token_hash", token_hash)
+            .gte("expires_at", datetime.now(timezone.utc).isoformat())
+            .limit(1)
+            .execute()
+        )
+        return bool(result.data)
+
+    def create_import_job(
+        self, job: dict, stale_before: datetime, expired_before: datetime
+    ) -> bool:
+        self.client.table("import_jobs").delete().lt(
+            "finished_at", expired_before.isoformat()
+        ).execute()
+        stale = (
+            self.client.table("import_jobs")
+            .select("id,state")
+            .eq("user_id", job["user_id"])
+            .in_("status", list(ACTIVE_IMPORT_STATUSES))
+            .lt("updated_at", stale_before.isoformat())
+            .execute()
+        )
+        now = datetime.now(timezone.utc)
+        for row in stale.data or []:
+            state = {
+                **row["state"],
+                "status": "failed",
+                "detail": "Import was interrupted",
+                "finished_at": now.replace(tzinfo=None).isoformat(),
+            }
+            self.client.table("import_jobs").update(
+                {
+                    "status": "failed",
+                    "state": state,
+                    "updated_at": now.isoformat(),
+                    "finished_at": now.isoformat(),
+                }
+            ).eq("id", row["id"]).lt("updated_at", stale_before.isoformat()).execute()
+        try:
+            self.client.table("import_jobs").insert(
+                {"id": job["job_id"], "user_id": job["user_id"], "status": job["status"], "state": job}
+            ).execute()
+        except APIError as exc:
+            # unique_violation: the user has another queued or running job
+            if exc.code == "23505":
+                return False
+            raise
+        return True
+
+    def save_import_job(self, job: dict) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        self.client.table("import_jobs").update(
+            {
+                "status": job["status"],
+                "state": job,
+                "updated_at": now,
+                "finished_at": None if job["status"] in ACTIVE_IMPORT_STATUSES else now,
+            }
+        ).eq("id", job["job_id"]).execute()
+
+    def get_import_job(self, job_id: str) -> Optional[dict]:
+        result = (
+            self.client.table("import_jobs")
+            .select("user_id,state")
+            .eq("id", job_id)
+            .limit(1)
+            .execute()
+        )
+        if not result.data:
+            return None
+        return {**result.data[0]["state"], "user_id": result.data[0]["user_id"]}
+
+    def get_active_import_job(self, user_id: str) -> Optional[dict]:
+        result = (
+            self.client.table("import_jobs")
+            .select("user_id,state")
+            .eq("user_id", user_id)
+            .in_("status", list(ACTIVE_IMPORT_STATUSES))
+            .limit(1)
+            .execute()
+        )
+        if not result.data:
+            return None
+        return {**result.data[0]["state"], "user_id": result.data[0]["user_id"]}
+
+    def rebuild_user_stats(self, user_id: Optional[str] = None) -> int:
+        result = self.client.rpc("rebuild_user_stats", {"p_user_id": user_id}).execute()
+        return result.data or 0
+
+    def check_user_stats(self, user_id: Optional[str] = None) -> list[dict]:
+        result = self.client.rpc("check_user_stats", {"p_user_id": user_id}).execute()
+        return result.data or []
+
+    def get_catalog_movies(self, tmdb_ids: list[int]) -> list[dict]:
+        if not tmdb_ids:
+            return []
+        result = self.client.table("movie_catalog").select("*").in_("tmdb_id", tmdb_ids).execute()
+        return result.data or []
+
+    def list_catalog_movies(self, after_tmdb_id: int = 0, limit: int = 5000) -> list[dict]:
+        result = (
+            self.client.table("movie_catalog")
+            .select("*")
+            .gt("tmdb_id", after_tmdb_id)
+            .order("tmdb_id")
+            .limit(limit)
+            .execute()
+        )
+        return result.data or []
+
+    def save_catalog_movies(self, movies: list[dict]) -> None:
+        if not movies:
+            return
+        fetched_at = datetime.utcnow().isoformat()
+        self.client.table("movie_catalog").upsert(
+            [{**movie, "fetched_at": fetched_at} for movie in movies],
+            on_conflict="tmdb_id",
+        ).execute()
+
+    def list_custom_lists(
+        self, user_id: str, limit: Optional[int] = None, after: Optional[PageKey] = None
+    ) -> list[dict]:
+        query = self.client.table("custom_lists").select("*").eq("user_id", user_id)
+        result = _keyset_page(query, limit, after).execute()
+        return result.data or []
+
+    def create_custom_list(
+        self,
+        user_id: str,
+        name: str,
+        description: Optional[str],
+        is_public: bool,
+        sort_mode: str,
+    ) -> dict:
+        result = (
+            self.client.table("custom_lists")
+            .insert(
+                {
+                    "user_id": user_id,
+                    "name": name,
+                    "description": description,
+                    "is_public": is_public,
+                    "sort_mode": sort_mode,
+                    "updated_at": datetime.utcnow().isoformat(),
+                }
+            )
+            .execute()
+        )
+        return result.data[0]
+
+    def get_profile(self, user_id: str) -> Optional[dict]:
+        result = self.client.table("profiles").select("*").eq("user_id", user_id).execute()
+        return result.data[0] if result.data else None
+
+    def create_profile(self, user_id: str) -> dict:
+        result = (
+            self.client.table("profiles")
+            .upsert({"user_id": user_id}, on_conflict="user_id")
+            .execute()
+        )
+        return result.data[0]
+
+    def update_profile(self, user_id: str, fields: dict) -> Optional[dict]:
+        result = self.client.table("profiles").update(fields).eq("user_id", user_id).execute()
+        return result.data[0] if result.data else None
@@ -1,6 +1,13 @@
 from fastapi import APIRouter, Header, HTTPException, status
 
 from app.database import supabase, supabase_admin
+from app.services.auth import (
+    AuthenticationError,
+    authenticate_token,
+    extract_bearer_token,
+    fetch_remote_user,
+    invalidate_token,
+)
 from app.schemas.auth import (
     AuthResponse,
     LoginRequest,
@@ -23,23 +30,6 @@ def _as_iso_string(value: object) -> str | None:
     return str(value)
 
 
-def _extract_bearer_token(authorization: str | None) -> str:
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing Authorization header",
-        )
-
-    scheme, _, token = authorization.partition(" ")
-    if scheme.lower() != "bearer" or not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid Authorization header format",
-        )
-
-    return token
-
-
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 def register(payload: RegisterRequest):
     normalized_email = payload.email.strip().lower()
@@ -139,25 +129,47 @@ def login(payload: LoginRequest):
 
 @router.get("/me", response_model=UserResponse)
 def me(authorization: str | None = Header(default=None)):
-    token = _extract_bearer_token(authorization)
-
+    # Deliberately asks the auth server rather than trusting the token alone,
+    # so this endpoint reflects the live user record (e.g. email confirmation).
     try:
-        auth_user = supabase.auth.get_user(token)
-    except Exception as exc:
+        token = extract_bearer_token(authorization)
+    except AuthenticationError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid or expired token: {exc}",
+            detail=str(exc),
         )
 
-    user = getattr(auth_user, "user", None)
-    if not user:
+    try:
+        user = fetch_remote_user(token)
+    except AuthenticationError as exc:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found for token",
+            detail=f"Invalid or expired token: {exc}",
         )
 
     return UserResponse(
         id=user.id,
         email=user.email,
-        email_confirmed_at=_as_iso_string(user.email_confirmed_at),
+        email_confirmed_at=user.email_confirmed_at,
     )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(authorization: str | None = Header(default=None)):
+    try:
+        token = extract_bearer_token(authorization)
+        # Only verified tokens are revoked, so made-up ones cannot fill the revocation store
+        user = authenticate_token(token)
+    except AuthenticationError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(exc),
+        )
+
+    invalidate_token(token, user)
+
+    try:
+        supabase.auth.admin.sign_out(token, "local")
+    except Exception as exc:
+        # The token is already rejected by this API; revoking the session is best effort
+        print(f"Warning: Failed to revoke Supabase session on logout: {exc}")
@@ -1,19 +1,43 @@
-from fastapi import APIRouter, Header, HTTPException, status, Query
+import asyncio
+import os
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Response, status, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import Optional
-from datetime import datetime
 
-from app.database import supabase, supabase_admin
-from app.services.tmdb import TMDBClient, transform_movie_for_api
+from app.repositories import repository
+from app.services.tmdb import async_tmdb_client, transform_movie_for_api
 from app.schemas.movies import (
+    BatchItemResult,
+    BatchResponse,
     CustomListCreateRequest,
     CustomListResponse,
     MovieResponse,
+    RatingBatchRequest,
     RatingRequest,
     RatingResponse,
+    WatchlistBatchRequest,
     WatchlistRequest,
     WatchlistResponse,
 )
-from app.routes.auth import _extract_bearer_token
+from app.dependencies import conditional_user_read, get_current_user
+from app.services.auth import AuthenticatedUser
+from app.services.autocomplete import AUTOCOMPLETE_MAX_RESULTS, movie_autocomplete
+from app.services.catalog import movie_catalog
+from app.services.conditional import drop_validators
+from app.services.deck import DECK_PAGE_SIZE, decode_deck_cursor, swipe_deck
+from app.services.export import EXPORT_FORMATS, library_export
+from app.services.importer import ImportInProgress, ImportTooLarge, movie_importer
+from app.services.recommendations import movie_recommender
+from app.services.search import movie_search
+from app.services.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    PageKey,
+    decode_cursor,
+    split_page,
+)
 
 router = APIRouter(prefix="/movies", tags=["movies"])
 
@@ -28,48 +52,20 @@ WATCHLIST_STATUS_LABELS = {
 
 CUSTOM_LIST_SORT_MODES = {"manual", "recently_added", "rating_desc"}
 
+# Combined time budget (seconds) for all upstream calls behind /movies/{movie_id}/details
+MOVIE_DETAILS_DEADLINE = float(os.getenv("MOVIE_DETAILS_DEADLINE", "8"))
 
-def _get_user_id_from_token(authorization: str | None) -> str:
-    token = _extract_bearer_token(authorization)
 
+def _page_key(cursor: str | None) -> PageKey | None:
     try:
-        auth_user = supabase.auth.get_user(token)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {exc}",
-        )
-
-    user = getattr(auth_user, "user", None)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-
-    return user.id
-
-
-def _parse_datetime(value: str | None) -> datetime:
-    if not value:
-        return datetime.min
-    try:
-        if value.endswith("Z"):
-            value = value.replace("Z", "+00:00")
-        return datetime.fromisoformat(value)
-    except Exception:
-        return datetime.min
+        return decode_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
 
-def _fetch_movie_map(tmdb_ids: list[int]) -> dict[int, dict]:
-    movie_map: dict[int, dict] = {}
-    for tmdb_id in tmdb_ids:
-        try:
-            details = TMDBClient.get_movie_details(movie_id=tmdb_id)
-            movie_map[tmdb_id] = transform_movie_for_api(details)
-        except Exception:
-            continue
-    return movie_map
+async def _fetch_movie_map(tmdb_ids: list[int]) -> dict[int, dict]:
+    # One catalog query; TMDB is only called for ids the catalog has not seen
+    return await movie_catalog.get_movie_map(tmdb_ids)
 
 
 def _pick_trailer(videos: list[dict]) -> dict | None:
@@ -117,8 +113,78 @@ def _format_providers(provider_data: dict, region: str) -> dict:
     }
 
 
+def _empty_personal_lists() -> dict:
+    return {
+        "rated": False,
+        "rating": None,
+        "watchlist_status": None,
+    }
+
+
+async def _load_personal_lists(movie_id: int, authorization: str | None) -> dict:
+    personal_lists = _empty_personal_lists()
+    if not authorization:
+        return personal_lists
+
+    try:
+        user = await run_in_threadpool(get_current_user, authorization)
+
+        rating_entry, watchlist_entry = await asyncio.gather(
+            run_in_threadpool(repository.get_rating, user.id, movie_id),
+            run_in_threadpool(repository.get_watchlist_entry, user.id, movie_id),
+        )
+
+        if rating_entry:
+            personal_lists["rated"] = True
+            personal_lists["rating"] = rating_entry.get("rating")
+
+        if watchlist_entry:
+            personal_lists["watchlist_status"] = watchlist_entry.get("status")
+    except Exception:
+        pass
+
+    return personal_lists
+
+
+def _write_batch(items: list, errors: dict[int, str], write) -> BatchResponse:
+    """Write the valid items of a batch in one call and report per-item results.
+
+    When a tmdb_id appears more than once, the last occurrence wins (as if the
+    items were sent one by one); earlier ones are reported as superseded.
+    """
+    latest: dict[int, int] = {}
+    for index, item in enumerate(items):
+        if index not in errors:
+            latest[item.tmdb_id] = index
+
+    rows = write([items[index] for index in sorted(latest.values())]) if latest else []
+    saved_ids = {row.get("tmdb_id"): row.get("id") for row in rows}
+
+    results: list[BatchItemResult] = []
+    for index, item in enumerate(items):
+        if index in errors:
+            result = BatchItemResult(
+                index=index, tmdb_id=item.tmdb_id, status="error", detail=errors[index]
+            )
+        elif latest[item.tmdb_id] != index:
+            result = BatchItemResult(index=index, tmdb_id=item.tmdb_id, status="superseded")
+        elif item.tmdb_id in saved_ids:
+            result = BatchItemResult(
+                index=index, tmdb_id=item.tmdb_id, status="saved", id=saved_ids[item.tmdb_id]
+            )
+        else:
+            result = BatchItemResult(
+                index=index, tmdb_id=item.tmdb_id, status="error", detail="Not saved"
+            )
+        results.append(result)
+
+    saved = sum(1 for result in results if result.status == "saved")
+    failed = sum(1 for result in results if result.status == "error")
+    return BatchResponse(saved=saved, failed=failed, results=results)
+
+
 @router.get("", response_model=dict)
-def get_popular_movies(page: int = Query(1, ge=1)):
+async def get_popular_movies(page: int = Query(1, ge=1)):
     """Fetch popular movies from TMDB.
     
     Args:
@@ -128,7 +194,7 @@ def get_popular_movies(page: int = Query(1, ge=1)):
         Movies list with pagination info
     """
     try:
-        tmdb_data = TMDBClient.get_popular_movies(page=page)
+        tmdb_data = await async_tmdb_client.get_popular_movies(page=page)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -146,7 +212,7 @@ def get_popular_movies(page: int = Query(1, ge=1)):
 
 
 @router.get("/search", response_model=dict)
-def search_movies(q: str = Query(..., min_length=1), page: int = Query(1, ge=1)):
+async def search_movies(q: str = Query(..., min_length=1), page: int = Query(1, ge=1)):
     """Search for movies by title.
     
     Args:
@@ -156,34 +222,98 @@ def search_movies(q: str = Query(..., min_length=1), page: int = Query(1, ge=1))
     Returns:
         Search results with pagination info
     """
+    # Answered from the local catalog index; TMDB only when local recall is too low
     try:
-        tmdb_data = TMDBClient.search_movies(query=q, page=page)
+        return await movie_search.search(q, page=page)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to search TMDB: {exc}",
         )
 
-    movies = [transform_movie_for_api(m) for m in tmdb_data.get("results", [])]
 
-    return {
-        "movies": movies,
-        "page": tmdb_data.get("page"),
-        "total_pages": tmdb_data.get("total_pages"),
-        "total_results": tmdb_data.get("total_results"),
-    }
+@router.get("/autocomplete", response_model=dict)
+async def autocomplete_movies(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(AUTOCOMPLETE_MAX_RESULTS, ge=1, le=AUTOCOMPLETE_MAX_RESULTS),
+):
+    """Typeahead title completions, most popular first.
+    
+    Args:
+        q: Prefix typed so far
+        limit: Number of completions to return
+        
+    Returns:
+        Matching titles with tmdb_id and release year
+    """
+    # Pure in-memory lookup (microseconds), so it runs on the event loop
+    return {"query": q, "results": movie_autocomplete.complete(q, limit)}
+
+
+@router.get("/deck", response_model=dict)
+async def get_swipe_deck(
+    limit: int = Query(DECK_PAGE_SIZE, ge=1, le=50),
+    cursor: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Popular movies the current user has not rated or watchlisted yet.
+    
+    Pass the response's ``next_cursor`` as ``?cursor=`` for the next batch
+    (``null`` once TMDB's popular list is exhausted).
+    """
+    try:
+        start = decode_deck_cursor(cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    try:
+        return await swipe_deck.deal(user.id, start, limit)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to build swipe deck: {exc}",
+        )
+
+
+@router.get("/recommendations", response_model=dict)
+async def get_recommendations(
+    limit: int = Query(20, ge=1, le=100),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Movies the current user has not rated, ranked by the item-item model.
+    
+    Users with no usable ratings (or before a model is built) get popular
+    movies instead; ``source`` tells which one answered.
+    """
+    try:
+        return await movie_recommender.recommend(user.id, limit)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to build recommendations: {exc}",
+        )
 
 
 @router.get("/{movie_id}/details", response_model=dict)
-def get_movie_details(
+async def get_movie_details(
     movie_id: int,
     region: str = Query("US", min_length=2, max_length=2),
     authorization: str | None = Header(default=None),
 ):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + MOVIE_DETAILS_DEADLINE
+
+    # TMDB and Supabase lookups are independent, so start them all at once;
+    # page latency becomes the slowest call instead of the sum of all of them.
+    # Details, videos and providers come back from one bundled TMDB request.
+    personal_task = asyncio.ensure_future(_load_personal_lists(movie_id, authorization))
     try:
-        details = TMDBClient.get_movie_details_with_videos(movie_id=movie_id)
-        providers = TMDBClient.get_watch_providers(movie_id=movie_id)
+        details = await asyncio.wait_for(
+            async_tmdb_client.get_movie_bundle(movie_id=movie_id),
+            timeout=MOVIE_DETAILS_DEADLINE,
+        )
     except Exception as exc:
+        personal_task.cancel()
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch movie details: {exc}",
@@ -192,43 +322,14 @@ def get_movie_details(
     movie = transform_movie_for_api(details)
     videos = details.get("videos", {}).get("results", [])
     trailer = _pick_trailer(videos)
+    providers = details.get("watch/providers", {})
 
-    personal_lists = {
-        "rated": False,
-        "rating": None,
-        "watchlist_status": None,
-    }
-
-    if authorization:
-        try:
-            user_id = _get_user_id_from_token(authorization)
-            client = supabase_admin or supabase
-
-            rating_result = (
-                client.table("ratings")
-                .select("rating")
-                .eq("user_id", user_id)
-                .eq("tmdb_id", movie_id)
-                .limit(1)
-                .execute()
-            )
-            watchlist_result = (
-                client.table("watchlist")
-                .select("status")
-                .eq("user_id", user_id)
-                .eq("tmdb_id", movie_id)
-                .limit(1)
-                .execute()
-            )
-
-            if rating_result.data:
-                personal_lists["rated"] = True
-                personal_lists["rating"] = rating_result.data[0].get("rating")
-
-            if watchlist_result.data:
-                personal_lists["watchlist_status"] = watchlist_result.data[0].get("status")
-        except Exception:
-            pass
+    try:
+        personal_lists = await asyncio.wait_for(
+            personal_task, timeout=max(0.0, deadline - loop.time())
+        )
+    except asyncio.TimeoutError:
+        personal_lists = _empty_personal_lists()
 
     return {
         "movie": movie,
@@ -241,73 +342,27 @@ def get_movie_details(
 @router.post("/ratings", response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
 def create_rating(
     payload: RatingRequest,
-    authorization: str | None = Header(default=None),
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Create or update a rating for a movie.
     
     Args:
         payload: Rating data (tmdb_id, rating, review)
-        authorization: Bearer token for user authentication
+        user: Authenticated user
         
     Returns:
         Created/updated rating
     """
-    token = _extract_bearer_token(authorization)
-
     try:
-        auth_user = supabase.auth.get_user(token)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {exc}",
-        )
-
-    user = getattr(auth_user, "user", None)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+        rating_data = repository.save_rating(
+            user.id, payload.tmdb_id, payload.rating, payload.review
         )
-
-    user_id = user.id
-
-    client = supabase_admin or supabase
-
-    # Check if rating already exists
-    try:
-        existing = client.table("ratings").select("id").eq("user_id", user_id).eq(
-            "tmdb_id", payload.tmdb_id
-        ).execute()
-
-        if existing.data:
-            # Update existing
-            rating_id = existing.data[0]["id"]
-            result = client.table("ratings").update(
-                {
-                    "rating": payload.rating,
-                    "review": payload.review,
-                    "updated_at": datetime.utcnow().isoformat(),
-                }
-            ).eq("id", rating_id).execute()
-        else:
-            # Create new
-            result = client.table("ratings").insert(
-                {
-                    "user_id": user_id,
-                    "tmdb_id": payload.tmdb_id,
-                    "rating": payload.rating,
-                    "review": payload.review,
-                }
-            ).execute()
-
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save rating: {exc}",
         )
 
-    rating_data = result.data[0]
-
     return RatingResponse(
         id=rating_data["id"],
         user_id=rating_data["user_id"],
@@ -318,32 +373,54 @@ def create_rating(
     )
 
 
-@router.get("/ratings/me", response_model=dict)
-def get_my_ratings(authorization: str | None = Header(default=None)):
-    """Get current user's ratings.
-    
+@router.post("/ratings/batch", response_model=BatchResponse)
+def create_ratings_batch(
+    payload: RatingBatchRequest,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Create or update many ratings in a single bulk upsert.
+
+    Args:
+        payload: Up to 500 ratings, e.g. swipes queued while offline
+        user: Authenticated user
+
     Returns:
-        List of user's ratings
+        Counts and a result per submitted item
     """
-    token = _extract_bearer_token(authorization)
-
     try:
-        auth_user = supabase.auth.get_user(token)
+        return _write_batch(
+            payload.items,
+            {},
+            lambda items: repository.save_ratings(
+                user.id, [item.model_dump() for item in items]
+            ),
+        )
     except Exception as exc:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {exc}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save ratings: {exc}",
         )
 
-    user = getattr(auth_user, "user", None)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
 
+@router.get(
+    "/ratings/me", response_model=dict, dependencies=[Depends(conditional_user_read)]
+)
+def get_my_ratings(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Get current user's ratings, newest first.
+    
+    Returns:
+        One page of the user's ratings and the cursor for the next page
+        (``next_cursor`` is null on the last page)
+    """
+    after = _page_key(cursor)
     try:
-        result = supabase.table("ratings").select("*").eq("user_id", user.id).execute()
+        rating_rows, next_cursor = split_page(
+            repository.list_ratings(user.id, limit + 1, after), limit
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -359,36 +436,37 @@ def get_my_ratings(authorization: str | None = Header(default=None)):
             review=r.get("review"),
             created_at=r.get("created_at", ""),
         )
-        for r in result.data
+        for r in rating_rows
     ]
 
-    return {"ratings": ratings}
-
+    return {"ratings": ratings, "next_cursor": next_cursor}
 
-@router.get("/ratings/me/details", response_model=dict)
-def get_my_ratings_details(authorization: str | None = Header(default=None)):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
 
+@router.get(
+    "/ratings/me/details", response_model=dict, dependencies=[Depends(conditional_user_read)]
+)
+async def get_my_ratings_details(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    after = _page_key(cursor)
     try:
-        result = client.table("ratings").select("*").eq("user_id", user_id).execute()
+        rows = await run_in_threadpool(repository.list_ratings, user.id, limit + 1, after)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch ratings: {exc}",
         )
 
-    ratings = result.data or []
+    ratings, next_cursor = split_page(rows, limit)
+
+    # Only the current page is hydrated from TMDB
     tmdb_ids = list({rating.get("tmdb_id") for rating in ratings if rating.get("tmdb_id")})
-    movie_map = _fetch_movie_map(tmdb_ids)
-
-    sorted_ratings = sorted(
-        ratings,
-        key=lambda rating: _parse_datetime(
-            rating.get("updated_at") or rating.get("created_at")
-        ),
-        reverse=True,
-    )
+    movie_map = await _fetch_movie_map(tmdb_ids)
+    if len(movie_map) < len(tmdb_ids):
+        drop_validators(response.headers)
 
     return {
         "ratings": [
@@ -399,19 +477,17 @@ def get_my_ratings_details(authorization: str | None = Header(default=None)):
                 "updated_at": rating.get("updated_at", ""),
                 "movie": movie_map.get(rating.get("tmdb_id")),
             }
-            for rating in sorted_ratings
-        ]
+            for rating in ratings
+        ],
+        "next_cursor": next_cursor,
     }
 
 
 @router.post("/watchlist", response_model=WatchlistResponse, status_code=status.HTTP_201_CREATED)
 def upsert_watchlist_item(
     payload: WatchlistRequest,
-    authorization: str | None = Header(default=None),
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
-
     if payload.status not in WATCHLIST_STATUS_LABELS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -419,47 +495,15 @@ def upsert_watchlist_item(
         )
 
     try:
-        existing = (
-            client.table("watchlist")
-            .select("id")
-            .eq("user_id", user_id)
-            .eq("tmdb_id", payload.tmdb_id)
-            .limit(1)
-            .execute()
-        )
-
-        if existing.data:
-            watchlist_id = existing.data[0]["id"]
-            result = (
-                client.table("watchlist")
-                .update(
-                    {
-                        "status": payload.status,
-                        "updated_at": datetime.utcnow().isoformat(),
-                    }
-                )
-                .eq("id", watchlist_id)
-                .execute()
-            )
-        else:
-            result = (
-                client.table("watchlist")
-                .insert(
-                    {
-                        "user_id": user_id,
-                        "tmdb_id": payload.tmdb_id,
-                        "status": payload.status,
-                    }
-                )
-                .execute()
-            )
+        watchlist_item = repository.save_watchlist_entry(
+            user.id, payload.tmdb_id, payload.status
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save watchlist item: {exc}",
         )
 
-    watchlist_item = result.data[0]
     return WatchlistResponse(
         id=watchlist_item["id"],
         user_id=watchlist_item["user_id"],
@@ -469,60 +513,78 @@ def upsert_watchlist_item(
     )
 
 
+@router.post("/watchlist/batch", response_model=BatchResponse)
+def upsert_watchlist_batch(
+    payload: WatchlistBatchRequest,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    errors = {
+        index: "Invalid watchlist status"
+        for index, item in enumerate(payload.items)
+        if item.status not in WATCHLIST_STATUS_LABELS
+    }
+
+    try:
+        return _write_batch(
+            payload.items,
+            errors,
+            lambda items: repository.save_watchlist_entries(
+                user.id, [item.model_dump() for item in items]
+            ),
+        )
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to save watchlist items: {exc}",
+        )
+
+
 @router.delete("/watchlist/{tmdb_id}", response_model=dict)
 def delete_watchlist_item(
     tmdb_id: int,
-    authorization: str | None = Header(default=None),
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
-
     try:
-        result = (
-            client.table("watchlist")
-            .delete()
-            .eq("user_id", user_id)
-            .eq("tmdb_id", tmdb_id)
-            .execute()
-        )
+        removed = repository.delete_watchlist_entry(user.id, tmdb_id)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to remove watchlist item: {exc}",
         )
 
-    removed = bool(result.data)
     return {"removed": removed}
 
 
-@router.get("/watchlist/me/details", response_model=dict)
-def get_my_watchlist_details(authorization: str | None = Header(default=None)):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
-
+@router.get(
+    "/watchlist/me/details", response_model=dict, dependencies=[Depends(conditional_user_read)]
+)
+async def get_my_watchlist_details(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    after = _page_key(cursor)
     try:
-        result = client.table("watchlist").select("*").eq("user_id", user_id).execute()
+        rows = await run_in_threadpool(repository.list_watchlist, user.id, limit + 1, after)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch watchlist: {exc}",
         )
 
-    watchlist_items = result.data or []
-    sorted_items = sorted(
-        watchlist_items,
-        key=lambda entry: _parse_datetime(entry.get("updated_at") or entry.get("created_at")),
-        reverse=True,
-    )
+    watchlist_items, next_cursor = split_page(rows, limit)
 
     tmdb_ids = list(
         {
             item.get("tmdb_id")
-            for item in sorted_items
+            for item in watchlist_items
             if item.get("tmdb_id")
         }
     )
-    movie_map = _fetch_movie_map(tmdb_ids)
+    movie_map = await _fetch_movie_map(tmdb_ids)
+    if len(movie_map) < len(tmdb_ids):
+        drop_validators(response.headers)
 
     return {
         "watchlist": [
@@ -537,23 +599,24 @@ def get_my_watchlist_details(authorization: str | None = Header(default=None)):
                 "updated_at": item.get("updated_at", ""),
                 "movie": movie_map.get(item.get("tmdb_id")),
             }
-            for item in sorted_items
-        ]
+            for item in watchlist_items
+        ],
+        "next_cursor": next_cursor,
     }
 
 
-@router.get("/lists/me", response_model=dict)
-def get_my_custom_lists(authorization: str | None = Header(default=None)):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
-
+@router.get(
+    "/lists/me", response_model=dict, dependencies=[Depends(conditional_user_read)]
+)
+def get_my_custom_lists(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    after = _page_key(cursor)
     try:
-        result = (
-            client.table("custom_lists")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("updated_at", desc=True)
-            .execute()
+        lists, next_cursor = split_page(
+            repository.list_custom_lists(user.id, limit + 1, after), limit
         )
     except Exception as exc:
         raise HTTPException(
@@ -561,7 +624,6 @@ def get_my_custom_lists(authorization: str | None = Header(default=None)):
             detail=f"Failed to fetch custom lists: {exc}",
         )
 
-    lists = result.data or []
     return {
         "lists": [
             CustomListResponse(
@@ -575,18 +637,16 @@ def get_my_custom_lists(authorization: str | None = Header(default=None)):
                 updated_at=item.get("updated_at", ""),
             )
             for item in lists
-        ]
+        ],
+        "next_cursor": next_cursor,
     }
 
 
 @router.post("/lists", response_model=CustomListResponse, status_code=status.HTTP_201_CREATED)
 def create_custom_list(
     payload: CustomListCreateRequest,
-    authorization: str | None = Header(default=None),
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
-
     if payload.sort_mode not in CUSTOM_LIST_SORT_MODES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -603,19 +663,12 @@ def create_custom_list(
     description_value = payload.description.strip() if payload.description else None
 
     try:
-        result = (
-            client.table("custom_lists")
-            .insert(
-                {
-                    "user_id": user_id,
-                    "name": name_value,
-                    "description": description_value,
-                    "is_public": payload.is_public,
-                    "sort_mode": payload.sort_mode,
-                    "updated_at": datetime.utcnow().isoformat(),
-                }
-            )
-            .execute()
+        item = repository.create_custom_list(
+            user.id,
+            name_value,
+            description_value,
+            payload.is_public,
+            payload.sort_mode,
         )
     except Exception as exc:
         raise HTTPException(
@@ -623,7 +676,6 @@ def create_custom_list(
             detail=f"Failed to create custom list: {exc}",
         )
 
-    item = result.data[0]
     return CustomListResponse(
         id=item["id"],
         user_id=item["user_id"],
@@ -636,45 +688,22 @@ def create_custom_list(
     )
 
 
-@router.get("/profile/summary", response_model=dict)
-def get_profile_summary(authorization: str | None = Header(default=None)):
-    user_id = _get_user_id_from_token(authorization)
-    client = supabase_admin or supabase
-
+@router.get(
+    "/profile/summary", response_model=dict, dependencies=[Depends(conditional_user_read)]
+)
+async def get_profile_summary(
+    response: Response, user: AuthenticatedUser = Depends(get_current_user)
+):
     try:
-        ratings_result = (
-            client.table("ratings").select("*").eq("user_id", user_id).execute()
-        )
-        watchlist_result = (
-            client.table("watchlist").select("*").eq("user_id", user_id).execute()
-        )
+        summary = await run_in_threadpool(repository.get_profile_summary, user.id)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch profile summary: {exc}",
         )
 
-    ratings = ratings_result.data or []
-    watchlist = watchlist_result.data or []
-
-    ratings_recent = sorted(
-        ratings,
-        key=lambda rating: _parse_datetime(
-            rating.get("updated_at") or rating.get("created_at")
-        ),
-        reverse=True,
-    )
-    ratings_top = sorted(
-        ratings,
-        key=lambda rating: (
-            rating.get("rating") or 0,
-            _parse_datetime(rating.get("updated_at") or rating.get("created_at")),
-        ),
-        reverse=True,
-    )
-
-    recent_items = ratings_recent[:10]
-    top_items = ratings_top[:10]
+    recent_items = summary.get("recent") or []
+    top_items = summary.get("top_rated") or []
 
     tmdb_ids = list(
         {
@@ -683,7 +712,9 @@ def get_profile_summary(authorization: str | None = Header(default=None)):
             if item.get("tmdb_id")
         }
     )
-    movie_map = _fetch_movie_map(tmdb_ids)
+    movie_map = await _fetch_movie_map(tmdb_ids)
+    if len(movie_map) < len(tmdb_ids):
+        drop_validators(response.headers)
 
     def map_rating_item(item: dict) -> dict:
         tmdb_id = item.get("tmdb_id")
@@ -695,19 +726,8 @@ def get_profile_summary(authorization: str | None = Header(default=None)):
             "movie": movie_map.get(tmdb_id),
         }
 
-    ratings_count = len(ratings)
-    average_rating = (
-        round(sum(r.get("rating") or 0 for r in ratings) / ratings_count, 2)
-        if ratings_count
-        else 0.0
-    )
-
     status_counts: dict[str, int] = {key: 0 for key in WATCHLIST_STATUS_LABELS}
-    for entry in watchlist:
-        status_value = entry.get("status") or "to_watch"
-        if status_value not in status_counts:
-            status_counts[status_value] = 0
-        status_counts[status_value] += 1
+    status_counts.update(summary.get("status_counts") or {})
 
     watchlist_summary = [
         {
@@ -722,9 +742,88 @@ def get_profile_summary(authorization: str | None = Header(default=None)):
         "recent": [map_rating_item(item) for item in recent_items],
         "top_rated": [map_rating_item(item) for item in top_items],
         "stats": {
-            "ratings_count": ratings_count,
-            "average_rating": average_rating,
-            "watchlist_count": len(watchlist),
+            "ratings_count": summary.get("ratings_count", 0),
+            "average_rating": float(summary.get("average_rating") or 0.0),
+            "rating_histogram": summary.get("rating_histogram") or [0] * 21,
+            "watchlist_count": summary.get("watchlist_count", 0),
         },
         "watchlist_summary": watchlist_summary,
     }
+
+
+@router.post("/import", response_model=dict, status_code=status.HTTP_202_ACCEPTED)
+async def import_library(
+    file: UploadFile = File(...),
+    watchlist_status: str = Query("to_watch"),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Import a Letterboxd or IMDb CSV export as a background job.
+
+    Rows with a rating are saved as ratings (converted to the 0-10 scale);
+    rows without one are added to the watchlist with ``watchlist_status``
+    (e.g. ``completed`` for a Letterboxd watched.csv). Poll
+    ``GET /movies/import/{job_id}`` for progress.
+    """
+    if watchlist_status not in WATCHLIST_STATUS_LABELS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid watchlist status",
+        )
+
+    try:
+        job = await movie_importer.start(user.id, file.file, watchlist_status)
+    except ImportInProgress as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        )
+    except ImportTooLarge as exc:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=str(exc),
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid CSV file: {exc}",
+        )
+    return job.to_dict()
+
+
+@router.get("/import/{job_id}", response_model=dict)
+def get_import_job(job_id: str, user: AuthenticatedUser = Depends(get_current_user)):
+    """Progress of one of the current user's imports (kept for IMPORT_JOB_TTL once finished)."""
+    job = movie_importer.get(user.id, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found",
+        )
+    return job.to_dict()
+
+
+@router.get("/export")
+async def export_library(
+    export_format: str = Query("ndjson", alias="format"),
+    user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Download the current user's ratings, watchlist and lists (``format`` is ndjson or csv).
+
+    The file is streamed page by page with movie metadata attached, so
+    memory use stays flat however large the library is.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid export format",
+        )
+
+    media_type, extension = EXPORT_FORMATS[export_format]
+    return StreamingResponse(
+        library_export.stream(user.id, export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="letterbox-library.{extension}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -1,38 +1,21 @@
-from fastapi import APIRouter, Header, HTTPException, status
-from app.database import supabase, supabase_admin
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from app.repositories import repository
+from app.dependencies import conditional_user_read, get_current_user
 from app.schemas.profile import ProfileResponse, UpdateProfileRequest
-from app.routes.auth import _extract_bearer_token
+from app.services.auth import AuthenticatedUser
+from app.services.conditional import drop_validators
+from app.services.taste import taste_profiles
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
 
-@router.get("/me", response_model=ProfileResponse)
-def get_profile(authorization: str | None = Header(default=None)):
+@router.get(
+    "/me", response_model=ProfileResponse, dependencies=[Depends(conditional_user_read)]
+)
+def get_profile(user: AuthenticatedUser = Depends(get_current_user)):
     """Get current user's profile."""
-    token = _extract_bearer_token(authorization)
-
-    try:
-        auth_user = supabase.auth.get_user(token)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {exc}",
-        )
-
-    user = getattr(auth_user, "user", None)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-
     try:
-        result = (
-            supabase.table("profiles")
-            .select("*")
-            .eq("user_id", user.id)
-            .execute()
-        )
+        profile_data = repository.get_profile(user.id)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -40,27 +23,20 @@ def get_profile(authorization: str | None = Header(default=None)):
         )
 
     # If profile doesn't exist, create an empty one
-    if not result.data:
-        if not supabase_admin:
+    if not profile_data:
+        if not repository.can_bypass_rls:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Profile not found. Server is missing SUPABASE_SERVICE_ROLE_KEY to create one.",
             )
 
         try:
-            create_result = (
-                supabase_admin.table("profiles")
-                .upsert({"user_id": user.id}, on_conflict="user_id")
-                .execute()
-            )
-            profile_data = create_result.data[0]
+            profile_data = repository.create_profile(user.id)
         except Exception as exc:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to create profile: {exc}",
             )
-    else:
-        profile_data = result.data[0]
 
     return ProfileResponse(
         id=profile_data["id"],
@@ -76,26 +52,9 @@ def get_profile(authorization: str | None = Header(default=None)):
 @router.put("/me", response_model=ProfileResponse)
 def update_profile(
     payload: UpdateProfileRequest,
-    authorization: str | None = Header(default=None),
+    user: AuthenticatedUser = Depends(get_current_user),
 ):
     """Update current user's profile."""
-    token = _extract_bearer_token(authorization)
-
-    try:
-        auth_user = supabase.auth.get_user(token)
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {exc}",
-        )
-
-    user = getattr(auth_user, "user", None)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-
     # Build update dict with only non-None values
     update_data = {}
     if payload.display_name is not None:
@@ -112,27 +71,19 @@ def update_profile(
         )
 
     try:
-        client = supabase_admin or supabase
-        result = (
-            client.table("profiles")
-            .update(update_data)
-            .eq("user_id", user.id)
-            .execute()
-        )
+        profile_data = repository.update_profile(user.id, update_data)
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update profile: {exc}",
         )
 
-    if not result.data:
+    if not profile_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found",
         )
 
-    profile_data = result.data[0]
-
     return ProfileResponse(
         id=profile_data["id"],
         user_id=profile_data["user_id"],
@@ -141,4 +92,23 @@ def update_profile(
         avatar_url=profile_data.get("avatar_url"),
         created_at=profile_data.get("created_at", ""),
         updated_at=profile_data.get("updated_at", ""),
-    )
\ No newline at end of file
+    )
+
+
+@router.get(
+    "/me/taste", response_model=dict, dependencies=[Depends(conditional_user_read)]
+)
+async def get_taste_profile(
+    response: Response, user: AuthenticatedUser = Depends(get_current_user)
+):
+    """Genre affinities, decade preferences and rating distribution of the current user."""
+    try:
+        profile, complete = await taste_profiles.get(user.id)
+    except Exception as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to build taste profile: {exc}",
+        )
+    if not complete:
+        drop_validators(response.headers)
+    return profile
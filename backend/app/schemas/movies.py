@@ -39,6 +39,32 @@ class WatchlistRequest(BaseModel):
     status: str = Field(default="to_watch")  # watching, completed, on_hold, dropped
 
 
+class RatingBatchRequest(BaseModel):
+    """Request model for writing many ratings at once."""
+    items: list[RatingRequest] = Field(min_length=1, max_length=500)
+
+
+class WatchlistBatchRequest(BaseModel):
+    """Request model for writing many watchlist entries at once."""
+    items: list[WatchlistRequest] = Field(min_length=1, max_length=500)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of a single item in a batch write."""
+    index: int
+    tmdb_id: int
+    status: str  # saved, superseded, error
+    id: Optional[str] = None
+    detail: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    """Response model for batch writes."""
+    saved: int
+    failed: int
+    results: list[BatchItemResult]
+
+
 class WatchlistResponse(BaseModel):
     """Response model for watchlist entry."""
     id: str
@@ -0,0 +1,69 @@
+"""Build the item-item recommendation model from the ratings table.
+
+Streams every rating in (user_id, tmdb_id) order into flat arrays, computes
+mean-centered cosine similarities between movies with sparse matrix products
+(in blocks, so memory stays bounded), shrinks those backed by few common
+raters, keeps the top neighbors per movie and
+writes the model file the API reloads on its next check.
+
+Usage (from backend/):
+    python -m app.scripts.build_recommendations [--output recommender_model.npz]
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.repositories import repository
+from app.services.recommendations import (
+    MIN_MOVIE_RATINGS,
+    NEIGHBORS_PER_MOVIE,
+    RECOMMENDER_MODEL_PATH,
+    SIMILARITY_SHRINKAGE,
+    ItemSimilarityModel,
+    load_rating_arrays,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=RECOMMENDER_MODEL_PATH, help="model file to write")
+    parser.add_argument("--neighbors", type=int, default=NEIGHBORS_PER_MOVIE)
+    parser.add_argument("--min-ratings", type=int, default=MIN_MOVIE_RATINGS)
+    parser.add_argument(
+        "--shrinkage", type=float, default=SIMILARITY_SHRINKAGE, help="0 disables it"
+    )
+    parser.add_argument("--page-size", type=int, default=50000, help="ratings fetched per query")
+    args = parser.parse_args()
+
+    if not repository.can_bypass_rls:
+        print("Error: reading all ratings needs DATABASE_URL or SUPABASE_SERVICE_ROLE_KEY")
+        return 2
+
+    started = time.monotonic()
+    users, tmdb_ids, ratings = load_rating_arrays(repository, args.page_size)
+    loaded = time.monotonic()
+    user_count = int(users.max()) + 1 if len(users) else 0
+    print(f"Loaded {len(ratings)} ratings from {user_count} users in {loaded - started:.1f}s")
+
+    model = ItemSimilarityModel.build(
+        users,
+        tmdb_ids,
+        ratings,
+        k=args.neighbors,
+        min_ratings=args.min_ratings,
+        shrinkage=args.shrinkage,
+    )
+    with_neighbors = int((model.neighbors[:, :1] >= 0).sum()) if model.neighbors.size else 0
+    print(
+        f"Built neighbors for {with_neighbors} of {len(model)} movies "
+        f"in {time.monotonic() - loaded:.1f}s"
+    )
+
+    model.save(args.output)
+    print(f"Wrote {args.output} ({os.path.getsize(args.output) / 2**20:.1f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Bulk-load movie_catalog from a TMDB daily ID export.
+
+Streams the gzipped JSON-lines export (e.g. movie_ids_05_15_2026.json.gz from
+http://files.tmdb.org/p/exports/) without loading it into memory, skips ids
+already in the catalog, fetches the rest from TMDB with bounded concurrency
+and a request rate cap, and bulk-upserts each batch. Progress is checkpointed
+after every stored batch, so an interrupted run resumes where it stopped. Ids
+TMDB failed to return are kept in the checkpoint and retried first on the next run.
+
+Usage (from backend/):
+    python -m app.scripts.load_catalog movie_ids_05_15_2026.json.gz --min-popularity 1
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from app.repositories import repository
+from app.services.catalog import catalog_row_from_tmdb
+from app.services.tmdb import AsyncTMDBClient
+
+
+@dataclass
+class LoadStats:
+    """Running totals for a load, printed after every batch."""
+    lines: int = 0
+    skipped: int = 0
+    existing: int = 0
+    fetched: int = 0
+    failed: int = 0
+    retried: int = 0
+    stored: int = 0
+
+    def report(self, elapsed: float) -> str:
+        elapsed = max(elapsed, 1e-9)
+        return (
+            f"lines={self.lines} ({self.lines / elapsed:.0f}/s) "
+            f"skipped={self.skipped} existing={self.existing} "
+            f"fetched={self.fetched} ({self.fetched / elapsed:.1f}/s) "
+            f"failed={self.failed} retried={self.retried} stored={self.stored}"
+        )
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second on average."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def read_export(path: str, start_after: int = 0) -> Iterator[tuple[int, dict]]:
+    """Yield (line number, record) from a gzipped JSON-lines export, one line at a time."""
+    with gzip.open(path, "rt", encoding="utf-8") as export:
+        for line_no, line in enumerate(export, start=1):
+            if line_no <= start_after or not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Warning: Skipping malformed line {line_no}")
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def read_checkpoint(path: str) -> tuple[int, list[int]]:
+    """Return the last processed line and the ids whose fetch failed before it."""
+    try:
+        with open(path, encoding="utf-8") as checkpoint:
+            data = json.load(checkpoint)
+    except FileNotFoundError:
+        return 0, []
+    return int(data["line"]), [int(tmdb_id) for tmdb_id in data.get("failed", [])]
+
+
+def write_checkpoint(path: str, line_no: int, failed: list[int]) -> None:
+    # Write-then-rename so a crash never leaves a truncated checkpoint
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as checkpoint:
+        json.dump({"line": line_no, "failed": failed}, checkpoint)
+    os.replace(temp_path, path)
+
+
+async def fetch_details(
+    client: AsyncTMDBClient,
+    tmdb_ids: list[int],
+    limiter: RateLimiter,
+    semaphore: asyncio.Semaphore,
+) -> list[Optional[dict]]:
+    """Fetch details for every id; None marks ids TMDB could not return."""
+
+    async def fetch_one(tmdb_id: int) -> Optional[dict]:
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                return await client.get_movie_details(tmdb_id)
+            except Exception:
+                return None
+
+    return await asyncio.gather(*(fetch_one(tmdb_id) for tmdb_id in tmdb_ids))
+
+
+async def load(args: argparse.Namespace) -> LoadStats:
+    checkpoint_path = args.checkpoint or f"{args.export}.checkpoint"
+    start_after, previously_failed = (0, []) if args.restart else read_checkpoint(checkpoint_path)
+    if start_after:
+        print(f"Resuming after line {start_after}")
+    # Ids TMDB did not return; they stay in the checkpoint until a later fetch succeeds
+    failed = set(previously_failed)
+
+    stats = LoadStats()
+    position = start_after
+
+    def wanted(entry: tuple[int, dict]) -> bool:
+        nonlocal position
+        position, record = entry
+        stats.lines += 1
+        keep = (
+            isinstance(record.get("id"), int)
+            and (args.include_adult or not record.get("adult"))
+            and (record.get("popularity") or 0) >= args.min_popularity
+        )
+        if not keep:
+            stats.skipped += 1
+        return keep
+
+    # The catalog cache would only hold each response once; bypass it
+    client = AsyncTMDBClient(pool_size=args.concurrency, cache=None)
+    limiter = RateLimiter(args.rate)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    started = time.monotonic()
+    pending_store: Optional[asyncio.Task] = None
+    last_line = start_after
+    stopped_early = False
+
+    async def store(rows: list[dict], line_no: int, failed_ids: list[int]) -> None:
+        if rows:
+            await asyncio.to_thread(repository.save_catalog_movies, rows)
+        stats.stored += len(rows)
+        write_checkpoint(checkpoint_path, line_no, failed_ids)
+
+    async def process(tmdb_ids: list[int], line_no: int) -> None:
+        nonlocal pending_store
+        existing = await asyncio.to_thread(repository.get_catalog_movies, tmdb_ids)
+        known = {row["tmdb_id"] for row in existing}
+        missing = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id not in known]
+        stats.existing += len(known)
+
+        # Fetch this batch while the previous one is still being written
+        details = await fetch_details(client, missing, limiter, semaphore)
+        rows = [catalog_row_from_tmdb(movie) for movie in details if movie]
+        stats.fetched += len(rows)
+        stats.failed += len(missing) - len(rows)
+        failed.difference_update(tmdb_ids)
+        failed.update(tmdb_id for tmdb_id, movie in zip(missing, details) if not movie)
+
+        if pending_store is not None:
+            await pending_store
+        pending_store = asyncio.create_task(store(rows, line_no, sorted(failed)))
+        print(stats.report(time.monotonic() - started), flush=True)
+
+    try:
+        if previously_failed:
+            print(f"Retrying {len(previously_failed)} ids that failed before")
+        for tmdb_ids in batched(previously_failed, args.batch_size):
+            stats.retried += len(tmdb_ids)
+            await process(tmdb_ids, start_after)
+
+        records = filter(wanted, read_export(args.export, start_after))
+        for batch in batched(records, args.batch_size):
+            last_line = batch[-1][0]
+            await process(list(dict.fromkeys(record["id"] for _, record in batch)), last_line)
+
+            if args.limit and stats.fetched >= args.limit:
+                stopped_early = True
+                break
+
+        if pending_store is not None:
+            await pending_store
+        # Filtered-out lines after the last batch count as processed too
+        if not stopped_early and position > last_line:
+            write_checkpoint(checkpoint_path, position, sorted(failed))
+    finally:
+        await client.aclose()
+
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("export", help="path to a movie_ids_MM_DD_YYYY.json.gz export")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16, help="max in-flight TMDB requests")
+    parser.add_argument("--rate", type=float, default=40.0, help="max TMDB requests per second")
+    parser.add_argument("--min-popularity", type=float, default=0.0)
+    parser.add_argument("--include-adult", action="store_true")
+    parser.add_argument("--limit", type=int, default=0, help="stop after fetching this many movies")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <export>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    if not repository.can_bypass_rls:
+        print("Error: loading the catalog needs DATABASE_URL or SUPABASE_SERVICE_ROLE_KEY")
+        return 2
+
+    started = time.monotonic()
+    stats = asyncio.run(load(args))
+    print(f"Done in {time.monotonic() - started:.1f}s: {stats.report(time.monotonic() - started)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Compute every user's taste profile in one vectorized pass (offline analytics).
+
+Loads all ratings into flat arrays, joins them to catalog genres and release
+decades by binary search over the catalog's tmdb_ids, sums them per user
+with bincount in chunks of users and writes one JSON line per user: the
+user_id plus the same payload as GET /profile/me/taste.
+
+Usage (from backend/):
+    python -m app.scripts.taste_profiles --output taste_profiles.jsonl
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from app.repositories import repository
+from app.services.catalog import iter_catalog_rows
+from app.services.recommendations import load_rating_arrays
+from app.services.taste import catalog_features, iter_profiles, join_features
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="-", help="JSON lines file (default: stdout)")
+    parser.add_argument("--chunk-users", type=int, default=50000, help="users aggregated at once")
+    parser.add_argument("--page-size", type=int, default=50000, help="ratings fetched per query")
+    args = parser.parse_args()
+
+    if not repository.can_bypass_rls:
+        print("Error: reading all ratings needs DATABASE_URL or SUPABASE_SERVICE_ROLE_KEY")
+        return 2
+
+    started = time.monotonic()
+    features = catalog_features(iter_catalog_rows(repository))
+    user_ids: list[str] = []
+    users, tmdb_ids, ratings = load_rating_arrays(repository, args.page_size, user_ids)
+    masks, decades = join_features(tmdb_ids.astype(np.int64), features)
+    loaded = time.monotonic()
+    print(
+        f"Loaded {len(ratings)} ratings from {len(user_ids)} users and "
+        f"{len(features[0])} catalog movies in {loaded - started:.1f}s",
+        file=sys.stderr,
+    )
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        for user_index, profile in iter_profiles(
+            users, ratings, masks, decades, len(user_ids), args.chunk_users
+        ):
+            output.write(json.dumps({"user_id": user_ids[user_index], **profile}) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.monotonic() - loaded
+    print(
+        f"Profiled {len(user_ids)} users in {elapsed:.1f}s "
+        f"({len(user_ids) / max(elapsed, 1e-9) * 60:.0f} users/minute)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Maintenance for the trigger-maintained user_stats table.
+
+Usage (from backend/):
+    python -m app.scripts.user_stats rebuild [--user-id UUID]
+    python -m app.scripts.user_stats check [--user-id UUID]
+
+``rebuild`` recomputes stats from the ratings and watchlist tables (backfill or
+repair). ``check`` reports every stored value that differs from the raw tables
+and exits with status 1 if any do. Both need DATABASE_URL or SUPABASE_SERVICE_ROLE_KEY.
+"""
+import argparse
+import sys
+
+from app.repositories import repository
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("rebuild", "check"))
+    parser.add_argument("--user-id", help="limit to a single user")
+    args = parser.parse_args()
+
+    if not repository.can_bypass_rls:
+        print("Error: user_stats maintenance needs DATABASE_URL or SUPABASE_SERVICE_ROLE_KEY")
+        return 2
+
+    if args.command == "rebuild":
+        rebuilt = repository.rebuild_user_stats(args.user_id)
+        print(f"Rebuilt stats for {rebuilt} user(s)")
+        return 0
+
+    mismatches = repository.check_user_stats(args.user_id)
+    for mismatch in mismatches:
+        print(
+            f"{mismatch['user_id']} {mismatch['field']}: "
+            f"stored={mismatch['stored']} expected={mismatch['expected']}"
+        )
+    print(f"{len(mismatches)} mismatch(es) found")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
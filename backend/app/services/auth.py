@@ -0,0 +1,321 @@
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import jwt
+import requests
+
+from app.database import SUPABASE_URL, supabase
+from app.repositories import repository
+from app.services.cache import TTLCache
+
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")  # legacy HS256 projects
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+SUPABASE_JWT_ISSUER = f"{SUPABASE_URL.rstrip('/')}/auth/v1"
+SUPABASE_JWKS_URL = f"{SUPABASE_JWT_ISSUER}/.well-known/jwks.json"
+
+# How often (seconds) the signing keys are refreshed in the background
+JWKS_REFRESH_INTERVAL = float(os.getenv("JWKS_REFRESH_INTERVAL", "600"))
+# Minimum gap (seconds) between on-demand refreshes triggered by an unknown key id
+JWKS_MIN_REFRESH_GAP = 30.0
+
+# Verified tokens are remembered until their exp claim, capped by TOKEN_CACHE_MAX_TTL
+# so a session revoked elsewhere is noticed within that many seconds.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+TOKEN_CACHE_MAX_TTL = float(os.getenv("TOKEN_CACHE_MAX_TTL", "300"))
+# Logouts are recorded in the shared revoked_tokens table; a token found there
+# unrevoked is trusted this many seconds before being checked again, which bounds
+# how late other workers notice a logout
+TOKEN_REVOCATION_CHECK_INTERVAL = float(os.getenv("TOKEN_REVOCATION_CHECK_INTERVAL", "5"))
+# Longest lifetime (seconds) an access token can have (Supabase's default JWT expiry);
+# a revocation is never kept longer than this, whatever exp the token claims
+TOKEN_MAX_LIFETIME = float(os.getenv("TOKEN_MAX_LIFETIME", "3600"))
+
+
+class AuthenticationError(Exception):
+    """Raised when a bearer token cannot be resolved to a user."""
+
+
+class SigningKeyUnavailable(Exception):
+    """Raised when no local key can check a token (e.g. right after key rotation)."""
+
+
+@dataclass
+class AuthenticatedUser:
+    """User resolved from a bearer token."""
+    id: str
+    email: Optional[str] = None
+    email_confirmed_at: Optional[str] = None
+    claims: dict = field(default_factory=dict)
+
+
+def extract_bearer_token(authorization: str | None) -> str:
+    """Return the token from an ``Authorization: Bearer <token>`` header."""
+    if not authorization:
+        raise AuthenticationError("Missing Authorization header")
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise AuthenticationError("Invalid Authorization header format")
+
+    return token
+
+
+class JWKSCache:
+    """Supabase signing keys, fetched from the project's JWKS endpoint.
+
+    Keys are refreshed periodically on a daemon thread and on demand when a
+    token names a key id we have not seen yet (rate limited, so random key ids
+    cannot be used to hammer the auth server).
+    """
+
+    def __init__(self, url: str = SUPABASE_JWKS_URL, refresh_interval: float = JWKS_REFRESH_INTERVAL):
+        self.url = url
+        self.refresh_interval = refresh_interval
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> None:
+        response = requests.get(self.url, timeout=5)
+        response.raise_for_status()
+
+        keys: dict[str, jwt.PyJWK] = {}
+        for entry in response.json().get("keys", []):
+            try:
+                keys[entry["kid"]] = jwt.PyJWK(entry)
+            except (KeyError, jwt.PyJWKError):
+                continue
+
+        with self._lock:
+            self._keys = keys
+            self._last_refresh = time.monotonic()
+
+    def get_key(self, kid: str) -> Optional[jwt.PyJWK]:
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Unknown key id: most likely a rotation, so try one refresh. The slot
+        # is claimed under the lock, so a burst of unknown kids fetches once.
+        with self._lock:
+            now = time.monotonic()
+            due = now - self._last_refresh >= JWKS_MIN_REFRESH_GAP
+            if due:
+                self._last_refresh = now
+        if due:
+            try:
+                self.refresh()
+            except Exception as exc:
+                print(f"Warning: Failed to refresh JWKS: {exc}")
+            key = self._keys.get(kid)
+        return key
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as exc:
+                print(f"Warning: Failed to refresh JWKS: {exc}")
+            self._stop.wait(self.refresh_interval)
+
+    def start(self) -> None:
+        """Start background refreshes."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jwks-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+jwks_cache = JWKSCache()
+
+
+def _user_from_claims(claims: dict) -> AuthenticatedUser:
+    return AuthenticatedUser(id=claims["sub"], email=claims.get("email"), claims=claims)
+
+
+def verify_token_locally(token: str) -> AuthenticatedUser:
+    """Verify a Supabase access token's signature, expiry and audience without a network call.
+
+    Raises:
+        jwt.InvalidTokenError: The token is malformed, expired or forged
+        SigningKeyUnavailable: No local key matches the token
+    """
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+
+    if algorithm == "HS256":
+        if not SUPABASE_JWT_SECRET:
+            raise SigningKeyUnavailable("SUPABASE_JWT_SECRET not configured")
+        key = SUPABASE_JWT_SECRET
+    else:
+        kid = header.get("kid")
+        signing_key = jwks_cache.get_key(kid) if kid else None
+        if signing_key is None:
+            raise SigningKeyUnavailable(f"No signing key for kid {kid!r}")
+        # Trust the key's algorithm, never the one claimed by the token header
+        key = signing_key.key
+        algorithm = signing_key.algorithm_name
+
+    claims = jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=SUPABASE_JWT_AUDIENCE,
+        issuer=SUPABASE_JWT_ISSUER,
+        options={"require": ["exp", "sub"]},
+    )
+    return _user_from_claims(claims)
+
+
+def fetch_remote_user(token: str) -> AuthenticatedUser:
+    """Resolve a token by asking the Supabase auth server (one network round-trip)."""
+    try:
+        auth_user = supabase.auth.get_user(token)
+    except Exception as exc:
+        raise AuthenticationError(f"Invalid token: {exc}")
+
+    user = getattr(auth_user, "user", None)
+    if not user:
+        raise AuthenticationError("User not found")
+
+    confirmed_at = getattr(user, "email_confirmed_at", None)
+    try:
+        # The auth server just accepted the token, so its claims (exp) can be trusted
+        claims = jwt.decode(token, options={"verify_signature": False})
+    except jwt.InvalidTokenError:
+        claims = {}
+    return AuthenticatedUser(
+        id=user.id,
+        email=user.email,
+        email_confirmed_at=confirmed_at.isoformat() if hasattr(confirmed_at, "isoformat") else confirmed_at,
+        claims=claims,
+    )
+
+
+class RevokedTokens:
+    """Token hashes revoked in this process, each kept until its token expires.
+
+    Expired entries are purged on insert. Past ``maxsize`` live entries the
+    one expiring soonest is dropped; it stays revoked through the shared
+    revoked_tokens table, which authenticate_token checks after this set.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._expires_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._expires_at = {
+                other: expires_at for other, expires_at in self._expires_at.items() if expires_at > now
+            }
+            if key not in self._expires_at and len(self._expires_at) >= self.maxsize:
+                del self._expires_at[min(self._expires_at, key=self._expires_at.__getitem__)]
+            self._expires_at[key] = now + ttl
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def __contains__(self, key: str) -> bool:
+        expires_at = self._expires_at.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+
+# Keyed by a hash of the token so raw bearer tokens are never held as keys
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+revoked_tokens = RevokedTokens()
+# Tokens recently confirmed absent from the shared revoked_tokens table
+revocation_checks = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _seconds_until_expiry(user: AuthenticatedUser) -> float:
+    """Remaining lifetime of a verified token, capped at TOKEN_MAX_LIFETIME."""
+    exp = user.claims.get("exp")
+    if not exp:
+        return TOKEN_MAX_LIFETIME
+    return min(float(exp) - time.time(), TOKEN_MAX_LIFETIME)
+
+
+def invalidate_token(token: str, user: AuthenticatedUser) -> None:
+    """Reject a token until it expires, in this and every other worker (used on logout).
+
+    ``user`` must come from authenticate_token(token): only verified tokens are
+    recorded, with their verified expiry.
+    """
+    key = _token_key(token)
+    ttl = _seconds_until_expiry(user)
+    token_cache.delete(key)
+    revocation_checks.delete(key)
+    revoked_tokens.add(key, ttl)
+    if repository.can_bypass_rls and ttl > 0:
+        try:
+            repository.revoke_token(key, datetime.now(timezone.utc) + timedelta(seconds=ttl))
+        except Exception as exc:
+            print(f"Warning: Failed to record token revocation: {exc}")
+
+
+def _revoked_elsewhere(key: str, user: AuthenticatedUser) -> bool:
+    """Check the shared revoked_tokens table, at most once per TOKEN_REVOCATION_CHECK_INTERVAL.
+
+    Without a connection that bypasses RLS the table is unreachable and
+    revocation only holds in the worker that handled the logout.
+    """
+    if not repository.can_bypass_rls or revocation_checks.get(key) is not None:
+        return False
+    try:
+        revoked = repository.is_token_revoked(key)
+    except Exception as exc:
+        # Best effort: an unreachable table must not lock every user out
+        print(f"Warning: Failed to check token revocation: {exc}")
+        return False
+    if revoked:
+        revoked_tokens.add(key, _seconds_until_expiry(user))
+        token_cache.delete(key)
+        return True
+    revocation_checks.set(key, True, TOKEN_REVOCATION_CHECK_INTERVAL)
+    return False
+
+
+def authenticate_token(token: str) -> AuthenticatedUser:
+    """Resolve a bearer token to a user.
+
+    Tokens are verified locally; the auth server is only consulted when no
+    local key can check the token (key rotation or missing configuration).
+    Either way the result is cached until the token expires.
+    """
+    key = _token_key(token)
+    if key in revoked_tokens:
+        raise AuthenticationError("Invalid token: token has been revoked")
+
+    user = token_cache.get(key)
+    if user is None:
+        try:
+            user = verify_token_locally(token)
+        except SigningKeyUnavailable:
+            user = fetch_remote_user(token)
+        except jwt.InvalidTokenError as exc:
+            raise AuthenticationError(f"Invalid token: {exc}")
+        token_cache.set(key, user, min(TOKEN_CACHE_MAX_TTL, _seconds_until_expiry(user)))
+
+    # Checked after verification, so forged tokens never reach the database
+    if _revoked_elsewhere(key, user):
+        raise AuthenticationError("Invalid token: token has been revoked")
+    return user
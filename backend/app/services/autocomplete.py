@@ -0,0 +1,234 @@
+import asyncio
+import heapq
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.services.catalog import iter_catalog_rows
+from app.services.search import normalize
+
+# How often (seconds) the completion index is rebuilt from movie_catalog
+AUTOCOMPLETE_REFRESH_INTERVAL = float(os.getenv("AUTOCOMPLETE_REFRESH_INTERVAL", "3600"))
+# Most completions a query can return; per-prefix results are precomputed up to this many
+AUTOCOMPLETE_MAX_RESULTS = 10
+# Prefixes matching more keys than this get their top results precomputed at build time;
+# rarer prefixes are ranked on the fly from at most this many keys
+AUTOCOMPLETE_SCAN_LIMIT = 256
+# Besides the full title, titles are also completed from their 2nd..Nth word ("wars" -> "Star Wars")
+AUTOCOMPLETE_WORD_STARTS = 4
+# Separates packed titles and dates; Postgres text values cannot contain NUL
+_PACK_SEPARATOR = "\0"
+
+
+class CompletionIndex:
+    """Memory-compact prefix index over catalog titles.
+
+    Completion keys (normalized titles and their word suffixes) are sorted and
+    stored back to back in one string, addressed through an ``array`` of
+    offsets; document data lives in parallel ``array``s, with the display
+    titles concatenated the same way. Being a few flat buffers, an index
+    also pickles quickly, which is how a build process hands it back.
+    Every prefix matching more than AUTOCOMPLETE_SCAN_LIMIT keys has its top
+    results precomputed, so a lookup is either a dict hit or a bisect plus a
+    bounded scan.
+    """
+
+    def __init__(self, rows: Iterable[dict]):
+        self.tmdb_ids = array("I")
+        self.popularity = array("f")
+        self.years = array("H")
+        titles: list[str] = []
+
+        entries: list[tuple[str, int]] = []
+        for row in rows:
+            title = row.get("title")
+            tokens = normalize(title).split() if title else []
+            if not tokens:
+                continue
+            doc_id = len(titles)
+            self.tmdb_ids.append(row["tmdb_id"])
+            self.popularity.append(float(row.get("popularity") or 0.0))
+            release_date = row.get("release_date") or ""
+            self.years.append(int(release_date[:4]) if release_date[:4].isdigit() else 0)
+            titles.append(title)
+            for start in range(min(len(tokens), AUTOCOMPLETE_WORD_STARTS)):
+                entries.append((" ".join(tokens[start:]), doc_id))
+
+        entries.sort()
+        keys = [key for key, _ in entries]
+        self.keys = "".join(keys)
+        self.offsets = array("I", accumulate(map(len, keys), initial=0))
+        self.docs = array("I", [doc_id for _, doc_id in entries])
+        del entries, keys
+        self.title_text = "".join(titles)
+        self.title_offsets = array("I", accumulate(map(len, titles), initial=0))
+        del titles
+
+        self.top: dict[str, array] = {}
+        self._collect(0, len(self.docs), 0)
+
+    def __len__(self) -> int:
+        return len(self.tmdb_ids)
+
+    def _key(self, index: int) -> str:
+        return self.keys[self.offsets[index]:self.offsets[index + 1]]
+
+    def _title(self, doc_id: int) -> str:
+        return self.title_text[self.title_offsets[doc_id]:self.title_offsets[doc_id + 1]]
+
+    def _rank(self, doc_ids: Iterable[int]) -> list[int]:
+        """Unique doc ids, most popular first, capped at AUTOCOMPLETE_MAX_RESULTS."""
+        return heapq.nlargest(
+            AUTOCOMPLETE_MAX_RESULTS, set(doc_ids), key=self.popularity.__getitem__
+        )
+
+    def _collect(self, lo: int, hi: int, depth: int) -> list[int]:
+        """Top docs for keys[lo:hi], which share their first ``depth`` characters.
+
+        Heavy ranges are split by the next character and built from their
+        children's results, so every key is scanned once overall.
+        """
+        if hi - lo <= AUTOCOMPLETE_SCAN_LIMIT:
+            return self._rank(self.docs[lo:hi])
+
+        prefix = self._key(lo)[:depth]
+        candidates: list[int] = []
+        index = lo
+        # Keys equal to the prefix itself sort first
+        while index < hi and self.offsets[index + 1] - self.offsets[index] == depth:
+            candidates.append(self.docs[index])
+            index += 1
+        while index < hi:
+            child = prefix + self._key(index)[depth]
+            end = bisect_left(range(len(self.docs)), child + "\uffff", index, hi, key=self._key)
+            candidates.extend(self._collect(index, end, depth + 1))
+            index = end
+
+        ranked = self._rank(candidates)
+        if depth:
+            self.top[prefix] = array("I", ranked)
+        return ranked
+
+    def complete(self, query: str, limit: int = AUTOCOMPLETE_MAX_RESULTS) -> list[dict]:
+        """Most popular titles starting with ``query`` (at the title or a word start)."""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        ranked = self.top.get(prefix)
+        if ranked is None:
+            positions = range(len(self.docs))
+            lo = bisect_left(positions, prefix, key=self._key)
+            hi = bisect_left(positions, prefix + "\uffff", lo, key=self._key)
+            ranked = self._rank(self.docs[lo:hi])
+
+        return [
+            {
+                "tmdb_id": self.tmdb_ids[doc_id],
+                "title": self._title(doc_id),
+                "year": self.years[doc_id] or None,
+            }
+            for doc_id in ranked[:limit]
+        ]
+
+
+def pack_rows(rows: Iterable[dict]) -> tuple:
+    """Catalog rows as flat arrays and joined strings, which pickle in milliseconds."""
+    tmdb_ids = array("I")
+    popularity = array("f")
+    titles: list[str] = []
+    release_dates: list[str] = []
+    for row in rows:
+        tmdb_ids.append(row["tmdb_id"])
+        popularity.append(float(row.get("popularity") or 0.0))
+        titles.append(row.get("title") or "")
+        release_dates.append(row.get("release_date") or "")
+    return tmdb_ids, popularity, _PACK_SEPARATOR.join(titles), _PACK_SEPARATOR.join(release_dates)
+
+
+def build_packed(packed: tuple) -> CompletionIndex:
+    """Build a CompletionIndex from pack_rows() output (runs in the build process)."""
+    tmdb_ids, popularity, titles, release_dates = packed
+    if not tmdb_ids:
+        return CompletionIndex([])
+    return CompletionIndex(
+        {"tmdb_id": tmdb_id, "popularity": score, "title": title, "release_date": release_date}
+        for tmdb_id, score, title, release_date in zip(
+            tmdb_ids,
+            popularity,
+            titles.split(_PACK_SEPARATOR),
+            release_dates.split(_PACK_SEPARATOR),
+        )
+    )
+
+
+class MovieAutocomplete:
+    """Serves completions from a CompletionIndex rebuilt in the background.
+
+    Catalog rows are read in a worker thread, and the index is built in a
+    short-lived child process so the build does not hold this process's GIL
+    while requests are being served. The result is swapped in with a single
+    assignment, so requests always see a complete index.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        refresh_interval: float = AUTOCOMPLETE_REFRESH_INTERVAL,
+    ):
+        self.repository = repo
+        self.refresh_interval = refresh_interval
+        self.index = CompletionIndex([])
+        self._task: Optional[asyncio.Task] = None
+
+    def build(self) -> CompletionIndex:
+        return CompletionIndex(iter_catalog_rows(self.repository))
+
+    def _packed_rows(self) -> tuple:
+        return pack_rows(iter_catalog_rows(self.repository))
+
+    async def rebuild(self) -> None:
+        packed = await run_in_threadpool(self._packed_rows)
+        # A fresh spawned process per build: nothing is forked from a threaded
+        # server, and the builder's memory is returned when it exits
+        executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            self.index = await asyncio.get_running_loop().run_in_executor(
+                executor, build_packed, packed
+            )
+        finally:
+            # Never block the event loop on the child, e.g. when stop() cancels a build
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as exc:
+                print(f"Warning: Failed to rebuild autocomplete index: {exc}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def complete(self, query: str, limit: int = AUTOCOMPLETE_MAX_RESULTS) -> list[dict]:
+        return self.index.complete(query, limit)
+
+
+movie_autocomplete = MovieAutocomplete()
@@ -0,0 +1,161 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.services.tmdb import AsyncTMDBClient, async_tmdb_client, transform_movie_for_api
+
+# Catalog rows older than this (seconds) are still served, then refreshed in the background
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", str(7 * 24 * 60 * 60)))
+
+
+def catalog_row_from_tmdb(tmdb_movie: dict) -> dict:
+    """Reduce a TMDB movie details payload to a movie_catalog row."""
+    return {
+        "tmdb_id": tmdb_movie["id"],
+        "title": tmdb_movie.get("title"),
+        "overview": tmdb_movie.get("overview"),
+        "poster_path": tmdb_movie.get("poster_path"),
+        "backdrop_path": tmdb_movie.get("backdrop_path"),
+        # TMDB sends "" for unknown release dates
+        "release_date": tmdb_movie.get("release_date") or None,
+        "vote_average": tmdb_movie.get("vote_average"),
+        "popularity": tmdb_movie.get("popularity"),
+        "genres": [
+            {"id": genre.get("id"), "name": genre.get("name")}
+            for genre in tmdb_movie.get("genres") or []
+        ],
+    }
+
+
+def movie_from_catalog_row(row: dict) -> dict:
+    """Shape a movie_catalog row like transform_movie_for_api output."""
+    return {
+        "id": row["tmdb_id"],
+        "tmdb_id": row["tmdb_id"],
+        "title": row.get("title"),
+        "overview": row.get("overview"),
+        "poster_path": row.get("poster_path"),
+        "backdrop_path": row.get("backdrop_path"),
+        "release_date": row.get("release_date") or "",
+        "vote_average": row.get("vote_average"),
+        "genres": row.get("genres") or [],
+    }
+
+
+def iter_catalog_rows(repo: Repository = repository, page_size: int = 5000) -> Iterator[dict]:
+    """Stream every movie_catalog row in tmdb_id order, one page in memory at a time."""
+    after = 0
+    while True:
+        page = repo.list_catalog_movies(after, page_size)
+        yield from page
+        if len(page) < page_size:
+            return
+        after = page[-1]["tmdb_id"]
+
+
+def _fetched_at(row: dict) -> datetime:
+    try:
+        return datetime.fromisoformat(row["fetched_at"]).replace(tzinfo=None)
+    except (KeyError, TypeError, ValueError):
+        return datetime.min
+
+
+class MovieCatalog:
+    """Movie metadata served from the movie_catalog table.
+
+    Reads are one query for the whole id set. Ids missing from the table are
+    fetched from TMDB and written through; rows older than ``ttl`` are served
+    as-is and re-fetched in the background.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        client: AsyncTMDBClient = async_tmdb_client,
+        ttl: float = CATALOG_TTL,
+    ):
+        self.repository = repo
+        self.client = client
+        self.ttl = ttl
+        self._refreshing: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get_movie_map(self, tmdb_ids: list[int]) -> dict[int, dict]:
+        """Return API-shaped movies keyed by tmdb_id (ids TMDB cannot resolve are left out)."""
+        unique_ids = list(dict.fromkeys(tmdb_id for tmdb_id in tmdb_ids if tmdb_id))
+        if not unique_ids:
+            return {}
+
+        try:
+            rows = await run_in_threadpool(self.repository.get_catalog_movies, unique_ids)
+        except Exception as exc:
+            print(f"Warning: Failed to read movie catalog: {exc}")
+            rows = []
+
+        movies: dict[int, dict] = {}
+        stale: list[int] = []
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+        for row in rows:
+            movies[row["tmdb_id"]] = movie_from_catalog_row(row)
+            if _fetched_at(row) < cutoff:
+                stale.append(row["tmdb_id"])
+
+        missing = [tmdb_id for tmdb_id in unique_ids if tmdb_id not in movies]
+        if missing:
+            details_map = await self.client.get_movie_details_many(missing)
+            movies.update(
+                {tmdb_id: transform_movie_for_api(details) for tmdb_id, details in details_map.items()}
+            )
+            self.remember(list(details_map.values()))
+
+        if stale:
+            self._spawn(self._refresh(stale))
+
+        return movies
+
+    def remember(self, tmdb_movies: list[dict]) -> None:
+        """Write TMDB details payloads fetched elsewhere through to the catalog (in the background)."""
+        if tmdb_movies:
+            self._spawn(self._store(tmdb_movies))
+
+    async def _store(self, tmdb_movies: list[dict]) -> None:
+        # The anon client cannot write the catalog (RLS); reads still work
+        if not self.repository.can_bypass_rls:
+            return
+        rows = {movie["id"]: catalog_row_from_tmdb(movie) for movie in tmdb_movies if movie.get("id")}
+        try:
+            await run_in_threadpool(self.repository.save_catalog_movies, list(rows.values()))
+        except Exception as exc:
+            print(f"Warning: Failed to update movie catalog: {exc}")
+
+    async def _refresh(self, tmdb_ids: list[int]) -> None:
+        pending = [tmdb_id for tmdb_id in tmdb_ids if tmdb_id not in self._refreshing]
+        if not pending:
+            return
+        self._refreshing.update(pending)
+        try:
+            details_map = await self.client.get_movie_details_many(pending)
+            await self._store(list(details_map.values()))
+        finally:
+            self._refreshing.difference_update(pending)
+
+    def _spawn(self, coro) -> Optional[asyncio.Task]:
+        task = asyncio.get_running_loop().create_task(coro)
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def aclose(self) -> None:
+        """Cancel outstanding background writes and refreshes."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+movie_catalog = MovieCatalog()
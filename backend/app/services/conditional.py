@@ -0,0 +1,55 @@
+import hashlib
+from typing import Mapping, MutableMapping, Optional
+
+# Responses are per user and must be revalidated before every reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def validator_headers(user_id: str, version_row: Optional[dict]) -> dict[str, str]:
+    """ETag (plus caching headers) for a user's data at a version.
+
+    ``version_row`` is the user's user_versions row, None if never written.
+    The timestamp is part of the ETag so versions restarting (a recreated
+    table) can never match an ETag handed out earlier. No Last-Modified is
+    sent: at HTTP's one-second resolution, two writes within the same second
+    would share a date and If-Modified-Since would answer 304 for the second.
+    """
+    version = (version_row or {}).get("version") or 0
+    updated_at = (version_row or {}).get("updated_at")
+    digest = hashlib.sha1(f"{user_id}:{version}:{updated_at}".encode()).hexdigest()[:20]
+    headers = {
+        "ETag": f'W/"{digest}"',
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Authorization",
+    }
+    return headers
+
+
+def drop_validators(headers: MutableMapping[str, str]) -> None:
+    """Make a response unrevalidatable, e.g. when it was only partly hydrated.
+
+    The user's version does not change when a missing movie later resolves,
+    so an ETag on an incomplete response would pin it until their next write.
+    """
+    if "ETag" in headers:
+        del headers["ETag"]
+    headers["Cache-Control"] = "no-store"
+
+
+def is_not_modified(request_headers: Mapping[str, str], headers: Mapping[str, str]) -> bool:
+    """Whether a GET carrying ``request_headers`` can be answered with 304 (If-None-Match)."""
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    return _etag_matches(if_none_match, headers["ETag"])
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # Weak comparison: W/"x" and "x" are the same validator
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
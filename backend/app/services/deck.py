@@ -0,0 +1,154 @@
+import asyncio
+import os
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.services.tmdb import AsyncTMDBClient, async_tmdb_client, transform_movie_for_api
+
+# TMDB popular pages fetched ahead of the one a deck request stopped on
+DECK_PREFETCH_PAGES = int(os.getenv("DECK_PREFETCH_PAGES", "2"))
+# Users whose seen-sets are kept in memory (least recently used are dropped)
+DECK_SEEN_CACHE_USERS = int(os.getenv("DECK_SEEN_CACHE_USERS", "10000"))
+DECK_PAGE_SIZE = 20
+# A request scans at most this many TMDB pages for unseen movies
+DECK_MAX_SCAN_PAGES = 10
+# TMDB serves no list pages past this one
+TMDB_MAX_PAGE = 500
+
+
+class SeenSet:
+    """Sorted int32 array of tmdb_ids (4 bytes per movie) with O(log n) membership."""
+
+    def __init__(self, tmdb_ids: Iterable[int]):
+        self.tmdb_ids = np.unique(np.fromiter(tmdb_ids, dtype=np.int32))
+
+    def __len__(self) -> int:
+        return len(self.tmdb_ids)
+
+    def __contains__(self, tmdb_id: int) -> bool:
+        position = int(np.searchsorted(self.tmdb_ids, tmdb_id))
+        return position < len(self.tmdb_ids) and int(self.tmdb_ids[position]) == tmdb_id
+
+
+def encode_deck_cursor(page: int, offset: int) -> str:
+    return f"{page}:{offset}"
+
+
+def decode_deck_cursor(cursor: Optional[str]) -> tuple[int, int]:
+    """(TMDB page, index within it) to continue from; raises ValueError on a bad cursor."""
+    if not cursor:
+        return 1, 0
+    try:
+        page, offset = (int(part) for part in cursor.split(":"))
+    except ValueError:
+        raise ValueError("Invalid cursor") from None
+    if not 1 <= page <= TMDB_MAX_PAGE or offset < 0:
+        raise ValueError("Invalid cursor")
+    return page, offset
+
+
+class SwipeDeck:
+    """Swipe deck of popular movies the user has neither rated nor watchlisted.
+
+    Each user's seen-set is cached until their user_versions row changes,
+    so a deck request costs one primary key lookup plus cached TMDB pages.
+    The pages after the one a request stopped on are fetched in the
+    background, so the next request finds them in the TMDB cache.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        client: AsyncTMDBClient = async_tmdb_client,
+        max_users: int = DECK_SEEN_CACHE_USERS,
+    ):
+        self.repository = repo
+        self.client = client
+        self.max_users = max_users
+        self._seen: OrderedDict[str, tuple[tuple, SeenSet]] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def seen_set(self, user_id: str) -> SeenSet:
+        version_row = await run_in_threadpool(self.repository.get_user_version, user_id) or {}
+        version = (version_row.get("version"), version_row.get("updated_at"))
+
+        cached = self._seen.get(user_id)
+        if cached is not None and cached[0] == version:
+            self._seen.move_to_end(user_id)
+            return cached[1]
+
+        seen = SeenSet(await run_in_threadpool(self.repository.list_seen_tmdb_ids, user_id))
+        self._seen[user_id] = (version, seen)
+        self._seen.move_to_end(user_id)
+        while len(self._seen) > self.max_users:
+            self._seen.popitem(last=False)
+        return seen
+
+    async def deal(
+        self, user_id: str, start: tuple[int, int] = (1, 0), limit: int = DECK_PAGE_SIZE
+    ) -> dict:
+        """Next ``limit`` unseen movies from ``start`` (a decoded cursor), plus the next cursor."""
+        page, offset = start
+        seen = await self.seen_set(user_id)
+
+        movies: list[dict] = []
+        dealt: set[int] = set()
+        next_cursor: Optional[str] = None
+        for _ in range(DECK_MAX_SCAN_PAGES):
+            next_cursor = None
+            tmdb_data = await self.client.get_popular_movies(page=page)
+            results = tmdb_data.get("results", [])
+            last_page = min(tmdb_data.get("total_pages") or page, TMDB_MAX_PAGE)
+            for index in range(offset, len(results)):
+                tmdb_id = results[index].get("id")
+                # TMDB pages shift as popularity changes, so a movie can repeat across pages
+                if tmdb_id is None or tmdb_id in seen or tmdb_id in dealt:
+                    continue
+                movies.append(transform_movie_for_api(results[index]))
+                dealt.add(tmdb_id)
+                if len(movies) >= limit:
+                    break
+            if len(movies) >= limit:
+                next_cursor = encode_deck_cursor(page, index + 1)
+                break
+
+            if page >= last_page:
+                break
+            page, offset = page + 1, 0
+            # If the scan budget runs out here, the client continues from this page
+            next_cursor = encode_deck_cursor(page, 0)
+
+        if next_cursor is not None:
+            self._prefetch(page, last_page)
+        return {"movies": movies, "next_cursor": next_cursor}
+
+    def _prefetch(self, page: int, last_page: int) -> None:
+        for next_page in range(page + 1, min(page + DECK_PREFETCH_PAGES, last_page) + 1):
+            self._spawn(self._warm(next_page))
+
+    async def _warm(self, page: int) -> None:
+        try:
+            await self.client.get_popular_movies(page=page)
+        except Exception as exc:
+            print(f"Warning: Failed to prefetch popular page {page}: {exc}")
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def aclose(self) -> None:
+        """Cancel outstanding prefetches."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+swipe_deck = SwipeDeck()
@@ -0,0 +1,158 @@
+import csv
+import io
+import json
+import os
+from typing import AsyncIterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.repositories.base import USER_ROW_KEYS
+from app.services.catalog import MovieCatalog, movie_catalog
+
+# Rows fetched, hydrated and sent per step while streaming an export
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "200"))
+
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+# Ratings use the 0-10 scale under "rating10", so ratings and watchlist entries (with their
+# status) can be re-imported with POST /movies/import; custom list rows are skipped there
+CSV_COLUMNS = (
+    "type",
+    "tmdb_id",
+    "title",
+    "year",
+    "rating10",
+    "review",
+    "status",
+    "list_name",
+    "list_description",
+    "is_public",
+    "created_at",
+    "updated_at",
+)
+
+
+def _rating_record(row: dict, movie: Optional[dict]) -> dict:
+    return {
+        "type": "rating",
+        "tmdb_id": row.get("tmdb_id"),
+        "rating": row.get("rating"),
+        "review": row.get("review"),
+        "created_at": row.get("created_at", ""),
+        "updated_at": row.get("updated_at", ""),
+        "movie": movie,
+    }
+
+
+def _watchlist_record(row: dict, movie: Optional[dict]) -> dict:
+    return {
+        "type": "watchlist",
+        "tmdb_id": row.get("tmdb_id"),
+        "status": row.get("status") or "to_watch",
+        "created_at": row.get("created_at", ""),
+        "updated_at": row.get("updated_at", ""),
+        "movie": movie,
+    }
+
+
+def _list_record(row: dict) -> dict:
+    return {
+        "type": "list",
+        "id": row.get("id"),
+        "name": row.get("name") or "Untitled list",
+        "description": row.get("description"),
+        "is_public": bool(row.get("is_public")),
+        "sort_mode": row.get("sort_mode") or "manual",
+        "created_at": row.get("created_at", ""),
+        "updated_at": row.get("updated_at", ""),
+    }
+
+
+def _csv_row(record: dict) -> list:
+    movie = record.get("movie") or {}
+    release_year = str(movie.get("release_date") or "")[:4]
+    return [
+        record["type"],
+        record.get("tmdb_id"),
+        movie.get("title"),
+        release_year if release_year.isdigit() else None,
+        record.get("rating"),
+        record.get("review"),
+        record.get("status"),
+        record.get("name"),
+        record.get("description"),
+        record.get("is_public"),
+        record.get("created_at"),
+        record.get("updated_at"),
+    ]
+
+
+class LibraryExport:
+    """Streams a user's ratings, watchlist and custom lists as NDJSON or CSV.
+
+    Each table is read in keyset pages of ``page_size`` rows, and every
+    page is hydrated with one catalog lookup and sent before the next one
+    is fetched, so memory use does not grow with the size of the library.
+    Pages follow an immutable key (scan_user_rows) rather than updated_at,
+    so rows the user edits while the export streams are still included once.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        catalog: MovieCatalog = movie_catalog,
+        page_size: int = EXPORT_PAGE_SIZE,
+    ):
+        self.repository = repo
+        self.catalog = catalog
+        self.page_size = page_size
+
+    async def _pages(self, table: str, user_id: str) -> AsyncIterator[list[dict]]:
+        key = USER_ROW_KEYS[table]
+        after = None
+        while True:
+            rows = await run_in_threadpool(
+                self.repository.scan_user_rows, table, user_id, after, self.page_size
+            )
+            if rows:
+                yield rows
+            if len(rows) < self.page_size:
+                return
+            after = rows[-1][key]
+
+    async def records(self, user_id: str) -> AsyncIterator[list[dict]]:
+        """Export records one page at a time: ratings, then watchlist, then lists."""
+        for table, to_record in (
+            ("ratings", _rating_record),
+            ("watchlist", _watchlist_record),
+        ):
+            async for rows in self._pages(table, user_id):
+                movie_map = await self.catalog.get_movie_map([row["tmdb_id"] for row in rows])
+                yield [to_record(row, movie_map.get(row["tmdb_id"])) for row in rows]
+
+        async for rows in self._pages("custom_lists", user_id):
+            yield [_list_record(row) for row in rows]
+
+    async def stream(self, user_id: str, export_format: str) -> AsyncIterator[str]:
+        """Encoded export, one chunk per page (``export_format`` is a key of EXPORT_FORMATS)."""
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_COLUMNS)
+            async for records in self.records(user_id):
+                writer.writerows(_csv_row(record) for record in records)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            # A header-only export is still a valid file
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            async for records in self.records(user_id):
+                yield "".join(json.dumps(record, default=str) + "\n" for record in records)
+
+
+library_export = LibraryExport()
@@ -0,0 +1,524 @@
+import asyncio
+import csv
+import io
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Iterator, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.services.search import MovieSearch, movie_search, normalize
+from app.services.tmdb import TMDB_MAX_CONCURRENCY, AsyncTMDBClient, async_tmdb_client
+
+# Rows resolved and written per step (one bulk upsert each for ratings and watchlist)
+IMPORT_CHUNK_ROWS = int(os.getenv("IMPORT_CHUNK_ROWS", "200"))
+# Rows read from one file at most; anything after that is left out of the import
+IMPORT_MAX_ROWS = int(os.getenv("IMPORT_MAX_ROWS", "50000"))
+# How long (seconds) a finished job stays pollable
+IMPORT_JOB_TTL = float(os.getenv("IMPORT_JOB_TTL", "3600"))
+# Uploads larger than this (bytes) are rejected
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(20 * 1024 * 1024)))
+# A queued or running job not saved for this long (seconds) was left behind by a
+# worker that stopped, and no longer blocks a new import by the same user
+IMPORT_STALE_AFTER = float(os.getenv("IMPORT_STALE_AFTER", "600"))
+# Uploads larger than this are spooled to a temporary file instead of memory
+IMPORT_SPOOL_BYTES = 1024 * 1024
+IMPORT_COPY_BLOCK = 64 * 1024
+# Unmatched rows listed in a job's status (``unmatched`` counts all of them)
+IMPORT_UNMATCHED_SAMPLES = 50
+
+# Lowercased header -> factor to our 0-10 scale (IMDb rates 1-10, Letterboxd 0.5-5 stars)
+RATING_COLUMNS = {"your rating": 1.0, "rating10": 1.0, "rating": 2.0}
+TITLE_COLUMNS = ("name", "title")
+YEAR_COLUMNS = ("year",)
+IMDB_COLUMNS = ("const", "imdbid", "imdb_id")
+TMDB_COLUMNS = ("tmdbid", "tmdb_id")
+REVIEW_COLUMNS = ("review",)
+REVIEW_MAX_LENGTH = 500
+# Columns of our own CSV export (GET /movies/export?format=csv): rows of any
+# other type (custom lists) are skipped, and watchlist rows keep their status
+TYPE_COLUMNS = ("type",)
+IMPORTED_TYPES = ("rating", "watchlist")
+STATUS_COLUMNS = ("status",)
+# Same values as the watchlist.status check constraint
+WATCHLIST_STATUSES = ("to_watch", "watching", "completed", "on_hold", "dropped")
+
+
+@dataclass
+class ImportRow:
+    line: int
+    title: Optional[str] = None
+    year: Optional[int] = None
+    imdb_id: Optional[str] = None
+    tmdb_id: Optional[int] = None
+    rating: Optional[float] = None
+    review: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+    def lookup_key(self) -> tuple:
+        """Rows with equal keys resolve to the same movie."""
+        if self.tmdb_id:
+            return ("tmdb", self.tmdb_id)
+        if self.imdb_id:
+            return ("imdb", self.imdb_id)
+        return ("title", normalize(self.title or ""), self.year)
+
+
+class ImportReader:
+    """Parses a Letterboxd or IMDb CSV export one row at a time.
+
+    Columns are located by header name, so the ratings, watchlist, watched
+    and diary exports of both sites work, as does our own CSV export and any
+    CSV with a Name or Title column. Ratings are converted to the 0-10 scale.
+    The header is read on construction and an unusable one raises ValueError.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._reader = csv.reader(
+            io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+        )
+        header = [name.strip().lower() for name in next(self._reader, [])]
+
+        def column(names) -> Optional[int]:
+            return next((header.index(name) for name in names if name in header), None)
+
+        self.title = column(TITLE_COLUMNS)
+        self.year = column(YEAR_COLUMNS)
+        self.imdb_id = column(IMDB_COLUMNS)
+        self.tmdb_id = column(TMDB_COLUMNS)
+        self.review = column(REVIEW_COLUMNS)
+        self.type = column(TYPE_COLUMNS)
+        self.status = column(STATUS_COLUMNS)
+        self.rating, self.rating_scale = next(
+            ((header.index(name), scale) for name, scale in RATING_COLUMNS.items() if name in header),
+            (None, 1.0),
+        )
+        if self.title is None and self.imdb_id is None and self.tmdb_id is None:
+            raise ValueError("CSV needs a Name/Title, Const (IMDb id) or tmdbID column")
+
+    def __iter__(self) -> Iterator[ImportRow]:
+        for values in self._reader:
+            if not any(value.strip() for value in values):
+                continue
+            if self.type is not None and self.type < len(values):
+                if values[self.type].strip().lower() not in IMPORTED_TYPES:
+                    continue
+            yield self._parse(values)
+
+    def _parse(self, values: list[str]) -> ImportRow:
+        def cell(index: Optional[int]) -> Optional[str]:
+            if index is None or index >= len(values):
+                return None
+            return values[index].strip() or None
+
+        row = ImportRow(line=self._reader.line_num, title=cell(self.title))
+        review = cell(self.review)
+        row.review = review[:REVIEW_MAX_LENGTH] if review else None
+        imdb_id = cell(self.imdb_id)
+        row.imdb_id = imdb_id if imdb_id and imdb_id.startswith("tt") else None
+        try:
+            year = cell(self.year)
+            row.year = int(year) if year else None
+            tmdb_id = cell(self.tmdb_id)
+            row.tmdb_id = int(tmdb_id) if tmdb_id else None
+        except ValueError:
+            row.error = "Invalid year or tmdbID"
+            return row
+
+        rating = cell(self.rating)
+        if rating is not None:
+            try:
+                row.rating = round(float(rating) * self.rating_scale, 1)
+            except ValueError:
+                row.error = "Invalid rating"
+            else:
+                if not 0.0 <= row.rating <= 10.0:
+                    row.error = "Invalid rating"
+        status = cell(self.status)
+        if status is not None:
+            row.status = status.lower()
+            if row.status not in WATCHLIST_STATUSES:
+                row.error = "Invalid status"
+        if not (row.title or row.imdb_id or row.tmdb_id):
+            row.error = "Missing title"
+        return row
+
+
+class ImportTooLarge(ValueError):
+    """The upload is larger than IMPORT_MAX_BYTES."""
+
+
+def spool_upload(source: BinaryIO, max_bytes: int = IMPORT_MAX_BYTES) -> tuple[BinaryIO, ImportReader]:
+    """Copy an upload into a file owned by the import and read its header.
+
+    Uploaded files are closed when the request ends, before the job is done.
+    Raises ImportTooLarge as soon as more than ``max_bytes`` have been copied.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES)
+    try:
+        copied = 0
+        while block := source.read(IMPORT_COPY_BLOCK):
+            copied += len(block)
+            if copied > max_bytes:
+                raise ImportTooLarge(f"File is larger than {max_bytes} bytes")
+            spooled.write(block)
+        spooled.seek(0)
+        return spooled, ImportReader(spooled)
+    except csv.Error as exc:
+        spooled.close()
+        raise ValueError(str(exc)) from None
+    except Exception:
+        spooled.close()
+        raise
+
+
+@dataclass
+class ImportJob:
+    id: str
+    user_id: str
+    watchlist_status: str
+    status: str = "queued"  # running, completed, failed
+    rows_read: int = 0
+    ratings_saved: int = 0
+    watchlist_saved: int = 0
+    unmatched: int = 0
+    invalid: int = 0
+    truncated: bool = False
+    unmatched_rows: list[dict] = field(default_factory=list)
+    detail: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "watchlist_status": self.watchlist_status,
+            "rows_read": self.rows_read,
+            "ratings_saved": self.ratings_saved,
+            "watchlist_saved": self.watchlist_saved,
+            "unmatched": self.unmatched,
+            "invalid": self.invalid,
+            "truncated": self.truncated,
+            "unmatched_rows": self.unmatched_rows,
+            "detail": self.detail,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def to_record(self) -> dict:
+        """to_dict() plus ``user_id``, as saved in the import_jobs table."""
+        return {**self.to_dict(), "user_id": self.user_id}
+
+    @classmethod
+    def from_record(cls, record: dict) -> "ImportJob":
+        finished_at = record.get("finished_at")
+        return cls(
+            id=record["job_id"],
+            user_id=str(record["user_id"]),
+            watchlist_status=record["watchlist_status"],
+            status=record["status"],
+            rows_read=record["rows_read"],
+            ratings_saved=record["ratings_saved"],
+            watchlist_saved=record["watchlist_saved"],
+            unmatched=record["unmatched"],
+            invalid=record["invalid"],
+            truncated=record["truncated"],
+            unmatched_rows=record["unmatched_rows"],
+            detail=record.get("detail"),
+            created_at=datetime.fromisoformat(record["created_at"]),
+            finished_at=datetime.fromisoformat(finished_at) if finished_at else None,
+        )
+
+
+class ImportInProgress(Exception):
+    """The user already has an import queued or running (``job``)."""
+
+    def __init__(self, job: ImportJob):
+        super().__init__(f"Import {job.id} is still running")
+        self.job = job
+
+
+class MovieImporter:
+    """Imports CSV exports from other sites as background jobs.
+
+    A job reads its file IMPORT_CHUNK_ROWS rows at a time. Each chunk's
+    titles are resolved to tmdb_ids (local search index first, then TMDB
+    lookups run concurrently) and written with one bulk upsert for ratings
+    and one for watchlist entries, so memory stays flat whatever the file
+    size. Jobs are polled by id.
+
+    Job state is saved to the import_jobs table when the job starts, after
+    every chunk and when it ends, so any API worker can report progress, and
+    the table allows one queued or running import per user across workers.
+    Without a connection that bypasses RLS the table is unreachable and jobs
+    only exist in the worker running them.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        search: MovieSearch = movie_search,
+        client: AsyncTMDBClient = async_tmdb_client,
+        chunk_rows: int = IMPORT_CHUNK_ROWS,
+        max_rows: int = IMPORT_MAX_ROWS,
+        job_ttl: float = IMPORT_JOB_TTL,
+    ):
+        self.repository = repo
+        self.search = search
+        self.client = client
+        self.chunk_rows = chunk_rows
+        self.max_rows = max_rows
+        self.job_ttl = job_ttl
+        self._jobs: dict[str, ImportJob] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _expired(self, job: ImportJob) -> bool:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.job_ttl)
+        return job.finished_at is not None and job.finished_at < cutoff
+
+    def _prune(self) -> None:
+        for job_id, job in list(self._jobs.items()):
+            if self._expired(job):
+                del self._jobs[job_id]
+
+    def get(self, user_id: str, job_id: str) -> Optional[ImportJob]:
+        """The user's job with this id, if it exists and has not expired.
+
+        Jobs running in this worker are read from memory, others from import_jobs.
+        """
+        self._prune()
+        job = self._jobs.get(job_id)
+        if job is None and self.repository.can_bypass_rls:
+            record = self.repository.get_import_job(job_id)
+            job = ImportJob.from_record(record) if record is not None else None
+        if job is None or job.user_id != user_id or self._expired(job):
+            return None
+        return job
+
+    def active_job(self, user_id: str) -> Optional[ImportJob]:
+        return next(
+            (job for job in self._jobs.values() if job.user_id == user_id and job.active), None
+        )
+
+    async def start(self, user_id: str, upload: BinaryIO, watchlist_status: str) -> ImportJob:
+        """Queue an import of ``upload``.
+
+        Raises ImportInProgress if the user already has an active import and
+        ValueError for a file that is not a usable CSV.
+        """
+        self._prune()
+        # Checked and registered before the first await, so two concurrent
+        # requests from one user cannot both start an import in this worker;
+        # import_jobs does the same across workers
+        active = self.active_job(user_id)
+        if active is not None:
+            raise ImportInProgress(active)
+        job = ImportJob(id=uuid.uuid4().hex, user_id=user_id, watchlist_status=watchlist_status)
+        self._jobs[job.id] = job
+
+        try:
+            spooled, reader = await run_in_threadpool(spool_upload, upload)
+        except BaseException:
+            del self._jobs[job.id]
+            raise
+        try:
+            if self.repository.can_bypass_rls:
+                await self._claim(job)
+        except BaseException:
+            del self._jobs[job.id]
+            spooled.close()
+            raise
+        self._spawn(self._run(job, spooled, reader))
+        return job
+
+    async def _claim(self, job: ImportJob) -> None:
+        """Insert the job into import_jobs, or raise ImportInProgress for the user's active one."""
+        now = datetime.now(timezone.utc)
+        while not await run_in_threadpool(
+            self.repository.create_import_job,
+            job.to_record(),
+            now - timedelta(seconds=IMPORT_STALE_AFTER),
+            now - timedelta(seconds=self.job_ttl),
+        ):
+            active = await run_in_threadpool(self.repository.get_active_import_job, job.user_id)
+            if active is not None:
+                raise ImportInProgress(ImportJob.from_record(active))
+            # The other job finished in between; try again
+
+    async def _save(self, job: ImportJob) -> None:
+        if not self.repository.can_bypass_rls:
+            return
+        try:
+            await run_in_threadpool(self.repository.save_import_job, job.to_record())
+        except Exception as exc:
+            print(f"Warning: Failed to save import job {job.id}: {exc}")
+
+    async def _run(self, job: ImportJob, spooled: BinaryIO, reader: ImportReader) -> None:
+        job.status = "running"
+        resolved: dict[tuple, Optional[int]] = {}
+        rows = iter(reader)
+        try:
+            await self._save(job)
+            while True:
+                limit = min(self.chunk_rows, self.max_rows - job.rows_read)
+                if limit <= 0:
+                    job.truncated = bool(await run_in_threadpool(_take, rows, 1))
+                    break
+                chunk = await run_in_threadpool(_take, rows, limit)
+                if not chunk:
+                    break
+                job.rows_read += len(chunk)
+                await self._import_chunk(job, chunk, resolved)
+                await self._save(job)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status, job.detail = "failed", "Import was interrupted"
+            raise
+        except Exception as exc:
+            job.status, job.detail = "failed", f"Import failed: {exc}"
+        finally:
+            job.finished_at = datetime.utcnow()
+            spooled.close()
+            await self._save(job)
+
+    async def _import_chunk(
+        self, job: ImportJob, chunk: list[ImportRow], resolved: dict[tuple, Optional[int]]
+    ) -> None:
+        valid = [row for row in chunk if row.error is None]
+        job.invalid += len(chunk) - len(valid)
+        await self._resolve([row for row in valid if row.lookup_key() not in resolved], resolved)
+
+        # Later rows win when a movie appears twice (e.g. rewatches in a diary export)
+        ratings: dict[int, dict] = {}
+        watchlist: dict[int, dict] = {}
+        for row in valid:
+            tmdb_id = resolved.get(row.lookup_key())
+            if tmdb_id is None:
+                job.unmatched += 1
+                if len(job.unmatched_rows) < IMPORT_UNMATCHED_SAMPLES:
+                    job.unmatched_rows.append(
+                        {"line": row.line, "title": row.title, "year": row.year}
+                    )
+            elif row.rating is not None:
+                ratings[tmdb_id] = {"tmdb_id": tmdb_id, "rating": row.rating, "review": row.review}
+            else:
+                watchlist[tmdb_id] = {
+                    "tmdb_id": tmdb_id,
+                    "status": row.status or job.watchlist_status,
+                }
+
+        if ratings:
+            saved = await run_in_threadpool(
+                self.repository.save_ratings, job.user_id, list(ratings.values())
+            )
+            job.ratings_saved += len(saved)
+        if watchlist:
+            saved = await run_in_threadpool(
+                self.repository.save_watchlist_entries, job.user_id, list(watchlist.values())
+            )
+            job.watchlist_saved += len(saved)
+
+    async def _resolve(self, rows: list[ImportRow], resolved: dict[tuple, Optional[int]]) -> None:
+        """Fill ``resolved`` for the rows' lookup keys; TMDB is only asked about local misses."""
+        pending: dict[tuple, ImportRow] = {}
+        for row in rows:
+            key = row.lookup_key()
+            if key[0] == "tmdb":
+                resolved[key] = row.tmdb_id
+            elif key[0] == "title":
+                movie = self.search.index.lookup(row.title, row.year)
+                if movie is not None:
+                    resolved[key] = movie["tmdb_id"]
+                else:
+                    pending.setdefault(key, row)
+            else:
+                pending.setdefault(key, row)
+
+        semaphore = asyncio.Semaphore(TMDB_MAX_CONCURRENCY)
+
+        async def lookup(key: tuple, row: ImportRow) -> None:
+            async with semaphore:
+                try:
+                    resolved[key] = await self._lookup_tmdb(row)
+                except Exception as exc:
+                    # Left unresolved so a later row with the same movie tries again
+                    print(f"Warning: Failed to resolve import row {row.line}: {exc}")
+
+        await asyncio.gather(*(lookup(key, row) for key, row in pending.items()))
+
+    async def _lookup_tmdb(self, row: ImportRow) -> Optional[int]:
+        if row.imdb_id:
+            found = await self.client.find_by_imdb_id(row.imdb_id)
+            movies = found.get("movie_results") or []
+            if movies:
+                return movies[0].get("id")
+            if not row.title:
+                return None
+
+        if row.year is not None:
+            data = await self.client.search_movies(row.title, year=row.year)
+            match = _best_match(data.get("results", []), row.title, row.year)
+            if match is not None:
+                return match
+        data = await self.client.search_movies(row.title)
+        return _best_match(data.get("results", []), row.title, row.year)
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def aclose(self) -> None:
+        """Cancel running imports."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _take(rows: Iterator[ImportRow], limit: int) -> list[ImportRow]:
+    return [row for _, row in zip(range(limit), rows)]
+
+
+def _best_match(results: list[dict], title: str, year: Optional[int]) -> Optional[int]:
+    """TMDB search result for an exported title: exact title and year first, then year alone.
+
+    Without a year only an exact title is trusted, as the top search hit for
+    a short title is often a different movie.
+    """
+    wanted = normalize(title)
+
+    def release_year(result: dict) -> Optional[int]:
+        value = (result.get("release_date") or "")[:4]
+        return int(value) if value.isdigit() else None
+
+    def year_matches(result: dict) -> bool:
+        found = release_year(result)
+        return year is None or (found is not None and abs(found - year) <= 1)
+
+    for result in results:
+        if year_matches(result) and normalize(result.get("title") or "") == wanted:
+            return result.get("id")
+    for result in results:
+        if year_matches(result) and normalize(result.get("original_title") or "") == wanted:
+            return result.get("id")
+    if year is not None:
+        for result in results:
+            if release_year(result) == year:
+                return result.get("id")
+    return None
+
+
+movie_importer = MovieImporter()
@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Keyset position: (updated_at, id) of the last row on the previous page
+PageKey = tuple[str, str]
+
+
+def encode_cursor(row: dict) -> str:
+    """Build an opaque cursor pointing just past ``row``."""
+    payload = json.dumps({"u": row["updated_at"], "i": str(row["id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[PageKey]:
+    """Turn a cursor back into its (updated_at, id) key.
+
+    Raises:
+        ValueError: The cursor was not produced by ``encode_cursor``
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        updated_at, row_id = payload["u"], payload["i"]
+        datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
+        UUID(row_id)
+    except Exception as exc:
+        raise ValueError("Invalid cursor") from exc
+
+    return updated_at, row_id
+
+
+def split_page(rows: list[dict], limit: int) -> tuple[list[dict], Optional[str]]:
+    """Split a ``limit + 1`` row fetch into the page and the cursor for the next one."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1])
@@ -0,0 +1,306 @@
+import asyncio
+import os
+from array import array
+from typing import Iterable, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+from scipy import sparse
+
+from app.repositories import Repository, repository
+from app.services.catalog import MovieCatalog, movie_catalog
+from app.services.tmdb import AsyncTMDBClient, async_tmdb_client, transform_movie_for_api
+
+# Model file written by `python -m app.scripts.build_recommendations` and loaded by the API
+RECOMMENDER_MODEL_PATH = os.getenv("RECOMMENDER_MODEL_PATH", "recommender_model.npz")
+# How often (seconds) the API checks the model file for a newer build
+RECOMMENDER_RELOAD_INTERVAL = float(os.getenv("RECOMMENDER_RELOAD_INTERVAL", "300"))
+
+NEIGHBORS_PER_MOVIE = 50
+# Movies with fewer ratings than this get no neighbors (their similarities are noise)
+MIN_MOVIE_RATINGS = 3
+# Similarities are scaled by n / (n + this), n = users who rated both movies, so pairs
+# resting on a handful of shared users do not crowd out well-supported neighbors
+SIMILARITY_SHRINKAGE = 10.0
+# Users whose ratings are all equal have no mean-centered signal; center them on the scale instead
+RATING_MIDPOINT = 5.0
+# Similarity rows are computed in blocks of at most this many dense cells (float32)
+SIMILARITY_BLOCK_CELLS = 8_000_000
+
+
+def load_rating_arrays(
+    repo: Repository = repository,
+    page_size: int = 50000,
+    user_ids: Optional[list[str]] = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stream the ratings table into (user index, tmdb_id, rating) arrays.
+
+    Rows arrive in user order, so users are numbered as they appear and only
+    three flat arrays are held in memory (12 bytes per rating). Pass a list
+    as ``user_ids`` to have each user's id appended in index order.
+    """
+    users, tmdb_ids, ratings = array("i"), array("i"), array("f")
+    user_index = -1
+    last_user: Optional[str] = None
+    after: Optional[tuple[str, int]] = None
+    while page := repo.scan_ratings(after, page_size):
+        for row in page:
+            if row["user_id"] != last_user:
+                last_user = row["user_id"]
+                user_index += 1
+                if user_ids is not None:
+                    user_ids.append(last_user)
+            users.append(user_index)
+            tmdb_ids.append(row["tmdb_id"])
+            ratings.append(float(row["rating"]))
+        after = (page[-1]["user_id"], page[-1]["tmdb_id"])
+    return (
+        np.frombuffer(users, dtype=np.int32),
+        np.frombuffer(tmdb_ids, dtype=np.int32),
+        np.frombuffer(ratings, dtype=np.float32),
+    )
+
+
+class ItemSimilarityModel:
+    """Top-k item-item neighbors under mean-centered (adjusted) cosine similarity,
+    shrunk toward zero for pairs of movies with few raters in common.
+
+    Movies are sorted by tmdb_id; row i of ``neighbors`` / ``similarities``
+    holds movie i's nearest neighbors (row indices, -1 padded) best first.
+    Similarities are stored as float16, so a movie costs k * 6 bytes.
+    """
+
+    def __init__(self, tmdb_ids: np.ndarray, neighbors: np.ndarray, similarities: np.ndarray):
+        self.tmdb_ids = tmdb_ids
+        self.neighbors = neighbors
+        self.similarities = similarities
+
+    def __len__(self) -> int:
+        return len(self.tmdb_ids)
+
+    @classmethod
+    def build(
+        cls,
+        users: np.ndarray,
+        tmdb_ids: np.ndarray,
+        ratings: np.ndarray,
+        k: int = NEIGHBORS_PER_MOVIE,
+        min_ratings: int = MIN_MOVIE_RATINGS,
+        shrinkage: float = SIMILARITY_SHRINKAGE,
+    ) -> "ItemSimilarityModel":
+        movie_ids, movie_index = np.unique(tmdb_ids, return_inverse=True)
+        if not len(movie_ids):
+            return cls.empty(k)
+
+        # Center on each user's mean over all of their ratings
+        user_counts = np.bincount(users)
+        user_means = np.bincount(users, weights=ratings) / np.maximum(user_counts, 1)
+        centered = (ratings - user_means[users]).astype(np.float32)
+
+        # Rare movies keep their row but take part in no similarity
+        supported = np.bincount(movie_index, minlength=len(movie_ids)) >= min_ratings
+        centered[~supported[movie_index]] = 0.0
+
+        matrix = sparse.csr_matrix(
+            (centered, (users, movie_index)),
+            shape=(len(user_counts), len(movie_ids)),
+            dtype=np.float32,
+        )
+        matrix.eliminate_zeros()
+        # Same pattern with ones: rated_by_movie @ rated counts common raters
+        rated = matrix.copy()
+        rated.data[:] = 1.0
+        rated_by_movie = rated.T.tocsr()
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = (matrix @ sparse.diags((1.0 / norms).astype(np.float32))).tocsr()
+        by_movie = matrix.T.tocsr()
+
+        movie_count = len(movie_ids)
+        k = min(k, movie_count - 1) if movie_count > 1 else 0
+        neighbors = np.full((movie_count, max(k, 0)), -1, dtype=np.int32)
+        similarities = np.zeros((movie_count, max(k, 0)), dtype=np.float16)
+        if k == 0:
+            return cls(movie_ids.astype(np.int32), neighbors, similarities)
+
+        block = max(1, SIMILARITY_BLOCK_CELLS // movie_count)
+        for start in range(0, movie_count, block):
+            end = min(start + block, movie_count)
+            scores = (by_movie[start:end] @ matrix).toarray()
+            if shrinkage > 0:
+                common = (rated_by_movie[start:end] @ rated).toarray()
+                scores *= common / (common + shrinkage)
+            scores[np.arange(end - start), np.arange(start, end)] = -np.inf
+
+            top = np.argpartition(scores, -k, axis=1)[:, -k:]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            # Only positively correlated movies are useful neighbors
+            positive = top_scores > 0
+            neighbors[start:end] = np.where(positive, top, -1)
+            similarities[start:end] = np.where(positive, top_scores, 0.0)
+
+        return cls(movie_ids.astype(np.int32), neighbors, similarities)
+
+    @classmethod
+    def empty(cls, k: int = NEIGHBORS_PER_MOVIE) -> "ItemSimilarityModel":
+        return cls(
+            np.zeros(0, dtype=np.int32),
+            np.zeros((0, k), dtype=np.int32),
+            np.zeros((0, k), dtype=np.float16),
+        )
+
+    def save(self, path: str) -> None:
+        # Write-then-rename so a running API never loads a half-written file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as model_file:
+            np.savez(
+                model_file,
+                tmdb_ids=self.tmdb_ids,
+                neighbors=self.neighbors,
+                similarities=self.similarities,
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ItemSimilarityModel":
+        with np.load(path) as data:
+            return cls(data["tmdb_ids"], data["neighbors"], data["similarities"])
+
+    def recommend(
+        self, user_ratings: dict[int, float], limit: int, exclude: Iterable[int] = ()
+    ) -> list[tuple[int, float]]:
+        """Rank unrated movies for a user as (tmdb_id, score), best first.
+
+        A candidate's score sums its similarity to each movie the user rated
+        above their own mean, weighted by how far above. Summing (rather than
+        averaging) favors candidates close to several liked movies, which
+        ranks far better than predicted ratings built on one or two neighbors.
+        """
+        if not user_ratings or not len(self.tmdb_ids):
+            return []
+
+        rated_ids = np.fromiter(user_ratings.keys(), dtype=np.int64, count=len(user_ratings))
+        values = np.fromiter(user_ratings.values(), dtype=np.float32, count=len(user_ratings))
+        if values.std() > 0:
+            weights = np.maximum(values - values.mean(), 0.0)
+        else:
+            weights = np.maximum(values - RATING_MIDPOINT, 0.0)
+
+        positions = np.searchsorted(self.tmdb_ids, rated_ids)
+        positions[positions == len(self.tmdb_ids)] = 0
+        known = self.tmdb_ids[positions] == rated_ids
+        rated_rows = positions[known]
+        if not len(rated_rows):
+            return []
+
+        neighbors = self.neighbors[rated_rows]
+        similarities = self.similarities[rated_rows].astype(np.float32)
+        valid = neighbors >= 0
+        candidates = neighbors[valid]
+        if not len(candidates):
+            return []
+        scores = np.bincount(
+            candidates,
+            weights=(similarities * weights[known][:, None])[valid],
+            minlength=len(self.tmdb_ids),
+        )
+
+        scores[rated_rows] = -np.inf
+        excluded = np.fromiter(exclude, dtype=np.int64)
+        if len(excluded):
+            excluded_positions = np.searchsorted(self.tmdb_ids, excluded)
+            excluded_positions[excluded_positions == len(self.tmdb_ids)] = 0
+            scores[excluded_positions[self.tmdb_ids[excluded_positions] == excluded]] = -np.inf
+
+        ranked = np.flatnonzero(scores > 0)
+        if len(ranked) > limit:
+            ranked = ranked[np.argpartition(-scores[ranked], limit - 1)[:limit]]
+        ranked = ranked[np.argsort(-scores[ranked])]
+        return [(int(self.tmdb_ids[row]), float(scores[row])) for row in ranked]
+
+
+class MovieRecommender:
+    """Serves recommendations from the latest model file, with popular movies as the fallback.
+
+    The model is built offline (``app.scripts.build_recommendations``); a
+    background task reloads it whenever the file changes and swaps it in
+    with a single assignment.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        catalog: MovieCatalog = movie_catalog,
+        client: AsyncTMDBClient = async_tmdb_client,
+        model_path: str = RECOMMENDER_MODEL_PATH,
+        reload_interval: float = RECOMMENDER_RELOAD_INTERVAL,
+    ):
+        self.repository = repo
+        self.catalog = catalog
+        self.client = client
+        self.model_path = model_path
+        self.reload_interval = reload_interval
+        self.model = ItemSimilarityModel.empty()
+        self._model_mtime: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _load_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self.model_path).st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._model_mtime:
+            self.model = ItemSimilarityModel.load(self.model_path)
+            self._model_mtime = mtime
+
+    async def reload(self) -> None:
+        await run_in_threadpool(self._load_if_changed)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reload()
+            except Exception as exc:
+                print(f"Warning: Failed to load recommendation model: {exc}")
+            await asyncio.sleep(self.reload_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def recommend(self, user_id: str, limit: int = 20) -> dict:
+        """Movies for a user, best first; ``source`` is "model" or "popular" (cold start)."""
+        user_ratings = await run_in_threadpool(self.repository.list_rating_values, user_id)
+
+        # Ask for a few extra in case some ids cannot be hydrated
+        ranked = self.model.recommend(user_ratings, limit + 10)
+        if ranked:
+            movie_map = await self.catalog.get_movie_map([tmdb_id for tmdb_id, _ in ranked])
+            movies = [
+                {**movie_map[tmdb_id], "score": round(score, 4)}
+                for tmdb_id, score in ranked
+                if tmdb_id in movie_map
+            ][:limit]
+            if movies:
+                return {"movies": movies, "source": "model"}
+
+        tmdb_data = await self.client.get_popular_movies(page=1)
+        movies = [
+            movie
+            for movie in (transform_movie_for_api(m) for m in tmdb_data.get("results", []))
+            if movie["tmdb_id"] not in user_ratings
+        ][:limit]
+        return {"movies": movies, "source": "popular"}
+
+
+movie_recommender = MovieRecommender()
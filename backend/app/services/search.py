@@ -0,0 +1,303 @@
+import asyncio
+import heapq
+import math
+import os
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.services.catalog import iter_catalog_rows, movie_from_catalog_row
+from app.services.tmdb import AsyncTMDBClient, async_tmdb_client, transform_movie_for_api
+
+# How often (seconds) the index is rebuilt from movie_catalog
+SEARCH_INDEX_REFRESH_INTERVAL = float(os.getenv("SEARCH_INDEX_REFRESH_INTERVAL", "3600"))
+SEARCH_PAGE_SIZE = 20
+# Fewer local matches than this and every page of the query is served by TMDB instead.
+# The local index only mirrors part of TMDB, so anything below a full page can hide results.
+SEARCH_MIN_LOCAL_RESULTS = int(os.getenv("SEARCH_MIN_LOCAL_RESULTS", str(SEARCH_PAGE_SIZE)))
+
+# Candidates scored per query; postings are in popularity order, so these are the most popular
+MAX_CANDIDATES = 500
+# Prefixes up to this length have their candidate lists precomputed at build time
+SHORT_PREFIX_LENGTH = 2
+# Minimum trigram (Jaccard) similarity for a typo-tolerant token match
+FUZZY_MIN_SIMILARITY = 0.3
+FUZZY_MAX_ALTERNATIVES = 8
+
+# Ranking: log-scaled popularity plus bonuses for how well the title matches
+EXACT_TITLE_BONUS = 6.0
+TITLE_PREFIX_BONUS = 3.0
+FUZZY_PENALTY = 2.0
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation: "Amélie (2001)" -> "amelie 2001"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", stripped.lower()).strip()
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _merge_postings(lists: list[list[int]], limit: int) -> list[int]:
+    """Union of ascending doc id lists, keeping the ``limit`` smallest (most popular)."""
+    if len(lists) == 1:
+        return lists[0][:limit]
+    merged: list[int] = []
+    for doc_id in heapq.merge(*lists):
+        if not merged or merged[-1] != doc_id:
+            merged.append(doc_id)
+            if len(merged) >= limit:
+                break
+    return merged
+
+
+class SearchIndex:
+    """Immutable in-memory title index over catalog rows.
+
+    Documents are numbered in descending popularity, so every postings list
+    is already ranked and truncating it keeps the most popular matches.
+    Query terms match whole tokens, except the last one, which matches as a
+    prefix (typeahead). Terms with no match fall back to trigram similarity.
+    """
+
+    def __init__(self, rows: Iterable[dict]):
+        docs = sorted(
+            (row for row in rows if row.get("title")),
+            key=lambda row: -(row.get("popularity") or 0.0),
+        )
+        self.movies = [movie_from_catalog_row(row) for row in docs]
+        self.titles = [normalize(row["title"]) for row in docs]
+        self.popularity = [math.log1p(max(row.get("popularity") or 0.0, 0.0)) for row in docs]
+
+        postings: dict[str, list[int]] = {}
+        self.doc_tokens: list[tuple[str, ...]] = []
+        for doc_id, title in enumerate(self.titles):
+            tokens = tuple(dict.fromkeys(title.split()))
+            self.doc_tokens.append(tokens)
+            for token in tokens:
+                postings.setdefault(token, []).append(doc_id)
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+
+        self.exact_titles: dict[str, list[int]] = {}
+        for doc_id, title in enumerate(self.titles):
+            self.exact_titles.setdefault(title, []).append(doc_id)
+
+        self.trigram_tokens: dict[str, list[str]] = {}
+        for token in self.vocabulary:
+            for gram in trigrams(token):
+                self.trigram_tokens.setdefault(gram, []).append(token)
+
+        # Very short prefixes expand to huge vocabulary ranges; merge them once here
+        self.short_prefixes: dict[str, list[int]] = {}
+        by_prefix: dict[str, list[list[int]]] = {}
+        for token in self.vocabulary:
+            for length in range(1, min(SHORT_PREFIX_LENGTH, len(token)) + 1):
+                by_prefix.setdefault(token[:length], []).append(postings[token])
+        for prefix, lists in by_prefix.items():
+            self.short_prefixes[prefix] = _merge_postings(lists, MAX_CANDIDATES)
+
+    def __len__(self) -> int:
+        return len(self.movies)
+
+    def _prefix_docs(self, prefix: str) -> list[int]:
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            return self.short_prefixes.get(prefix, [])
+        start = bisect_left(self.vocabulary, prefix)
+        end = bisect_left(self.vocabulary, prefix + "\uffff")
+        return _merge_postings(
+            [self.postings[token] for token in self.vocabulary[start:end]], MAX_CANDIDATES
+        )
+
+    def _similar_tokens(self, term: str) -> list[str]:
+        grams = trigrams(term)
+        shared = Counter(
+            token for gram in grams for token in self.trigram_tokens.get(gram, ())
+        )
+        scored = []
+        for token, overlap in shared.items():
+            similarity = overlap / (len(grams) + len(trigrams(token)) - overlap)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((similarity, token))
+        return [token for _, token in heapq.nlargest(FUZZY_MAX_ALTERNATIVES, scored)]
+
+    def _term_matcher(
+        self, term: str, is_prefix: bool
+    ) -> tuple[list[int], Callable[[tuple[str, ...]], bool], bool]:
+        """Candidate docs for a term, a predicate checking a doc's tokens, and whether it is fuzzy."""
+        if is_prefix:
+            docs = self._prefix_docs(term)
+            if docs:
+                return docs, lambda tokens: any(token.startswith(term) for token in tokens), False
+        else:
+            docs = self.postings.get(term, [])
+            if docs:
+                return docs, lambda tokens: term in tokens, False
+
+        alternatives = self._similar_tokens(term) if len(term) >= 3 else []
+        docs = _merge_postings([self.postings[token] for token in alternatives], MAX_CANDIDATES)
+        accepted = set(alternatives)
+        return docs, lambda tokens: not accepted.isdisjoint(tokens), True
+
+    def lookup(self, title: str, year: Optional[int] = None) -> Optional[dict]:
+        """The most popular movie titled exactly ``title`` (normalized), released in ``year``.
+
+        Falls back to a release year off by one, since sites disagree on
+        festival vs. theatrical dates. Without a year any exact title matches.
+        """
+        doc_ids = self.exact_titles.get(normalize(title), [])
+        if year is None:
+            return self.movies[doc_ids[0]] if doc_ids else None
+
+        years = {}
+        for doc_id in doc_ids:
+            release_year = str(self.movies[doc_id]["release_date"] or "")[:4]
+            if release_year.isdigit():
+                years[doc_id] = int(release_year)
+        for tolerance in (0, 1):
+            for doc_id, release_year in years.items():
+                if abs(release_year - year) <= tolerance:
+                    return self.movies[doc_id]
+        return None
+
+    def search(self, query: str, limit: int = SEARCH_PAGE_SIZE) -> list[dict]:
+        """Return up to ``limit`` API-shaped movies, best match first."""
+        movies, _ = self.search_page(query, 1, limit)
+        return movies
+
+    def search_page(
+        self, query: str, page: int = 1, page_size: int = SEARCH_PAGE_SIZE
+    ) -> tuple[list[dict], int]:
+        """Return one page of API-shaped movies, best match first, and the number of matches.
+
+        Only the MAX_CANDIDATES most popular matches (plus exact titles) are
+        considered, so the count and the pages stop there.
+        """
+        normalized = normalize(query)
+        terms = normalized.split()
+        if not terms:
+            return [], 0
+
+        matchers = [
+            self._term_matcher(term, is_prefix=index == len(terms) - 1)
+            for index, term in enumerate(terms)
+        ]
+        fuzzy = any(is_fuzzy for _, _, is_fuzzy in matchers)
+
+        # Walk the rarest term's postings and check the other terms per document
+        driver = min(range(len(matchers)), key=lambda index: len(matchers[index][0]))
+        others = [matcher for index, (_, matcher, _) in enumerate(matchers) if index != driver]
+        candidates: set[int] = set(self.exact_titles.get(normalized, ()))
+        matched = 0
+        for doc_id in matchers[driver][0]:
+            if all(matcher(self.doc_tokens[doc_id]) for matcher in others):
+                candidates.add(doc_id)
+                matched += 1
+                if matched >= MAX_CANDIDATES:
+                    break
+
+        def score(doc_id: int) -> float:
+            title = self.titles[doc_id]
+            value = self.popularity[doc_id]
+            if title == normalized:
+                value += EXACT_TITLE_BONUS
+            elif title.startswith(normalized):
+                value += TITLE_PREFIX_BONUS
+            if fuzzy:
+                value -= FUZZY_PENALTY
+            return value
+
+        ranked = heapq.nlargest(page * page_size, candidates, key=score)[(page - 1) * page_size:]
+        return [self.movies[doc_id] for doc_id in ranked], len(candidates)
+
+
+class MovieSearch:
+    """Title search answered from a local index, with TMDB as the fallback.
+
+    The index is rebuilt from movie_catalog on a background task and swapped
+    in atomically, so queries never see a half-built index.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        client: AsyncTMDBClient = async_tmdb_client,
+        refresh_interval: float = SEARCH_INDEX_REFRESH_INTERVAL,
+    ):
+        self.repository = repo
+        self.client = client
+        self.refresh_interval = refresh_interval
+        self.index = SearchIndex([])
+        self._task: Optional[asyncio.Task] = None
+
+    def build(self) -> SearchIndex:
+        return SearchIndex(iter_catalog_rows(self.repository))
+
+    async def rebuild(self) -> None:
+        self.index = await run_in_threadpool(self.build)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as exc:
+                print(f"Warning: Failed to rebuild search index: {exc}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def search(self, query: str, page: int = 1) -> dict:
+        """Search titles; same response shape as the TMDB-backed endpoint plus ``source``.
+
+        Every page of a query comes from the same source: the local index when
+        it has at least SEARCH_MIN_LOCAL_RESULTS matches (totals count those
+        matches), TMDB otherwise (with TMDB's totals). When TMDB fails, the
+        local matches are served instead if there are any.
+        """
+        local, total = self.index.search_page(query, page)
+        local_page = {
+            "movies": local,
+            "page": page,
+            "total_pages": math.ceil(total / SEARCH_PAGE_SIZE),
+            "total_results": total,
+            "source": "local",
+        }
+        if total and total >= SEARCH_MIN_LOCAL_RESULTS:
+            return local_page
+
+        try:
+            tmdb_data = await self.client.search_movies(query=query, page=page)
+        except Exception:
+            if not total:
+                raise
+            return local_page
+
+        return {
+            "movies": [transform_movie_for_api(movie) for movie in tmdb_data.get("results", [])],
+            "page": tmdb_data.get("page"),
+            "total_pages": tmdb_data.get("total_pages"),
+            "total_results": tmdb_data.get("total_results"),
+            "source": "tmdb",
+        }
+
+
+movie_search = MovieSearch()
@@ -0,0 +1,393 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from app.repositories import Repository, repository
+from app.services.catalog import MovieCatalog, movie_catalog
+
+# Users whose taste profiles are kept in memory (least recently used are dropped)
+TASTE_CACHE_USERS = int(os.getenv("TASTE_CACHE_USERS", "10000"))
+
+# TMDB's movie genres; a movie's genres are stored as a bitmask over this order
+GENRES = (
+    (28, "Action"),
+    (12, "Adventure"),
+    (16, "Animation"),
+    (35, "Comedy"),
+    (80, "Crime"),
+    (99, "Documentary"),
+    (18, "Drama"),
+    (10751, "Family"),
+    (14, "Fantasy"),
+    (36, "History"),
+    (27, "Horror"),
+    (10402, "Music"),
+    (9648, "Mystery"),
+    (10749, "Romance"),
+    (878, "Science Fiction"),
+    (10770, "TV Movie"),
+    (53, "Thriller"),
+    (10752, "War"),
+    (37, "Western"),
+)
+_GENRE_BITS = {genre_id: bit for bit, (genre_id, _) in enumerate(GENRES)}
+# Decade buckets by start year; release years outside them are ignored
+DECADES = np.arange(1870, 2040, 10)
+# Half-star buckets on the 0-10 scale, matching user_stats.rating_histogram
+HISTOGRAM_BUCKETS = 21
+# Pseudo-count pulling genre/decade affinities toward 0 until a user has rated a few
+AFFINITY_SHRINKAGE = 5.0
+
+
+def genre_mask(genres: list[dict]) -> int:
+    mask = 0
+    for genre in genres or []:
+        bit = _GENRE_BITS.get(genre.get("id"))
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def decade_index(release_date) -> int:
+    """Index into DECADES for a YYYY-MM-DD date (str or date), or -1 when unknown or out of range."""
+    year = str(release_date or "")[:4]
+    if not year.isdigit():
+        return -1
+    index = (int(year) - int(DECADES[0])) // 10
+    return index if 0 <= index < len(DECADES) else -1
+
+
+def catalog_features(rows: Iterable[dict]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(tmdb_ids, genre masks, decade indexes) for catalog rows, sorted by tmdb_id."""
+    tmdb_ids, masks, decades = [], [], []
+    for row in rows:
+        tmdb_ids.append(row["tmdb_id"])
+        masks.append(genre_mask(row.get("genres")))
+        decades.append(decade_index(row.get("release_date")))
+    order = np.argsort(np.array(tmdb_ids, dtype=np.int64), kind="stable")
+    return (
+        np.array(tmdb_ids, dtype=np.int64)[order],
+        np.array(masks, dtype=np.int64)[order],
+        np.array(decades, dtype=np.int64)[order],
+    )
+
+
+def join_features(
+    tmdb_ids: np.ndarray, features: tuple[np.ndarray, np.ndarray, np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Genre masks and decade indexes for rated tmdb_ids (0 / -1 for movies not in the catalog)."""
+    catalog_ids, catalog_masks, catalog_decades = features
+    if not len(catalog_ids):
+        return np.zeros(len(tmdb_ids), dtype=np.int64), np.full(len(tmdb_ids), -1, dtype=np.int64)
+    positions = np.searchsorted(catalog_ids, tmdb_ids)
+    positions[positions == len(catalog_ids)] = 0
+    found = catalog_ids[positions] == tmdb_ids
+    return (
+        np.where(found, catalog_masks[positions], 0),
+        np.where(found, catalog_decades[positions], -1),
+    )
+
+
+@dataclass
+class TasteTotals:
+    """Additive per-user rating sums, one user per row.
+
+    Everything a taste profile reports is derived from these, so adding a
+    rating is adding its contribution and removing one is subtracting it.
+    """
+
+    count: np.ndarray
+    total: np.ndarray
+    histogram: np.ndarray
+    genre_count: np.ndarray
+    genre_sum: np.ndarray
+    decade_count: np.ndarray
+    decade_sum: np.ndarray
+
+    @classmethod
+    def zeros(cls, user_count: int = 1) -> "TasteTotals":
+        return cls(
+            count=np.zeros(user_count),
+            total=np.zeros(user_count),
+            histogram=np.zeros((user_count, HISTOGRAM_BUCKETS)),
+            genre_count=np.zeros((user_count, len(GENRES))),
+            genre_sum=np.zeros((user_count, len(GENRES))),
+            decade_count=np.zeros((user_count, len(DECADES))),
+            decade_sum=np.zeros((user_count, len(DECADES))),
+        )
+
+    @classmethod
+    def aggregate(
+        cls,
+        users: np.ndarray,
+        ratings: np.ndarray,
+        masks: np.ndarray,
+        decades: np.ndarray,
+        user_count: int,
+        signs: Optional[np.ndarray] = None,
+    ) -> "TasteTotals":
+        """Sum ratings into per-user totals with one bincount per output column.
+
+        ``users`` holds row indices in [0, user_count); ``masks`` and
+        ``decades`` are each rated movie's genre bitmask and decade index.
+        ``signs`` (+1/-1) turns rows into removals, for incremental updates.
+        """
+        weights = np.ones(len(users)) if signs is None else signs.astype(np.float64)
+        weighted = weights * ratings
+
+        buckets = np.clip(np.rint(ratings * 2), 0, HISTOGRAM_BUCKETS - 1).astype(np.int64)
+        histogram = np.bincount(
+            users * HISTOGRAM_BUCKETS + buckets,
+            weights=weights,
+            minlength=user_count * HISTOGRAM_BUCKETS,
+        ).reshape(user_count, HISTOGRAM_BUCKETS)
+
+        genre_count = np.empty((user_count, len(GENRES)))
+        genre_sum = np.empty((user_count, len(GENRES)))
+        for bit in range(len(GENRES)):
+            has_genre = (masks >> bit) & 1
+            genre_count[:, bit] = np.bincount(users, weights=weights * has_genre, minlength=user_count)
+            genre_sum[:, bit] = np.bincount(users, weights=weighted * has_genre, minlength=user_count)
+
+        known = decades >= 0
+        cells = users[known] * len(DECADES) + decades[known]
+        shape = (user_count, len(DECADES))
+        decade_count = np.bincount(
+            cells, weights=weights[known], minlength=user_count * len(DECADES)
+        ).reshape(shape)
+        decade_sum = np.bincount(
+            cells, weights=weighted[known], minlength=user_count * len(DECADES)
+        ).reshape(shape)
+
+        return cls(
+            count=np.bincount(users, weights=weights, minlength=user_count),
+            total=np.bincount(users, weights=weighted, minlength=user_count),
+            histogram=histogram,
+            genre_count=genre_count,
+            genre_sum=genre_sum,
+            decade_count=decade_count,
+            decade_sum=decade_sum,
+        )
+
+    def __add__(self, other: "TasteTotals") -> "TasteTotals":
+        return TasteTotals(
+            count=self.count + other.count,
+            total=self.total + other.total,
+            histogram=self.histogram + other.histogram,
+            genre_count=self.genre_count + other.genre_count,
+            genre_sum=self.genre_sum + other.genre_sum,
+            decade_count=self.decade_count + other.decade_count,
+            decade_sum=self.decade_sum + other.decade_sum,
+        )
+
+    def profiles(self) -> list[dict]:
+        """Taste profiles of every row, derived for all rows at once.
+
+        A genre's (or decade's) affinity is how far its ratings sit above the
+        user's own average, shrunk toward 0 by AFFINITY_SHRINKAGE pseudo-ratings.
+        Only the final dicts are built per user.
+        """
+        counts = np.rint(self.count)
+        means = self.total / np.maximum(counts, 1)
+
+        def breakdown(counts: np.ndarray, sums: np.ndarray) -> tuple[list, list, list]:
+            rounded = np.rint(counts)
+            averages = sums / np.maximum(counts, 1e-9)
+            affinities = (sums - means[:, None] * counts) / (counts + AFFINITY_SHRINKAGE)
+            return (
+                rounded.astype(np.int64).tolist(),
+                np.round(averages, 2).tolist(),
+                np.round(affinities, 3).tolist(),
+            )
+
+        genre_counts, genre_averages, genre_affinities = breakdown(self.genre_count, self.genre_sum)
+        decade_counts, decade_averages, decade_affinities = breakdown(
+            self.decade_count, self.decade_sum
+        )
+        decade_starts = DECADES.tolist()
+        histograms = np.rint(self.histogram).astype(np.int64).tolist()
+
+        profiles = []
+        for row, (count, mean) in enumerate(
+            zip(counts.astype(np.int64).tolist(), np.round(means, 2).tolist())
+        ):
+            genres = [
+                {
+                    "id": genre_id,
+                    "name": name,
+                    "count": genre_count,
+                    "average_rating": average,
+                    "affinity": affinity,
+                }
+                for (genre_id, name), genre_count, average, affinity in zip(
+                    GENRES, genre_counts[row], genre_averages[row], genre_affinities[row]
+                )
+                if genre_count > 0
+            ]
+            genres.sort(key=lambda genre: -genre["affinity"])
+            decades = [
+                {
+                    "decade": decade,
+                    "count": decade_count,
+                    "average_rating": average,
+                    "affinity": affinity,
+                }
+                for decade, decade_count, average, affinity in zip(
+                    decade_starts, decade_counts[row], decade_averages[row], decade_affinities[row]
+                )
+                if decade_count > 0
+            ]
+            profiles.append(
+                {
+                    "ratings_count": count,
+                    "average_rating": mean if count else 0.0,
+                    "rating_histogram": histograms[row],
+                    "genres": genres,
+                    "decades": decades,
+                }
+            )
+        return profiles
+
+    def profile(self, row: int = 0) -> dict:
+        """The taste profile of user ``row``."""
+        return TasteTotals(
+            count=self.count[row:row + 1],
+            total=self.total[row:row + 1],
+            histogram=self.histogram[row:row + 1],
+            genre_count=self.genre_count[row:row + 1],
+            genre_sum=self.genre_sum[row:row + 1],
+            decade_count=self.decade_count[row:row + 1],
+            decade_sum=self.decade_sum[row:row + 1],
+        ).profiles()[0]
+
+
+def iter_profiles(
+    users: np.ndarray,
+    ratings: np.ndarray,
+    masks: np.ndarray,
+    decades: np.ndarray,
+    user_count: int,
+    chunk_users: int = 50000,
+) -> Iterator[tuple[int, dict]]:
+    """Yield (user index, taste profile) for every user, ``chunk_users`` at a time.
+
+    Rows must be grouped by user index (as load_rating_arrays returns them),
+    so each chunk of users is a contiguous slice of the arrays.
+    """
+    for first_user in range(0, user_count, chunk_users):
+        chunk = min(chunk_users, user_count - first_user)
+        lo, hi = np.searchsorted(users, [first_user, first_user + chunk])
+        totals = TasteTotals.aggregate(
+            users[lo:hi].astype(np.int64) - first_user,
+            ratings[lo:hi].astype(np.float64),
+            masks[lo:hi],
+            decades[lo:hi],
+            chunk,
+        )
+        yield from enumerate(totals.profiles(), start=first_user)
+
+
+@dataclass
+class _CachedTaste:
+    version: tuple
+    # tmdb_id -> (rating, genre mask, decade index) for every rated movie
+    entries: dict[int, tuple[float, int, int]]
+    totals: TasteTotals
+    # Rated movies the catalog could not resolve; counted without genre or decade for now
+    unresolved: frozenset[int] = frozenset()
+
+
+class TasteProfiles:
+    """Per-user taste profiles, cached and updated incrementally.
+
+    A cached profile is reused while the user's user_versions row is
+    unchanged. When it changes, the user's ratings are diffed against the
+    cached ones and only added, changed or removed ratings are applied, so
+    catalog lookups are limited to movies rated since the last profile.
+    Movies the catalog could not resolve are looked up again on every
+    request until they resolve, and the profile is reported as incomplete
+    until then.
+    """
+
+    def __init__(
+        self,
+        repo: Repository = repository,
+        catalog: MovieCatalog = movie_catalog,
+        max_users: int = TASTE_CACHE_USERS,
+    ):
+        self.repository = repo
+        self.catalog = catalog
+        self.max_users = max_users
+        self._cache: OrderedDict[str, _CachedTaste] = OrderedDict()
+
+    async def get(self, user_id: str) -> tuple[dict, bool]:
+        """The user's taste profile, and whether every rated movie could be resolved."""
+        version_row = await run_in_threadpool(self.repository.get_user_version, user_id) or {}
+        version = (version_row.get("version"), version_row.get("updated_at"))
+
+        cached = self._cache.get(user_id)
+        if cached is not None and cached.version == version and not cached.unresolved:
+            self._cache.move_to_end(user_id)
+            return cached.totals.profile(), True
+
+        current = await run_in_threadpool(self.repository.list_rating_values, user_id)
+        previous = cached.entries if cached is not None else {}
+        # Unresolved movies are replaced like changed ratings, with a fresh lookup
+        retry = cached.unresolved if cached is not None else frozenset()
+
+        removed = [
+            (tmdb_id, entry)
+            for tmdb_id, entry in previous.items()
+            if current.get(tmdb_id) != entry[0] or tmdb_id in retry
+        ]
+        added_ids = [
+            tmdb_id
+            for tmdb_id, rating in current.items()
+            if tmdb_id not in previous or previous[tmdb_id][0] != rating or tmdb_id in retry
+        ]
+
+        entries = {
+            tmdb_id: entry
+            for tmdb_id, entry in previous.items()
+            if current.get(tmdb_id) == entry[0] and tmdb_id not in retry
+        }
+        # Genres and release dates of newly rated movies (reused entries keep theirs)
+        unknown = [tmdb_id for tmdb_id in added_ids if tmdb_id not in previous or tmdb_id in retry]
+        movie_map = await self.catalog.get_movie_map(unknown) if unknown else {}
+        unresolved = set()
+        for tmdb_id in added_ids:
+            if tmdb_id in previous and tmdb_id not in retry:
+                _, mask, decade = previous[tmdb_id]
+            else:
+                movie = movie_map.get(tmdb_id)
+                if movie is None:
+                    unresolved.add(tmdb_id)
+                    movie = {}
+                mask = genre_mask(movie.get("genres"))
+                decade = decade_index(movie.get("release_date"))
+            entries[tmdb_id] = (current[tmdb_id], mask, decade)
+
+        changes = [(1.0, entries[tmdb_id]) for tmdb_id in added_ids] + [
+            (-1.0, entry) for _, entry in removed
+        ]
+        totals = cached.totals if cached is not None else TasteTotals.zeros()
+        if changes:
+            signs = np.array([sign for sign, _ in changes])
+            ratings = np.array([entry[0] for _, entry in changes])
+            masks = np.array([entry[1] for _, entry in changes], dtype=np.int64)
+            decades = np.array([entry[2] for _, entry in changes], dtype=np.int64)
+            users = np.zeros(len(changes), dtype=np.int64)
+            totals = totals + TasteTotals.aggregate(users, ratings, masks, decades, 1, signs)
+
+        self._cache[user_id] = _CachedTaste(version, entries, totals, frozenset(unresolved))
+        self._cache.move_to_end(user_id)
+        while len(self._cache) > self.max_users:
+            self._cache.popitem(last=False)
+        return totals.profile(), not unresolved
+
+
+taste_profiles = TasteProfiles()
@@ -1,44 +1,213 @@
+import asyncio
 import os
+import time
+import httpx
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from typing import Optional
+from urllib3.util.retry import Retry
+
+from app.services.cache import CacheBackend, TTLCache, make_cache_key
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 
+# Upper bound for parallel TMDB requests issued by a single fan-out call
+TMDB_MAX_CONCURRENCY = int(os.getenv("TMDB_MAX_CONCURRENCY", "16"))
+# Overall time budget (seconds) for a fan-out call before returning partial results
+TMDB_FANOUT_DEADLINE = float(os.getenv("TMDB_FANOUT_DEADLINE", "8"))
+
+# Time to live (seconds) per cached endpoint. Movie details rarely change,
+# the popular feed is refreshed by TMDB daily and search results drift slowly.
+TMDB_CACHE_TTLS = {
+    "popular": 6 * 60 * 60,
+    "movie_details": 24 * 60 * 60,
+    "movie_details_videos": 24 * 60 * 60,
+    "watch_providers": 12 * 60 * 60,
+    "movie_bundle": 12 * 60 * 60,
+    "search": 60 * 60,
+    "find": 24 * 60 * 60,
+}
+
+# Extra time (seconds) an expired entry may still be served while it is refreshed
+# in the background (stale-while-revalidate). Endpoints not listed expire hard.
+TMDB_STALE_TTLS = {
+    "popular": 24 * 60 * 60,
+}
+
+# Popular feed pages kept hot by PopularFeedWarmer (0 disables it), and how
+# often (seconds) they are re-fetched; keep the interval below the popular TTL.
+TMDB_PREWARM_PAGES = int(os.getenv("TMDB_PREWARM_PAGES", "3"))
+TMDB_PREWARM_INTERVAL = float(os.getenv("TMDB_PREWARM_INTERVAL", str(30 * 60)))
+
+# Sub-resources that can be folded into a details call via append_to_response
+TMDB_BUNDLE_PARTS = ("videos", "watch/providers", "credits", "similar")
+DEFAULT_BUNDLE_PARTS = ("videos", "watch/providers")
+
+# Connection pool size for the shared HTTP session; match it to worker concurrency
+TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", str(TMDB_MAX_CONCURRENCY)))
+# Retries (with exponential backoff) for rate limiting and transient upstream errors
+TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "3"))
+TMDB_RETRY_BACKOFF = float(os.getenv("TMDB_RETRY_BACKOFF", "0.5"))
+TMDB_RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Connection limit for the async client; requests beyond it queue for a free connection
+TMDB_ASYNC_POOL_SIZE = int(os.getenv("TMDB_ASYNC_POOL_SIZE", "100"))
+
+tmdb_cache: CacheBackend = TTLCache(maxsize=int(os.getenv("TMDB_CACHE_SIZE", "5000")))
+
+# Sentinel: the client uses whatever tmdb_cache is configured at call time
+_SHARED_CACHE = object()
+
+
+def _bundle_params(parts: tuple[str, ...], language: str) -> dict:
+    unknown = [part for part in parts if part not in TMDB_BUNDLE_PARTS]
+    if unknown:
+        raise ValueError(f"Unsupported bundle parts: {', '.join(unknown)}")
+    # Canonical order so equivalent bundles share one cache entry
+    ordered = [part for part in TMDB_BUNDLE_PARTS if part in parts]
+    return {"language": language, "append_to_response": ",".join(ordered)}
+
+
+def _cache_read(cache: CacheBackend, cache_key: str, endpoint: str) -> tuple[Optional[dict], bool]:
+    """Look up a cached response; returns (data, fresh)."""
+    entry = cache.get(cache_key)
+    if entry is None:
+        return None, False
+    if endpoint not in TMDB_STALE_TTLS:
+        return entry, True
+    return entry["data"], time.time() < entry["fresh_until"]
+
+
+def _cache_write(cache: CacheBackend, cache_key: str, endpoint: str, data: dict) -> None:
+    ttl = TMDB_CACHE_TTLS.get(endpoint, 0)
+    stale_ttl = TMDB_STALE_TTLS.get(endpoint)
+    if stale_ttl is None:
+        cache.set(cache_key, data, ttl)
+        return
+    # Wall clock rather than monotonic so entries stay meaningful in a shared backend
+    cache.set(cache_key, {"data": data, "fresh_until": time.time() + ttl}, ttl + stale_ttl)
+
+
+def configure_tmdb_cache(backend: CacheBackend) -> None:
+    """Swap the TMDB response cache, e.g. for a shared backend across workers."""
+    global tmdb_cache
+    tmdb_cache = backend
+
 
 class TMDBClient:
-    """Client for interacting with The Movie Database (TMDB) API."""
+    """Client for interacting with The Movie Database (TMDB) API.
+
+    Holds a long-lived requests.Session so TCP/TLS connections to TMDB are
+    kept alive and reused across calls instead of being set up per request.
+    Use the shared ``tmdb_client`` instance rather than creating new ones.
+
+    Args:
+        api_key: TMDB API key (default: TMDB_API_KEY)
+        base_url: TMDB API base URL
+        pool_size: Max pooled connections kept open to TMDB
+        max_retries: Retries for 429/5xx responses and connection errors
+        backoff_factor: Base delay (seconds) for exponential retry backoff
+        timeout: Per-request timeout in seconds
+        cache: Response cache; pass None to disable caching
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TMDB_BASE_URL,
+        pool_size: int = TMDB_POOL_SIZE,
+        max_retries: int = TMDB_MAX_RETRIES,
+        backoff_factor: float = TMDB_RETRY_BACKOFF,
+        timeout: float = 10.0,
+        cache: object = _SHARED_CACHE,
+    ):
+        self.api_key = api_key or TMDB_API_KEY
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._cache = cache
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=TMDB_RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def cache(self) -> Optional[CacheBackend]:
+        if self._cache is _SHARED_CACHE:
+            return tmdb_cache
+        return self._cache
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def _get(self, endpoint: str, path: str, params: dict) -> dict:
+        """GET a TMDB resource, serving it from the response cache when possible.
 
-    @staticmethod
-    def get_popular_movies(page: int = 1, language: str = "en-US") -> dict:
-        """Fetch popular movies from TMDB.
-        
         Args:
-            page: Page number for pagination (default: 1)
-            language: Language code (default: en-US)
-            
+            endpoint: Logical endpoint name, used for the cache key and TTL lookup
+            path: URL path below the base URL
+            params: Query parameters without the API key
+
         Returns:
-            Dictionary with movies data and metadata
+            Decoded JSON response
         """
-        if not TMDB_API_KEY:
+        if not self.api_key:
             raise ValueError("TMDB_API_KEY not configured in environment")
 
-        url = f"{TMDB_BASE_URL}/movie/popular"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": language,
-            "page": page,
-        }
+        cache = self.cache
+        cache_key = make_cache_key(endpoint, {"path": path, **params})
+        if cache is not None:
+            # Stale entries are refetched inline; only the async client revalidates in the background
+            cached, fresh = _cache_read(cache, cache_key, endpoint)
+            if cached is not None and fresh:
+                return cached
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(
+                f"{self.base_url}{path}",
+                params={"api_key": self.api_key, **params},
+                timeout=self.timeout,
+            )
             response.raise_for_status()
-            return response.json()
+            data = response.json()
         except requests.RequestException as exc:
             raise RuntimeError(f"TMDB API error: {exc}")
 
-    @staticmethod
-    def get_movie_details(movie_id: int, language: str = "en-US") -> dict:
+        if cache is not None:
+            _cache_write(cache, cache_key, endpoint, data)
+        return data
+
+    def get_popular_movies(self, page: int = 1, language: str = "en-US") -> dict:
+        """Fetch popular movies from TMDB.
+        
+        Args:
+            page: Page number for pagination (default: 1)
+            language: Language code (default: en-US)
+            
+        Returns:
+            Dictionary with movies data and metadata
+        """
+        return self._get(
+            "popular",
+            "/movie/popular",
+            {"language": language, "page": page},
+        )
+
+    def get_movie_details(self, movie_id: int, language: str = "en-US") -> dict:
         """Fetch detailed information about a specific movie.
         
         Args:
@@ -48,62 +217,52 @@ class TMDBClient:
         Returns:
             Dictionary with detailed movie information
         """
-        if not TMDB_API_KEY:
-            raise ValueError("TMDB_API_KEY not configured in environment")
-
-        url = f"{TMDB_BASE_URL}/movie/{movie_id}"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": language,
-        }
-
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as exc:
-            raise RuntimeError(f"TMDB API error: {exc}")
+        return self._get(
+            "movie_details",
+            f"/movie/{movie_id}",
+            {"language": language},
+        )
 
-    @staticmethod
-    def get_movie_details_with_videos(movie_id: int, language: str = "en-US") -> dict:
+    def get_movie_details_with_videos(self, movie_id: int, language: str = "en-US") -> dict:
         """Fetch movie details with appended videos."""
-        if not TMDB_API_KEY:
-            raise ValueError("TMDB_API_KEY not configured in environment")
+        return self._get(
+            "movie_details_videos",
+            f"/movie/{movie_id}",
+            {"language": language, "append_to_response": "videos"},
+        )
 
-        url = f"{TMDB_BASE_URL}/movie/{movie_id}"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "language": language,
-            "append_to_response": "videos",
-        }
+    def get_watch_providers(self, movie_id: int) -> dict:
+        """Fetch watch providers for a movie."""
+        return self._get("watch_providers", f"/movie/{movie_id}/watch/providers", {})
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as exc:
-            raise RuntimeError(f"TMDB API error: {exc}")
+    def get_movie_bundle(
+        self,
+        movie_id: int,
+        parts: tuple[str, ...] = DEFAULT_BUNDLE_PARTS,
+        language: str = "en-US",
+    ) -> dict:
+        """Fetch movie details plus sub-resources in a single TMDB request.
 
-    @staticmethod
-    def get_watch_providers(movie_id: int) -> dict:
-        """Fetch watch providers for a movie."""
-        if not TMDB_API_KEY:
-            raise ValueError("TMDB_API_KEY not configured in environment")
+        Uses append_to_response, so details, videos and watch providers (and
+        optionally credits/similar) cost one upstream call and one cache entry.
+        Appended resources are returned under their own keys, e.g.
+        ``bundle["videos"]`` and ``bundle["watch/providers"]``.
 
-        url = f"{TMDB_BASE_URL}/movie/{movie_id}/watch/providers"
-        params = {
-            "api_key": TMDB_API_KEY,
-        }
+        Args:
+            movie_id: TMDB movie ID
+            parts: Sub-resources to append, from TMDB_BUNDLE_PARTS
+            language: Language code (default: en-US)
 
-        try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as exc:
-            raise RuntimeError(f"TMDB API error: {exc}")
+        Returns:
+            Dictionary with movie details and appended resources
+        """
+        return self._get(
+            "movie_bundle",
+            f"/movie/{movie_id}",
+            _bundle_params(parts, language),
+        )
 
-    @staticmethod
-    def search_movies(query: str, language: str = "en-US", page: int = 1) -> dict:
+    def search_movies(self, query: str, language: str = "en-US", page: int = 1) -> dict:
         """Search for movies by title.
         
         Args:
@@ -114,23 +273,337 @@ class TMDBClient:
         Returns:
             Dictionary with search results
         """
-        if not TMDB_API_KEY:
-            raise ValueError("TMDB_API_KEY not configured in environment")
+        return self._get(
+            "search",
+            "/search/movie",
+            {"query": query, "language": language, "page": page},
+        )
+
+    def get_movie_details_many(
+        self,
+        movie_ids: list[int],
+        language: str = "en-US",
+        max_concurrency: int | None = None,
+        deadline: float | None = None,
+    ) -> dict[int, dict]:
+        """Fetch details for many movies concurrently.
 
-        url = f"{TMDB_BASE_URL}/search/movie"
-        params = {
-            "api_key": TMDB_API_KEY,
-            "query": query,
-            "language": language,
-            "page": page,
-        }
+        Requests run on a bounded thread pool so a library of N movies costs
+        roughly N / max_concurrency round-trip waves instead of N serial calls.
+        Movies that fail or are still in flight when the deadline passes are
+        left out of the result, so callers always get a (possibly partial) map.
+
+        Args:
+            movie_ids: TMDB movie IDs to fetch
+            language: Language code (default: en-US)
+            max_concurrency: Max in-flight requests (default: TMDB_MAX_CONCURRENCY)
+            deadline: Time budget in seconds (default: TMDB_FANOUT_DEADLINE)
+
+        Returns:
+            Dictionary mapping movie ID to raw TMDB details
+        """
+        unique_ids = list(dict.fromkeys(movie_ids))
+        if not unique_ids:
+            return {}
 
+        workers = max(1, min(max_concurrency or TMDB_MAX_CONCURRENCY, len(unique_ids)))
+        timeout = TMDB_FANOUT_DEADLINE if deadline is None else deadline
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tmdb-fanout")
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as exc:
-            raise RuntimeError(f"TMDB API error: {exc}")
+            futures = {
+                executor.submit(self.get_movie_details, movie_id, language): movie_id
+                for movie_id in unique_ids
+            }
+            done, _ = wait(futures, timeout=timeout)
+        finally:
+            # Don't block on stragglers; queued requests past the deadline are dropped
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        results: dict[int, dict] = {}
+        for future in done:
+            if future.exception() is None:
+                results[futures[future]] = future.result()
+        return results
+
+
+class AsyncTMDBClient:
+    """Asyncio variant of TMDBClient backed by a pooled httpx.AsyncClient.
+
+    Shares the response cache (and cache keys) with TMDBClient. Used by the
+    async route handlers so a slow upstream parks coroutines rather than
+    threads. The underlying httpx client is created lazily on first use and
+    must be closed with ``aclose()`` on application shutdown.
+
+    Identical requests in flight at the same time share one upstream call
+    (single-flight), and endpoints listed in TMDB_STALE_TTLS serve an expired
+    cache entry immediately while one background request refreshes it.
+
+    Args:
+        api_key: TMDB API key (default: TMDB_API_KEY)
+        base_url: TMDB API base URL
+        pool_size: Max concurrent connections to TMDB
+        max_retries: Retries for 429/5xx responses and transport errors
+        backoff_factor: Base delay (seconds) for exponential retry backoff
+        timeout: Per-request timeout in seconds
+        cache: Response cache; pass None to disable caching
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TMDB_BASE_URL,
+        pool_size: int = TMDB_ASYNC_POOL_SIZE,
+        max_retries: int = TMDB_MAX_RETRIES,
+        backoff_factor: float = TMDB_RETRY_BACKOFF,
+        timeout: float = 10.0,
+        cache: object = _SHARED_CACHE,
+    ):
+        self.api_key = api_key or TMDB_API_KEY
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self._cache = cache
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    @property
+    def cache(self) -> Optional[CacheBackend]:
+        if self._cache is _SHARED_CACHE:
+            return tmdb_cache
+        return self._cache
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                # Waiting for a free pooled connection is bounded by callers' deadlines
+                timeout=httpx.Timeout(self.timeout, pool=None),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff_factor * (2 ** attempt)
+
+    async def _get(self, endpoint: str, path: str, params: dict, refresh: bool = False) -> dict:
+        """Async counterpart of TMDBClient._get.
+
+        ``refresh`` skips the cache lookup (the response is still cached).
+        """
+        if not self.api_key:
+            raise ValueError("TMDB_API_KEY not configured in environment")
+
+        cache = self.cache
+        cache_key = make_cache_key(endpoint, {"path": path, **params})
+        if cache is not None and not refresh:
+            cached, fresh = _cache_read(cache, cache_key, endpoint)
+            if cached is not None:
+                if not fresh:
+                    self._single_flight(endpoint, path, params, cache_key)
+                return cached
+
+        # Shielded: a caller hitting its own deadline must not cancel the
+        # request other callers are waiting on
+        return await asyncio.shield(self._single_flight(endpoint, path, params, cache_key))
+
+    def _single_flight(self, endpoint: str, path: str, params: dict, cache_key: str) -> asyncio.Future:
+        """Return the in-flight request for ``cache_key``, starting one if there is none."""
+        future = self._inflight.get(cache_key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(endpoint, path, params, cache_key))
+            self._inflight[cache_key] = future
+
+            def finished(done: asyncio.Future) -> None:
+                self._inflight.pop(cache_key, None)
+                # Retrieve the outcome so background refresh failures are not reported as unhandled
+                if not done.cancelled() and done.exception() is not None:
+                    print(f"Warning: TMDB request for {endpoint} failed: {done.exception()}")
+
+            future.add_done_callback(finished)
+        return future
+
+    async def _fetch(self, endpoint: str, path: str, params: dict, cache_key: str) -> dict:
+        query = {"api_key": self.api_key, **params}
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.get(path, params=query)
+            except httpx.TransportError as exc:
+                if attempt >= self.max_retries:
+                    raise RuntimeError(f"TMDB API error: {exc}")
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code in TMDB_RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(self._retry_delay(attempt, response))
+                continue
+
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                raise RuntimeError(f"TMDB API error: {exc}")
+            data = response.json()
+            break
+
+        cache = self.cache
+        if cache is not None:
+            _cache_write(cache, cache_key, endpoint, data)
+        return data
+
+    async def get_popular_movies(
+        self, page: int = 1, language: str = "en-US", refresh: bool = False
+    ) -> dict:
+        """Fetch popular movies from TMDB (``refresh`` bypasses the cached page)."""
+        return await self._get(
+            "popular",
+            "/movie/popular",
+            {"language": language, "page": page},
+            refresh=refresh,
+        )
+
+    async def get_movie_details(self, movie_id: int, language: str = "en-US") -> dict:
+        """Fetch detailed information about a specific movie."""
+        return await self._get(
+            "movie_details",
+            f"/movie/{movie_id}",
+            {"language": language},
+        )
+
+    async def get_movie_details_with_videos(self, movie_id: int, language: str = "en-US") -> dict:
+        """Fetch movie details with appended videos."""
+        return await self._get(
+            "movie_details_videos",
+            f"/movie/{movie_id}",
+            {"language": language, "append_to_response": "videos"},
+        )
+
+    async def get_watch_providers(self, movie_id: int) -> dict:
+        """Fetch watch providers for a movie."""
+        return await self._get("watch_providers", f"/movie/{movie_id}/watch/providers", {})
+
+    async def get_movie_bundle(
+        self,
+        movie_id: int,
+        parts: tuple[str, ...] = DEFAULT_BUNDLE_PARTS,
+        language: str = "en-US",
+    ) -> dict:
+        """Fetch movie details plus sub-resources in a single TMDB request."""
+        return await self._get(
+            "movie_bundle",
+            f"/movie/{movie_id}",
+            _bundle_params(parts, language),
+        )
+
+    async def search_movies(
+        self, query: str, language: str = "en-US", page: int = 1, year: Optional[int] = None
+    ) -> dict:
+        """Search for movies by title (``year`` keeps movies released that year in any region)."""
+        params = {"query": query, "language": language, "page": page}
+        if year is not None:
+            params["year"] = year
+        return await self._get("search", "/search/movie", params)
+
+    async def find_by_imdb_id(self, imdb_id: str) -> dict:
+        """Look up an IMDb id ("tt0111161"); matching movies are in ``movie_results``."""
+        return await self._get("find", f"/find/{imdb_id}", {"external_source": "imdb_id"})
+
+    async def get_movie_details_many(
+        self,
+        movie_ids: list[int],
+        language: str = "en-US",
+        max_concurrency: int | None = None,
+        deadline: float | None = None,
+    ) -> dict[int, dict]:
+        """Fetch details for many movies concurrently.
+
+        Same partial-result semantics as TMDBClient.get_movie_details_many,
+        with in-flight requests bounded by a semaphore instead of a thread pool.
+        """
+        unique_ids = list(dict.fromkeys(movie_ids))
+        if not unique_ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or TMDB_MAX_CONCURRENCY))
+        timeout = TMDB_FANOUT_DEADLINE if deadline is None else deadline
+
+        async def fetch_one(movie_id: int) -> dict:
+            async with semaphore:
+                return await self.get_movie_details(movie_id, language)
+
+        tasks = {asyncio.ensure_future(fetch_one(movie_id)): movie_id for movie_id in unique_ids}
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+        results: dict[int, dict] = {}
+        for task in done:
+            if task.exception() is None:
+                results[tasks[task]] = task.result()
+        return results
+
+
+class PopularFeedWarmer:
+    """Keeps the first pages of the popular feed cached.
+
+    Re-fetches pages 1..``pages`` every ``interval`` seconds on a background
+    task, so clients opening the app never wait on TMDB for them.
+    """
+
+    def __init__(
+        self,
+        client: AsyncTMDBClient,
+        pages: int = TMDB_PREWARM_PAGES,
+        interval: float = TMDB_PREWARM_INTERVAL,
+    ):
+        self.client = client
+        self.pages = pages
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def warm(self) -> None:
+        results = await asyncio.gather(
+            *(self.client.get_popular_movies(page=page, refresh=True) for page in range(1, self.pages + 1)),
+            return_exceptions=True,
+        )
+        for page, result in enumerate(results, start=1):
+            if isinstance(result, Exception):
+                print(f"Warning: Failed to prewarm popular page {page}: {result}")
+
+    async def _run(self) -> None:
+        while True:
+            await self.warm()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.pages > 0 and self.client.api_key and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+tmdb_client = TMDBClient()
+async_tmdb_client = AsyncTMDBClient()
+popular_feed_warmer = PopularFeedWarmer(async_tmdb_client)
 
 
 def transform_movie_for_api(tmdb_movie: dict) -> dict:
@@ -0,0 +1,100 @@
+"""Build time, memory and query latency of the autocomplete index.
+
+Builds a CompletionIndex over synthetic titles (or the real movie_catalog
+with ``--catalog``), reports the memory it retains (tracemalloc), how long
+the serving process takes to unpickle it from the build process, and replays
+random typeahead prefixes against it.
+
+Usage (from backend/):
+    python -m benchmarks.autocomplete --titles 200000 --queries 50000
+"""
+import argparse
+import pickle
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.services.autocomplete import CompletionIndex
+from app.services.catalog import iter_catalog_rows
+
+_WORDS = (
+    "star wars love night dark return king lost city last dead man house blood "
+    "girl world war story day life black red summer secret island road home "
+    "ghost time heart fire moon river shadow storm empire golden little great"
+).split()
+
+
+def synthetic_rows(count: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "tmdb_id": tmdb_id,
+            "title": " ".join(rng.choice(_WORDS).title() for _ in range(rng.randint(1, 5)))
+            + f" {rng.randint(1, 999)}",
+            "release_date": f"{rng.randint(1920, 2026)}-01-01",
+            "popularity": rng.paretovariate(1.2),
+        }
+        for tmdb_id in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=200_000, help="synthetic titles to index")
+    parser.add_argument("--catalog", action="store_true", help="index movie_catalog instead")
+    parser.add_argument("--queries", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rows = list(iter_catalog_rows()) if args.catalog else synthetic_rows(args.titles, args.seed)
+
+    started = time.perf_counter()
+    index = CompletionIndex(rows)
+    build_seconds = time.perf_counter() - started
+    # Measured on a second build: tracing allocations slows the build several times over
+    tracemalloc.start()
+    traced = CompletionIndex(rows)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+    print(
+        f"indexed {len(index)} titles ({len(index.docs)} keys, {len(index.top)} precomputed prefixes) "
+        f"in {build_seconds:.2f}s; retained={retained / 2**20:.1f}MiB peak={peak / 2**20:.1f}MiB"
+    )
+
+    # The serving process only pays for unpickling the index built elsewhere
+    payload = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+    started = time.perf_counter()
+    pickle.loads(payload)
+    print(
+        f"handoff: {len(payload) / 2**20:.1f}MiB pickled, "
+        f"loaded in {(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+
+    # Prefixes as typed: 1..12 characters of a random title
+    rng = random.Random(args.seed)
+    titles = [row["title"] for row in rows if row.get("title")]
+    queries = []
+    for _ in range(args.queries):
+        title = rng.choice(titles)
+        queries.append(title[: rng.randint(1, min(12, len(title)))])
+
+    samples = []
+    started = time.perf_counter()
+    for query in queries:
+        query_started = time.perf_counter()
+        index.complete(query)
+        samples.append(time.perf_counter() - query_started)
+    elapsed = time.perf_counter() - started
+
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p99 = samples_ms[int(len(samples_ms) * 0.99) - 1]
+    print(
+        f"{len(queries)} queries: {len(queries) / elapsed:.0f} QPS (single thread) "
+        f"p50={statistics.median(samples_ms):.3f}ms p99={p99:.3f}ms max={samples_ms[-1]:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
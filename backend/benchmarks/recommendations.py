@@ -0,0 +1,109 @@
+"""Build time, model size and scoring latency of the item-item recommender.
+
+Generates ratings from a small latent-factor model (popularity-skewed, so a
+few movies collect most ratings, like real data), builds the model, then
+times ``recommend`` for sampled users. Hit rate@20 on one held-out liked
+movie per user is compared with recommending the most rated movies.
+
+Usage (from backend/):
+    python -m benchmarks.recommendations --users 50000 --movies 20000 --ratings-per-user 40
+"""
+import argparse
+import statistics
+import tempfile
+import time
+import os
+
+import numpy as np
+
+from app.services.recommendations import ItemSimilarityModel
+
+
+def synthetic_ratings(users: int, movies: int, per_user: int, seed: int):
+    rng = np.random.default_rng(seed)
+    user_factors = rng.normal(size=(users, 8)).astype(np.float32)
+    movie_factors = rng.normal(size=(movies, 8)).astype(np.float32)
+    popularity = 1.0 / np.arange(1, movies + 1) ** 0.9
+    popularity /= popularity.sum()
+
+    # People mostly watch (and rate) popular movies they expect to like: draw
+    # popularity-weighted candidates and keep each with a taste-dependent chance
+    counts = rng.poisson(per_user * 3, size=users).clip(2, movies)
+    user_index = np.repeat(np.arange(users, dtype=np.int32), counts)
+    movie_index = rng.choice(movies, size=len(user_index), p=popularity).astype(np.int32)
+    affinity = np.einsum("ij,ij->i", user_factors[user_index], movie_factors[movie_index]) / 2
+    watched = rng.random(len(affinity)) < 1 / (1 + np.exp(-2 * affinity))
+    user_index, movie_index = user_index[watched], movie_index[watched]
+    # Drop repeated (user, movie) pairs
+    pairs = np.unique(user_index.astype(np.int64) * movies + movie_index)
+    user_index = (pairs // movies).astype(np.int32)
+    movie_index = (pairs % movies).astype(np.int32)
+
+    affinity = np.einsum("ij,ij->i", user_factors[user_index], movie_factors[movie_index]) / 2
+    ratings = np.clip(np.round(5 + 2 * affinity + rng.normal(0, 1, len(affinity))), 0, 10)
+    # tmdb ids are sparse in practice
+    return user_index, movie_index * 7 + 11, ratings.astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--movies", type=int, default=20_000)
+    parser.add_argument("--ratings-per-user", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    users, tmdb_ids, ratings = synthetic_ratings(
+        args.users, args.movies, args.ratings_per_user, args.seed
+    )
+
+    # Hold out one liked movie (rating >= 8) per sampled user
+    rng = np.random.default_rng(args.seed)
+    starts = np.searchsorted(users, np.arange(args.users))
+    ends = np.searchsorted(users, np.arange(args.users), side="right")
+    held_out = {}
+    for user in rng.choice(args.users, size=min(args.queries, args.users), replace=False):
+        liked = np.flatnonzero(ratings[starts[user]:ends[user]] >= 8)
+        if len(liked):
+            held_out[int(user)] = starts[user] + int(rng.choice(liked))
+    keep = np.ones(len(ratings), dtype=bool)
+    keep[list(held_out.values())] = False
+    print(f"{len(ratings)} ratings, {args.users} users, {len(np.unique(tmdb_ids))} movies")
+
+    started = time.perf_counter()
+    model = ItemSimilarityModel.build(users[keep], tmdb_ids[keep], ratings[keep])
+    build_seconds = time.perf_counter() - started
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.npz")
+        model.save(path)
+        size = os.path.getsize(path)
+    print(f"built in {build_seconds:.1f}s; model file {size / 2**20:.1f} MiB")
+
+    most_rated = [
+        int(tmdb_id)
+        for tmdb_id in np.unique(tmdb_ids[keep], return_counts=True)[0][
+            np.argsort(-np.unique(tmdb_ids[keep], return_counts=True)[1])
+        ][:500]
+    ]
+    samples, hits, popular_hits = [], 0, 0
+    for user, held_row in held_out.items():
+        rows = [row for row in range(starts[user], ends[user]) if row != held_row]
+        user_ratings = {int(tmdb_ids[row]): float(ratings[row]) for row in rows}
+        query_started = time.perf_counter()
+        ranked = model.recommend(user_ratings, 20)
+        samples.append(time.perf_counter() - query_started)
+        target = int(tmdb_ids[held_row])
+        hits += target in {tmdb_id for tmdb_id, _ in ranked}
+        popular_hits += target in [m for m in most_rated if m not in user_ratings][:20]
+
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p99 = samples_ms[int(len(samples_ms) * 0.99) - 1]
+    print(
+        f"{len(samples)} users: p50={statistics.median(samples_ms):.2f}ms p99={p99:.2f}ms; "
+        f"hit rate@20 model={hits / len(samples):.3f} most-rated={popular_hits / len(samples):.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
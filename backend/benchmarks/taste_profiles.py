@@ -0,0 +1,77 @@
+"""Throughput of the batch taste-profile computation (users per minute).
+
+Generates a synthetic catalog (random genre sets and release years) and
+popularity-skewed ratings, then times the same steps as
+``app.scripts.taste_profiles``: joining ratings to catalog features,
+aggregating per user and serializing one JSON line per user.
+
+Usage (from backend/):
+    python -m benchmarks.taste_profiles --users 200000 --movies 50000 --ratings-per-user 40
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.services.taste import GENRES, catalog_features, iter_profiles, join_features
+
+
+def synthetic_catalog(movies: int, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    genre_counts = rng.integers(1, 4, size=movies)
+    years = rng.integers(1920, 2026, size=movies)
+    return [
+        {
+            "tmdb_id": movie * 7 + 11,
+            "genres": [
+                {"id": GENRES[bit][0]}
+                for bit in rng.choice(len(GENRES), size=genre_counts[movie], replace=False)
+            ],
+            "release_date": f"{years[movie]}-01-01",
+        }
+        for movie in range(movies)
+    ]
+
+
+def synthetic_ratings(users: int, movies: int, per_user: int, seed: int):
+    rng = np.random.default_rng(seed)
+    popularity = 1.0 / np.arange(1, movies + 1) ** 0.9
+    popularity /= popularity.sum()
+    counts = rng.poisson(per_user, size=users).clip(1, movies)
+    user_index = np.repeat(np.arange(users, dtype=np.int32), counts)
+    movie_index = rng.choice(movies, size=len(user_index), p=popularity)
+    ratings = rng.integers(1, 21, size=len(user_index)) / 2
+    return user_index, (movie_index * 7 + 11).astype(np.int32), ratings.astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--movies", type=int, default=50_000)
+    parser.add_argument("--ratings-per-user", type=int, default=40)
+    parser.add_argument("--chunk-users", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    features = catalog_features(synthetic_catalog(args.movies, args.seed))
+    users, tmdb_ids, ratings = synthetic_ratings(
+        args.users, args.movies, args.ratings_per_user, args.seed
+    )
+    print(f"{len(ratings)} ratings from {args.users} users over {args.movies} movies")
+
+    started = time.perf_counter()
+    masks, decades = join_features(tmdb_ids.astype(np.int64), features)
+    joined = time.perf_counter()
+    written = 0
+    for _, profile in iter_profiles(users, ratings, masks, decades, args.users, args.chunk_users):
+        written += len(json.dumps(profile)) + 1
+    elapsed = time.perf_counter() - started
+
+    print(f"join:      {(joined - started) * 1000:.0f}ms")
+    print(f"total:     {elapsed:.2f}s for {written / 2**20:.0f}MiB of JSON lines")
+    print(f"throughput: {args.users / elapsed * 60:,.0f} users/minute")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Per-call latency of TMDBClient against a local stand-in TMDB server.
+
+Compares a bare ``requests.get`` per call (a new connection every time) with
+the pooled keep-alive session used by ``TMDBClient``. Caching is disabled so
+every call reaches the server.
+
+Usage (from backend/):
+    python -m benchmarks.tmdb_client_latency --calls 500 --latency-ms 5
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from app.services.tmdb import TMDBClient
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        movie_id = self.path.split("?")[0].rstrip("/").rsplit("/", 1)[-1]
+        body = json.dumps({"id": int(movie_id) if movie_id.isdigit() else 0, "title": "Stand-in"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _summarize(label: str, samples: list[float]) -> None:
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95 = samples_ms[int(len(samples_ms) * 0.95) - 1]
+    print(
+        f"{label:<16} mean={statistics.mean(samples_ms):7.3f}ms "
+        f"p50={statistics.median(samples_ms):7.3f}ms p95={p95:7.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated server think time")
+    args = parser.parse_args()
+
+    _StandInHandler.latency = args.latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/3"
+
+    bare: list[float] = []
+    for movie_id in range(args.calls):
+        started = time.perf_counter()
+        response = requests.get(f"{base_url}/movie/{movie_id}", params={"api_key": "bench"}, timeout=10)
+        response.json()
+        bare.append(time.perf_counter() - started)
+
+    client = TMDBClient(api_key="bench", base_url=base_url, cache=None)
+    pooled: list[float] = []
+    for movie_id in range(args.calls):
+        started = time.perf_counter()
+        client.get_movie_details(movie_id)
+        pooled.append(time.perf_counter() - started)
+    client.close()
+    server.shutdown()
+
+    print(f"{args.calls} calls, simulated latency {args.latency_ms}ms")
+    _summarize("requests.get", bare)
+    _summarize("pooled session", pooled)
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,18 @@ CREATE TABLE IF NOT EXISTS watchlist (
   UNIQUE(user_id, tmdb_id)
 );
 
+-- Watchlist timestamps used for ordering and status updates. The columns are
+-- added without a default so existing rows are backfilled from added_at
+-- instead of all getting the migration time.
+ALTER TABLE watchlist ADD COLUMN IF NOT EXISTS created_at TIMESTAMP;
+ALTER TABLE watchlist ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP;
+UPDATE watchlist SET created_at = COALESCE(added_at, now()) WHERE created_at IS NULL;
+UPDATE watchlist SET updated_at = created_at WHERE updated_at IS NULL;
+ALTER TABLE watchlist ALTER COLUMN created_at SET DEFAULT now();
+ALTER TABLE watchlist ALTER COLUMN updated_at SET DEFAULT now();
+ALTER TABLE watchlist ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE watchlist ALTER COLUMN updated_at SET NOT NULL;
+
 -- Custom user lists table
 CREATE TABLE IF NOT EXISTS custom_lists (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -45,6 +57,23 @@ CREATE TABLE IF NOT EXISTS custom_lists (
   updated_at TIMESTAMP DEFAULT now()
 );
 
+-- Local mirror of TMDB movie metadata, written through on first fetch and
+-- refreshed in the background once older than CATALOG_TTL
+CREATE TABLE IF NOT EXISTS movie_catalog (
+  tmdb_id INTEGER PRIMARY KEY,
+  title TEXT,
+  overview TEXT,
+  poster_path TEXT,
+  backdrop_path TEXT,
+  release_date DATE,
+  vote_average REAL,
+  genres JSONB NOT NULL DEFAULT '[]'::jsonb,
+  fetched_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- TMDB popularity, used to rank local search results
+ALTER TABLE movie_catalog ADD COLUMN IF NOT EXISTS popularity REAL;
+
 -- Create indexes for faster queries
 CREATE INDEX IF NOT EXISTS idx_profiles_user_id ON profiles(user_id);
 CREATE INDEX IF NOT EXISTS idx_ratings_user_id ON ratings(user_id);
@@ -53,11 +82,26 @@ CREATE INDEX IF NOT EXISTS idx_watchlist_user_id ON watchlist(user_id);
 CREATE INDEX IF NOT EXISTS idx_watchlist_tmdb_id ON watchlist(tmdb_id);
 CREATE INDEX IF NOT EXISTS idx_custom_lists_user_id ON custom_lists(user_id);
 
+-- Keyset pagination: list endpoints page newest first by (updated_at, id)
+UPDATE ratings SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+UPDATE custom_lists SET updated_at = COALESCE(created_at, now()) WHERE updated_at IS NULL;
+ALTER TABLE ratings ALTER COLUMN updated_at SET NOT NULL;
+ALTER TABLE custom_lists ALTER COLUMN updated_at SET NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_ratings_user_updated ON ratings(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_watchlist_user_updated ON watchlist(user_id, updated_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_custom_lists_user_updated ON custom_lists(user_id, updated_at DESC, id DESC);
+
 -- Enable RLS (Row Level Security) for security
 ALTER TABLE profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE ratings ENABLE ROW LEVEL SECURITY;
 ALTER TABLE watchlist ENABLE ROW LEVEL SECURITY;
 ALTER TABLE custom_lists ENABLE ROW LEVEL SECURITY;
+ALTER TABLE movie_catalog ENABLE ROW LEVEL SECURITY;
+
+-- RLS Policy: Catalog metadata is public; only the service role writes it
+DROP POLICY IF EXISTS "Anyone can view the movie catalog" ON movie_catalog;
+CREATE POLICY "Anyone can view the movie catalog" ON movie_catalog
+  FOR SELECT USING (true);
 
 -- RLS Policy: Users can only see and edit their own ratings
 DROP POLICY IF EXISTS "Users can view their own ratings" ON ratings;
@@ -128,6 +172,365 @@ CREATE POLICY "Users can delete their own profile" ON profiles
   FOR DELETE USING (auth.uid() = user_id);  
 
 
+-- Top-rated lookups for the profile summary (see get_profile_summary below)
+CREATE INDEX IF NOT EXISTS idx_ratings_user_top ON ratings(user_id, rating DESC, updated_at DESC);
+
+-- Per-user stats, maintained incrementally by triggers on ratings and watchlist
+-- so profile pages read a single row. rating_histogram[i] counts ratings that
+-- round to (i - 1) / 2, i.e. one bucket per half star on the 0-10 scale.
+CREATE TABLE IF NOT EXISTS user_stats (
+  user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+  ratings_count INTEGER NOT NULL DEFAULT 0,
+  rating_sum NUMERIC(12, 1) NOT NULL DEFAULT 0,
+  rating_histogram INTEGER[] NOT NULL DEFAULT array_fill(0, ARRAY[21]),
+  watchlist_count INTEGER NOT NULL DEFAULT 0,
+  to_watch_count INTEGER NOT NULL DEFAULT 0,
+  watching_count INTEGER NOT NULL DEFAULT 0,
+  completed_count INTEGER NOT NULL DEFAULT 0,
+  on_hold_count INTEGER NOT NULL DEFAULT 0,
+  dropped_count INTEGER NOT NULL DEFAULT 0,
+  last_activity_at TIMESTAMP,
+  updated_at TIMESTAMP DEFAULT now()
+);
+
+ALTER TABLE user_stats ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their own stats" ON user_stats;
+CREATE POLICY "Users can view their own stats" ON user_stats
+  FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION public.bump_rating_stats(p_user_id UUID, p_delta INTEGER, p_rating NUMERIC)
+RETURNS void AS $$
+BEGIN
+  -- Removals never create rows (the user may be mid-deletion via cascade)
+  IF p_delta > 0 THEN
+    INSERT INTO user_stats (user_id) VALUES (p_user_id) ON CONFLICT (user_id) DO NOTHING;
+  END IF;
+
+  UPDATE user_stats
+  SET ratings_count = ratings_count + p_delta,
+      rating_sum = rating_sum + p_delta * p_rating,
+      rating_histogram[round(p_rating * 2)::int + 1] = rating_histogram[round(p_rating * 2)::int + 1] + p_delta,
+      last_activity_at = now(),
+      updated_at = now()
+  WHERE user_id = p_user_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.bump_watchlist_stats(p_user_id UUID, p_delta INTEGER, p_status TEXT)
+RETURNS void AS $$
+BEGIN
+  IF p_delta > 0 THEN
+    INSERT INTO user_stats (user_id) VALUES (p_user_id) ON CONFLICT (user_id) DO NOTHING;
+  END IF;
+
+  UPDATE user_stats
+  SET watchlist_count = watchlist_count + p_delta,
+      to_watch_count = to_watch_count + CASE WHEN p_status = 'to_watch' THEN p_delta ELSE 0 END,
+      watching_count = watching_count + CASE WHEN p_status = 'watching' THEN p_delta ELSE 0 END,
+      completed_count = completed_count + CASE WHEN p_status = 'completed' THEN p_delta ELSE 0 END,
+      on_hold_count = on_hold_count + CASE WHEN p_status = 'on_hold' THEN p_delta ELSE 0 END,
+      dropped_count = dropped_count + CASE WHEN p_status = 'dropped' THEN p_delta ELSE 0 END,
+      last_activity_at = now(),
+      updated_at = now()
+  WHERE user_id = p_user_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.apply_rating_stats()
+RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.bump_rating_stats(OLD.user_id, -1, OLD.rating);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.bump_rating_stats(NEW.user_id, 1, NEW.rating);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.apply_watchlist_stats()
+RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.bump_watchlist_stats(OLD.user_id, -1, COALESCE(OLD.status, 'to_watch'));
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.bump_watchlist_stats(NEW.user_id, 1, COALESCE(NEW.status, 'to_watch'));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS on_rating_change ON ratings;
+CREATE TRIGGER on_rating_change
+  AFTER INSERT OR UPDATE OF user_id, rating OR DELETE ON ratings
+  FOR EACH ROW
+  EXECUTE FUNCTION public.apply_rating_stats();
+
+DROP TRIGGER IF EXISTS on_watchlist_change ON watchlist;
+CREATE TRIGGER on_watchlist_change
+  AFTER INSERT OR UPDATE OF user_id, status OR DELETE ON watchlist
+  FOR EACH ROW
+  EXECUTE FUNCTION public.apply_watchlist_stats();
+
+-- Stats recomputed from the raw ratings/watchlist tables (all users, or one)
+CREATE OR REPLACE FUNCTION public.compute_user_stats(p_user_id UUID DEFAULT NULL)
+RETURNS SETOF user_stats AS $$
+  WITH rating_totals AS (
+    SELECT user_id,
+           count(*)::int AS ratings_count,
+           COALESCE(sum(rating), 0) AS rating_sum,
+           max(COALESCE(updated_at, created_at)) AS last_rating_at
+    FROM ratings
+    WHERE p_user_id IS NULL OR user_id = p_user_id
+    GROUP BY user_id
+  ),
+  rating_buckets AS (
+    SELECT user_id, round(rating * 2)::int AS bucket, count(*)::int AS bucket_count
+    FROM ratings
+    WHERE p_user_id IS NULL OR user_id = p_user_id
+    GROUP BY 1, 2
+  ),
+  rating_histograms AS (
+    SELECT t.user_id, array_agg(COALESCE(b.bucket_count, 0) ORDER BY g.bucket) AS rating_histogram
+    FROM rating_totals t
+    CROSS JOIN generate_series(0, 20) AS g(bucket)
+    LEFT JOIN rating_buckets b ON b.user_id = t.user_id AND b.bucket = g.bucket
+    GROUP BY t.user_id
+  ),
+  watchlist_totals AS (
+    SELECT user_id,
+           count(*)::int AS watchlist_count,
+           (count(*) FILTER (WHERE COALESCE(status, 'to_watch') = 'to_watch'))::int AS to_watch_count,
+           (count(*) FILTER (WHERE status = 'watching'))::int AS watching_count,
+           (count(*) FILTER (WHERE status = 'completed'))::int AS completed_count,
+           (count(*) FILTER (WHERE status = 'on_hold'))::int AS on_hold_count,
+           (count(*) FILTER (WHERE status = 'dropped'))::int AS dropped_count,
+           max(COALESCE(updated_at, created_at, added_at)) AS last_watchlist_at
+    FROM watchlist
+    WHERE p_user_id IS NULL OR user_id = p_user_id
+    GROUP BY user_id
+  )
+  SELECT u.user_id,
+         COALESCE(rt.ratings_count, 0),
+         COALESCE(rt.rating_sum, 0),
+         COALESCE(rh.rating_histogram, array_fill(0, ARRAY[21])),
+         COALESCE(wt.watchlist_count, 0),
+         COALESCE(wt.to_watch_count, 0),
+         COALESCE(wt.watching_count, 0),
+         COALESCE(wt.completed_count, 0),
+         COALESCE(wt.on_hold_count, 0),
+         COALESCE(wt.dropped_count, 0),
+         GREATEST(rt.last_rating_at, wt.last_watchlist_at),
+         now()::timestamp
+  FROM (SELECT user_id FROM rating_totals UNION SELECT user_id FROM watchlist_totals) u
+  LEFT JOIN rating_totals rt ON rt.user_id = u.user_id
+  LEFT JOIN rating_histograms rh ON rh.user_id = u.user_id
+  LEFT JOIN watchlist_totals wt ON wt.user_id = u.user_id;
+$$ LANGUAGE sql STABLE SET search_path = public;
+
+-- Backfill / repair: replace stored stats with recomputed ones
+CREATE OR REPLACE FUNCTION public.rebuild_user_stats(p_user_id UUID DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+  rebuilt INTEGER;
+BEGIN
+  DELETE FROM user_stats WHERE p_user_id IS NULL OR user_id = p_user_id;
+  INSERT INTO user_stats SELECT * FROM public.compute_user_stats(p_user_id);
+  GET DIAGNOSTICS rebuilt = ROW_COUNT;
+  RETURN rebuilt;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Consistency check: one row per stored value that differs from the raw tables
+CREATE OR REPLACE FUNCTION public.check_user_stats(p_user_id UUID DEFAULT NULL)
+RETURNS TABLE(user_id UUID, field TEXT, stored TEXT, expected TEXT) AS $$
+  WITH stored AS (
+    SELECT * FROM user_stats WHERE p_user_id IS NULL OR user_stats.user_id = p_user_id
+  ),
+  expected AS (
+    SELECT * FROM public.compute_user_stats(p_user_id)
+  ),
+  pairs AS (
+    SELECT COALESCE(s.user_id, e.user_id) AS user_id,
+           jsonb_build_object(
+             'ratings_count', s.ratings_count, 'rating_sum', s.rating_sum,
+             'rating_histogram', s.rating_histogram, 'watchlist_count', s.watchlist_count,
+             'to_watch_count', s.to_watch_count, 'watching_count', s.watching_count,
+             'completed_count', s.completed_count, 'on_hold_count', s.on_hold_count,
+             'dropped_count', s.dropped_count
+           ) AS stored_values,
+           jsonb_build_object(
+             'ratings_count', COALESCE(e.ratings_count, 0), 'rating_sum', COALESCE(e.rating_sum, 0),
+             'rating_histogram', COALESCE(e.rating_histogram, array_fill(0, ARRAY[21])),
+             'watchlist_count', COALESCE(e.watchlist_count, 0),
+             'to_watch_count', COALESCE(e.to_watch_count, 0), 'watching_count', COALESCE(e.watching_count, 0),
+             'completed_count', COALESCE(e.completed_count, 0), 'on_hold_count', COALESCE(e.on_hold_count, 0),
+             'dropped_count', COALESCE(e.dropped_count, 0)
+           ) AS expected_values
+    FROM stored s
+    FULL OUTER JOIN expected e ON e.user_id = s.user_id
+  )
+  SELECT p.user_id, kv.key, p.stored_values ->> kv.key, kv.value #>> '{}'
+  FROM pairs p
+  CROSS JOIN LATERAL jsonb_each(p.expected_values) AS kv
+  WHERE (p.stored_values -> kv.key) IS DISTINCT FROM kv.value;
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+-- Maintenance functions are for the service role only
+REVOKE EXECUTE ON FUNCTION public.bump_rating_stats(UUID, INTEGER, NUMERIC) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.bump_watchlist_stats(UUID, INTEGER, TEXT) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.compute_user_stats(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.rebuild_user_stats(UUID) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.check_user_stats(UUID) FROM PUBLIC, anon, authenticated;
+
+-- Backfill rows written before the triggers existed (idempotent)
+SELECT public.rebuild_user_stats();
+
+-- Profile summary: recent/top ratings plus the precomputed user_stats row,
+-- so the API receives ~20 rows regardless of library size.
+CREATE OR REPLACE FUNCTION public.get_profile_summary(p_user_id UUID)
+RETURNS JSONB AS $$
+  SELECT jsonb_build_object(
+    'recent', COALESCE((
+      SELECT jsonb_agg(r ORDER BY r.updated_at DESC NULLS LAST, r.created_at DESC)
+      FROM (
+        SELECT tmdb_id, rating, created_at, updated_at
+        FROM ratings
+        WHERE user_id = p_user_id
+        ORDER BY updated_at DESC NULLS LAST, created_at DESC
+        LIMIT 10
+      ) r
+    ), '[]'::jsonb),
+    'top_rated', COALESCE((
+      SELECT jsonb_agg(r ORDER BY r.rating DESC, r.updated_at DESC NULLS LAST)
+      FROM (
+        SELECT tmdb_id, rating, created_at, updated_at
+        FROM ratings
+        WHERE user_id = p_user_id
+        ORDER BY rating DESC, updated_at DESC NULLS LAST
+        LIMIT 10
+      ) r
+    ), '[]'::jsonb),
+    'ratings_count', COALESCE(st.ratings_count, 0),
+    'average_rating', CASE
+      WHEN COALESCE(st.ratings_count, 0) > 0 THEN round(st.rating_sum / st.ratings_count, 2)
+      ELSE 0
+    END,
+    'rating_histogram', to_jsonb(COALESCE(st.rating_histogram, array_fill(0, ARRAY[21]))),
+    'watchlist_count', COALESCE(st.watchlist_count, 0),
+    'status_counts', jsonb_build_object(
+      'to_watch', COALESCE(st.to_watch_count, 0),
+      'watching', COALESCE(st.watching_count, 0),
+      'completed', COALESCE(st.completed_count, 0),
+      'on_hold', COALESCE(st.on_hold_count, 0),
+      'dropped', COALESCE(st.dropped_count, 0)
+    )
+  )
+  FROM (SELECT 1) AS one
+  LEFT JOIN user_stats st ON st.user_id = p_user_id;
+$$ LANGUAGE sql STABLE SECURITY INVOKER SET search_path = public;
+
+-- Per-user data version, bumped by triggers on every write to a user's rows.
+-- The API derives ETag / Last-Modified for the user's own read endpoints from
+-- it, so repeat reads are answered with 304 after a single primary key lookup.
+CREATE TABLE IF NOT EXISTS user_versions (
+  user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+ALTER TABLE user_versions ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view their own version" ON user_versions;
+CREATE POLICY "Users can view their own version" ON user_versions
+  FOR SELECT USING (auth.uid() = user_id);
+
+CREATE OR REPLACE FUNCTION public.bump_user_version()
+RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    INSERT INTO user_versions (user_id, version) VALUES (NEW.user_id, 1)
+    ON CONFLICT (user_id) DO UPDATE
+      SET version = user_versions.version + 1, updated_at = now();
+  END IF;
+  -- Removals never create rows (the user may be mid-deletion via cascade)
+  IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.user_id IS DISTINCT FROM NEW.user_id) THEN
+    UPDATE user_versions
+    SET version = version + 1, updated_at = now()
+    WHERE user_id = OLD.user_id;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.bump_user_version() FROM PUBLIC, anon, authenticated;
+
+DROP TRIGGER IF EXISTS on_rating_version ON ratings;
+CREATE TRIGGER on_rating_version
+  AFTER INSERT OR UPDATE OR DELETE ON ratings
+  FOR EACH ROW
+  EXECUTE FUNCTION public.bump_user_version();
+
+DROP TRIGGER IF EXISTS on_watchlist_version ON watchlist;
+CREATE TRIGGER on_watchlist_version
+  AFTER INSERT OR UPDATE OR DELETE ON watchlist
+  FOR EACH ROW
+  EXECUTE FUNCTION public.bump_user_version();
+
+DROP TRIGGER IF EXISTS on_custom_list_version ON custom_lists;
+CREATE TRIGGER on_custom_list_version
+  AFTER INSERT OR UPDATE OR DELETE ON custom_lists
+  FOR EACH ROW
+  EXECUTE FUNCTION public.bump_user_version();
+
+DROP TRIGGER IF EXISTS on_profile_version ON profiles;
+CREATE TRIGGER on_profile_version
+  AFTER INSERT OR UPDATE OR DELETE ON profiles
+  FOR EACH ROW
+  EXECUTE FUNCTION public.bump_user_version();
+
+-- Existing users get a row, so deleting data they wrote before the triggers
+-- existed still bumps their version (idempotent)
+INSERT INTO user_versions (user_id)
+SELECT id FROM auth.users
+ON CONFLICT (user_id) DO NOTHING;
+
+-- Access tokens revoked on logout, keyed by SHA-256 of the token, so every
+-- API worker rejects them. Rows only matter until the token expires; expired
+-- ones are purged whenever a new token is revoked.
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+  token_hash TEXT PRIMARY KEY,
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS revoked_tokens_expires_at_idx ON revoked_tokens (expires_at);
+
+-- No policies: only the service role (or a direct connection) can use it
+ALTER TABLE revoked_tokens ENABLE ROW LEVEL SECURITY;
+
+-- Library import jobs, shared by every API worker so any of them can report
+-- progress. ``state`` holds the job as returned by the API. At most one job
+-- per user is queued or running; updated_at is refreshed after every chunk,
+-- so a job left behind by a worker that stopped can be recognised as stale.
+CREATE TABLE IF NOT EXISTS import_jobs (
+  id TEXT PRIMARY KEY,
+  user_id UUID NOT NULL REFERENCES auth.users(id) ON DELETE CASCADE,
+  status TEXT NOT NULL,
+  state JSONB NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+  finished_at TIMESTAMPTZ
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS import_jobs_active_user_idx
+  ON import_jobs (user_id) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS import_jobs_finished_at_idx ON import_jobs (finished_at);
+
+-- No policies: only the service role (or a direct connection) can use it
+ALTER TABLE import_jobs ENABLE ROW LEVEL SECURITY;
+
 -- Trigger: Auto-create profile when user signs up
 CREATE OR REPLACE FUNCTION public.handle_new_user()
 RETURNS trigger AS $$
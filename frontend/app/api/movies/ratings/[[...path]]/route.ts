@@ -38,10 +38,12 @@ async function proxyRatingsRequest(
   }
 
   const responseHeaders = new Headers();
-  const contentType = upstreamResponse.headers.get("content-type");
-
-  if (contentType) {
-    responseHeaders.set("content-type", contentType);
+  // Validators let the browser revalidate user data with If-None-Match (304)
+  for (const name of ["content-type", "etag", "last-modified", "cache-control", "vary"]) {
+    const value = upstreamResponse.headers.get(name);
+    if (value) {
+      responseHeaders.set(name, value);
+    }
   }
 
   return new Response(upstreamResponse.body, {
@@ -10,21 +10,41 @@ export async function GET(req: NextRequest) {
   }
 
   try {
+    const headers: Record<string, string> = {
+      Authorization: authHeader,
+      "Content-Type": "application/json",
+    };
+    // Pass the browser's validator through so unchanged data comes back as 304
+    const ifNoneMatch = req.headers.get("If-None-Match");
+    if (ifNoneMatch) {
+      headers["If-None-Match"] = ifNoneMatch;
+    }
+
     const response = await fetch(`${BACKEND_URL}/profile/me`, {
       method: "GET",
-      headers: {
-        Authorization: authHeader,
-        "Content-Type": "application/json",
-      },
+      headers,
+      cache: "no-store",
     });
 
+    const validators = new Headers();
+    for (const name of ["etag", "cache-control", "vary"]) {
+      const value = response.headers.get(name);
+      if (value) {
+        validators.set(name, value);
+      }
+    }
+
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: validators });
+    }
+
     const data = await response.json();
 
     if (!response.ok) {
       return NextResponse.json(data, { status: response.status });
     }
 
-    return NextResponse.json(data);
+    return NextResponse.json(data, { headers: validators });
   } catch (error) {
     return NextResponse.json(
       { error: "Failed to fetch profile", details: String(error) },
@@ -20,24 +20,45 @@ type MoviesData = {
   total_pages: number;
 };
 
+type DeckData = {
+  movies: Movie[];
+  next_cursor: string | null;
+};
+
 const apiUrl = "/api";
 const tokenStorageKey = "letterbox_access_token";
+// Fetch the next deck batch when this few unseen cards are left
+const deckPrefetchThreshold = 5;
 
 export default function MoviesSwipe() {
   const [movies, setMovies] = useState<Movie[]>([]);
   const [currentIndex, setCurrentIndex] = useState(0);
   const [status, setStatus] = useState("Loading movies...");
   const [isLoading, setIsLoading] = useState(true);
+  // Ratings given this session; the deck already leaves out movies rated before
   const [ratings, setRatings] = useState<Record<number, number>>({});
+  const [deckCursor, setDeckCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     loadMovies();
-    loadMyRatings();
   }, []);
 
+  useEffect(() => {
+    if (deckCursor && !isLoadingMore && movies.length - currentIndex <= deckPrefetchThreshold) {
+      loadDeck(deckCursor);
+    }
+  }, [currentIndex, movies.length, deckCursor, isLoadingMore]);
+
   async function loadMovies() {
     setIsLoading(true);
     try {
+      const token = localStorage.getItem(tokenStorageKey);
+      if (token) {
+        await loadDeck(null);
+        return;
+      }
+
       const response = await fetch(`${apiUrl}/movies?page=1`);
       const data: MoviesData = await response.json();
       setMovies(data.movies || []);
@@ -51,28 +72,36 @@ export default function MoviesSwipe() {
     }
   }
 
-  async function loadMyRatings() {
+  async function loadDeck(cursor: string | null) {
     const token = localStorage.getItem(tokenStorageKey);
     if (!token) return;
 
+    setIsLoadingMore(true);
     try {
-      const response = await fetch(`${apiUrl}/movies/ratings/me`, {
+      const query = cursor ? `?limit=20&cursor=${encodeURIComponent(cursor)}` : "?limit=20";
+      const response = await fetch(`${apiUrl}/movies/deck${query}`, {
         headers: { Authorization: `Bearer ${token}` },
       });
+      const data = await response.json();
+      if (!response.ok) {
+        setStatus(`Error loading movies: ${data.detail}`);
+        return;
+      }
 
-      if (response.ok) {
-        const data = await response.json();
-        const ratingMap = (data.ratings || []).reduce(
-          (acc: Record<number, number>, r: any) => {
-            acc[r.tmdb_id] = r.rating;
-            return acc;
-          },
-          {}
-        );
-        setRatings(ratingMap);
+      const deck = data as DeckData;
+      setMovies((previous) => {
+        // TMDB pages shift over time, so a movie can come back in a later batch
+        const known = new Set(previous.map((movie) => movie.tmdb_id));
+        return [...previous, ...deck.movies.filter((movie) => !known.has(movie.tmdb_id))];
+      });
+      setDeckCursor(deck.next_cursor);
+      if (!cursor) {
+        setStatus(deck.movies.length ? `Loaded ${deck.movies.length} movies` : "No movies found");
       }
-    } catch {
-      // Silent fail for ratings load
+    } catch (error) {
+      setStatus(`Error loading movies: ${String(error)}`);
+    } finally {
+      setIsLoadingMore(false);
     }
   }
 
@@ -118,6 +147,8 @@ export default function MoviesSwipe() {
   function nextMovie() {
     if (currentIndex < movies.length - 1) {
       setCurrentIndex(currentIndex + 1);
+    } else if (deckCursor) {
+      setStatus("Loading more movies...");
     } else {
       setStatus("No more movies! Load more.");
     }
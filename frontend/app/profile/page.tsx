@@ -92,6 +92,8 @@ export default function ProfilePage() {
   const [isDrawerOpen, setIsDrawerOpen] = useState(false);
   const [customLists, setCustomLists] = useState<CustomList[]>([]);
   const [listsError, setListsError] = useState<string | null>(null);
+  const [listsCursor, setListsCursor] = useState<string | null>(null);
+  const [isLoadingLists, setIsLoadingLists] = useState(false);
   const [showCreateListModal, setShowCreateListModal] = useState(false);
 
   useEffect(() => {
@@ -170,7 +172,8 @@ export default function ProfilePage() {
     }
 
     try {
-      const response = await fetch(`${apiUrl}/movies/ratings/me/details`, {
+      // Only the first 12 are shown, so only hydrate that many
+      const response = await fetch(`${apiUrl}/movies/ratings/me/details?limit=12`, {
         cache: "no-store",
         headers: { Authorization: `Bearer ${token}` },
       });
@@ -188,7 +191,7 @@ export default function ProfilePage() {
     }
   }
 
-  async function loadCustomLists() {
+  async function loadCustomLists(cursor: string | null = null) {
     setListsError(null);
 
     const token = localStorage.getItem(tokenStorageKey);
@@ -197,8 +200,10 @@ export default function ProfilePage() {
       return;
     }
 
+    setIsLoadingLists(true);
     try {
-      const response = await fetch(`${apiUrl}/movies/lists/me`, {
+      const query = cursor ? `?limit=20&cursor=${encodeURIComponent(cursor)}` : "?limit=20";
+      const response = await fetch(`${apiUrl}/movies/lists/me${query}`, {
         cache: "no-store",
         headers: { Authorization: `Bearer ${token}` },
       });
@@ -209,13 +214,36 @@ export default function ProfilePage() {
         return;
       }
 
-      setCustomLists(data.lists ?? []);
+      const lists: CustomList[] = data.lists ?? [];
+      if (cursor) {
+        // Lists created since the first page are already at the top
+        setCustomLists((previous) => {
+          const seen = new Set(previous.map((list) => list.id));
+          return [...previous, ...lists.filter((list) => !seen.has(list.id))];
+        });
+      } else {
+        setCustomLists(lists);
+      }
+      setListsCursor(data.next_cursor ?? null);
     } catch (err) {
       setListsError(`Error loading lists: ${String(err)}`);
+    } finally {
+      setIsLoadingLists(false);
     }
   }
 
   async function handleLogout() {
+    const token = localStorage.getItem(tokenStorageKey);
+    if (token) {
+      try {
+        await fetch(`${apiUrl}/auth/logout`, {
+          method: "POST",
+          headers: { Authorization: `Bearer ${token}` },
+        });
+      } catch {
+        // Logging out locally still works if the backend is unreachable
+      }
+    }
     await supabase.auth.signOut();
     localStorage.removeItem(tokenStorageKey);
     router.push("/");
@@ -542,6 +570,15 @@ export default function ProfilePage() {
                     ) : null}
                   </div>
                 ))}
+                {listsCursor ? (
+                  <button
+                    onClick={() => loadCustomLists(listsCursor)}
+                    disabled={isLoadingLists}
+                    className="w-full rounded-xl border border-slate-800 px-4 py-2 text-xs text-slate-300 transition hover:border-slate-600 hover:text-white disabled:opacity-50"
+                  >
+                    {isLoadingLists ? "Loading..." : "Load more"}
+                  </button>
+                ) : null}
               </div>
             )}
             <div className="mt-6 flex justify-center pt-2 lg:mt-auto lg:pt-5">